@@ -37,8 +37,9 @@ class IntentClassifierAgent(Agent):
 
     async def handle(self, query: str, **_: Any) -> Dict[str, Any]:
         print(f"IntentClassifierAgent triggered with query: {query}")
-        # Remove very short tokens so greetings like "hi" don't match
-        tokens = [t.rstrip("s") for t in query.lower().split() if len(t) >= 3]
+        # Remove very short tokens so greetings like "hi" don't match; the
+        # retriever stems the remaining words the same way as the listings.
+        tokens = [t for t in query.lower().split() if len(t) >= 3]
         if not tokens:
             intent = "general_info"
         else:
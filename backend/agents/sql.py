@@ -2,16 +2,18 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Any, Dict, List
-import csv
 import json
 import sqlite3
 import logging
 import asyncio
+import uuid
 
 from .base import Agent
 try:  # pragma: no cover - allow use as package or script
+    from ..listings_dataset import ListingsDataset, load_listings, watch_listings
     from ..property_chatbot import LLMClient
 except ImportError:  # fallback for running inside backend directory
+    from listings_dataset import ListingsDataset, load_listings, watch_listings
     from property_chatbot import LLMClient
 
 
@@ -56,6 +58,43 @@ class SQLQueryGeneratorAgent(Agent):
         }
 
 
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS properties (
+        id TEXT,
+        address TEXT,
+        location TEXT,
+        price INTEGER,
+        description TEXT,
+        image TEXT,
+        lat REAL,
+        lng REAL
+    )
+"""
+
+_INSERT_ROW = (
+    "INSERT INTO properties (id, address, location, price, description, image, lat, lng) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _build_shared_database(dataset: ListingsDataset) -> tuple[str, sqlite3.Connection]:
+    """Load ``dataset`` into a named in-memory database.
+
+    Returns the URI executors connect to and the connection that created the
+    database; SQLite keeps a shared-cache memory database alive while any
+    connection to it is open.
+    """
+
+    uri = f"file:listings-{uuid.uuid4().hex}?mode=memory&cache=shared"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute(_CREATE_TABLE)
+    conn.executemany(
+        _INSERT_ROW, (SQLQueryExecutorAgent._csv_row(record) for record in dataset.records())
+    )
+    conn.commit()
+    return uri, conn
+
+
 class SQLQueryExecutorAgent(Agent):
     """Execute a SQL query against the properties database."""
 
@@ -75,65 +114,62 @@ class SQLQueryExecutorAgent(Agent):
             if alt.exists():
                 path = alt
 
-        self.conn = sqlite3.connect(":memory:")
-        self.conn.row_factory = sqlite3.Row
-        self._create_table()
-        self._load_data(path)
-
-    def _create_table(self) -> None:
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS properties (
-                id TEXT,
-                address TEXT,
-                location TEXT,
-                price INTEGER,
-                description TEXT,
-                image TEXT,
-                lat REAL,
-                lng REAL
-            )
-            """
-        )
-
-    def _load_data(self, path: Path) -> None:
         if path.suffix.lower() == ".csv":
-            with path.open("r", encoding="utf-8", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    cleaned = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                    self.conn.execute(
-                        "INSERT INTO properties (id, address, location, price, description, image, lat, lng) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            cleaned.get("Listing Number"),
-                            cleaned.get("Address"),
-                            f"{cleaned.get('City', '')}, {cleaned.get('State', '')}".strip(", "),
-                            self._parse_price(cleaned.get("List Price")),
-                            cleaned.get("Property Subtype"),
-                            cleaned.get("Image"),
-                            self._parse_float(cleaned.get("Latitude")),
-                            self._parse_float(cleaned.get("Longitude")),
-                        ),
-                    )
+            self.conn = self._connect_shared(load_listings(path))
+            # Switch to a rebuilt database when the CSV changes; queries
+            # already running keep the connection they started with.
+            watch_listings(path, self._reload)
         else:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                for item in data:
-                    self.conn.execute(
-                        "INSERT INTO properties (id, address, location, price, description, image, lat, lng) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            item.get("id"),
-                            item.get("address"),
-                            item.get("location"),
-                            item.get("price"),
-                            item.get("description"),
-                            item.get("image"),
-                            self._parse_float(item.get("lat") or item.get("latitude")),
-                            self._parse_float(item.get("lng") or item.get("longitude")),
-                        ),
-                    )
+            self.conn = sqlite3.connect(":memory:")
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute(_CREATE_TABLE)
+            self._load_json(path)
+
+    @staticmethod
+    def _connect_shared(dataset: ListingsDataset) -> sqlite3.Connection:
+        # Every executor over the same CSV reads one shared in-memory
+        # database, so it is opened read-only.
+        uri, _ = dataset.derived("sql_executor", _build_shared_database)
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _reload(self, dataset: ListingsDataset) -> None:
+        self.conn = self._connect_shared(dataset)
+
+    def _load_json(self, path: Path) -> None:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+            for item in data:
+                self.conn.execute(
+                    _INSERT_ROW,
+                    (
+                        item.get("id"),
+                        item.get("address"),
+                        item.get("location"),
+                        item.get("price"),
+                        item.get("description"),
+                        item.get("image"),
+                        self._parse_float(item.get("lat") or item.get("latitude")),
+                        self._parse_float(item.get("lng") or item.get("longitude")),
+                    ),
+                )
         self.conn.commit()
 
+    @classmethod
+    def _csv_row(cls, cleaned: Dict[str, str]) -> tuple:
+        return (
+            cleaned.get("Listing Number"),
+            cleaned.get("Address"),
+            f"{cleaned.get('City', '')}, {cleaned.get('State', '')}".strip(", "),
+            cls._parse_price(cleaned.get("List Price")),
+            cleaned.get("Property Subtype"),
+            cleaned.get("Image"),
+            cls._parse_float(cleaned.get("Latitude")),
+            cls._parse_float(cleaned.get("Longitude")),
+        )
+
     @staticmethod
     def _parse_price(value: Any) -> int | None:
         if value is None:
@@ -172,9 +208,10 @@ class SQLQueryExecutorAgent(Agent):
         logger.info("Executing SQL query: %s", sql_query)
         cleaned = self._sanitize_query(sql_query)
         logger.debug("Sanitized SQL query: %s", cleaned)
+        conn = self.conn
         error = False
         try:
-            cur = self.conn.execute(cleaned)
+            cur = conn.execute(cleaned)
             rows = [dict(r) for r in cur.fetchall()]
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("Query failed (%s); returning no results", exc)
@@ -183,7 +220,7 @@ class SQLQueryExecutorAgent(Agent):
 
         if not rows and not error:
             fallback = "SELECT * FROM properties LIMIT 10"
-            cur = self.conn.execute(fallback)
+            cur = conn.execute(fallback)
             rows = [dict(r) for r in cur.fetchall()]
             cleaned = fallback
 
@@ -0,0 +1,290 @@
+"""Asynchronous access to the property listings database.
+
+The coroutines here mirror the query and write functions of
+:mod:`properties_store` on SQLAlchemy ``AsyncEngine`` instances (``aiosqlite``
+for SQLite, ``asyncpg`` for PostgreSQL), so FastAPI handlers can await them
+instead of occupying a threadpool worker.  Statements, filters and row mapping
+are shared with the synchronous store, which still owns schema creation,
+seeding, exports and bulk imports.
+
+If the async driver for the configured database is not installed, each
+coroutine runs its synchronous counterpart in a worker thread instead.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Mapping, TypeVar
+
+import anyio.to_thread
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+import properties_store
+from properties_store import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    PropertyFilters,
+    data_version_table,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Async driver used in place of the synchronous one for each backend.
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _build_async_engine(sync_engine: Engine, *, read_only: bool = False) -> AsyncEngine | None:
+    """Return an async engine for the database behind ``sync_engine``.
+
+    Returns ``None`` when there is no async driver for the backend, when the
+    driver is not installed, or for in-memory SQLite, where a second engine
+    would open a separate, empty database.
+    """
+
+    url = sync_engine.url
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        return None
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        return None
+
+    try:
+        if backend == "sqlite":
+            new_engine = create_async_engine(
+                url.set(drivername=driver), connect_args={"timeout": 30}
+            )
+            properties_store._configure_sqlite_engine(
+                new_engine.sync_engine, in_memory=False, read_only=read_only
+            )
+        else:
+            new_engine = create_async_engine(
+                url.set(drivername=driver), **properties_store._server_pool_options()
+            )
+    except ImportError:
+        logger.warning(
+            "Async driver %s is not installed; property queries will run in worker threads",
+            driver,
+        )
+        return None
+
+    if properties_store.REPORT_FULL_SCANS:
+        event.listen(
+            new_engine.sync_engine, "before_cursor_execute", properties_store._report_full_scans
+        )
+    return new_engine
+
+
+engine: AsyncEngine | None = _build_async_engine(properties_store.engine)
+if engine is None or properties_store.read_engine is properties_store.engine:
+    read_engine: AsyncEngine | None = engine
+else:
+    read_engine = _build_async_engine(properties_store.read_engine, read_only=True)
+    if read_engine is None:
+        engine = None
+
+
+def _or_in_thread(
+    sync_function: Callable[..., T],
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Run ``sync_function`` in a worker thread when no async engine exists."""
+
+    def decorator(function: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if engine is None:
+                return await anyio.to_thread.run_sync(
+                    functools.partial(sync_function, *args, **kwargs)
+                )
+            return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def dispose() -> None:
+    """Close the pooled connections of the async engines."""
+
+    for async_engine in {engine, read_engine} - {None}:
+        await async_engine.dispose()
+
+
+@_or_in_thread(properties_store.data_version)
+async def data_version(*, primary: bool = False) -> int:
+    """Async :func:`properties_store.data_version`."""
+
+    async with (engine if primary else read_engine).connect() as conn:
+        return (await conn.execute(select(data_version_table.c.version))).scalar() or 0
+
+
+@_or_in_thread(properties_store.get_property)
+async def get_property(property_id: str) -> dict[str, Any] | None:
+    """Return the property for ``property_id`` or ``None`` if not found."""
+
+    if not property_id:
+        return None
+
+    async with read_engine.connect() as conn:
+        row = (await conn.execute(properties_store._rows_by_id_statement([property_id]))).first()
+
+    if row is None:
+        return None
+
+    return properties_store._row_to_api(row)
+
+
+@_or_in_thread(properties_store.get_properties)
+async def get_properties(property_ids: Iterable[str]) -> list[dict[str, Any]]:
+    """Async :func:`properties_store.get_properties`."""
+
+    ids = properties_store._unique_ids(property_ids)
+    rows = []
+    if ids:
+        async with read_engine.connect() as conn:
+            for start in range(0, len(ids), MAX_PAGE_SIZE):
+                chunk = ids[start : start + MAX_PAGE_SIZE]
+                stmt = properties_store._rows_by_id_statement(chunk)
+                rows.extend((await conn.execute(stmt)).all())
+    return properties_store._in_id_order(ids, rows)
+
+
+@_or_in_thread(properties_store.list_properties_page)
+async def list_properties_page(
+    filters: PropertyFilters | None = None,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Async :func:`properties_store.list_properties_page`."""
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    stmt = properties_store._page_statement(filters, limit, cursor)
+    async with read_engine.connect() as conn:
+        rows = (await conn.execute(stmt)).all()
+    return properties_store._page_result(rows, limit)
+
+
+@_or_in_thread(properties_store.list_changes)
+async def list_changes(
+    since: str | None = None, *, limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[dict[str, Any]], str | None, bool]:
+    """Async :func:`properties_store.list_changes`."""
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    stmt, since_at = properties_store._changes_statement(since, limit)
+    async with read_engine.connect() as conn:
+        rows = (await conn.execute(stmt)).all()
+    return properties_store._changes_result(rows, since, since_at, limit)
+
+
+@_or_in_thread(properties_store.search_properties)
+async def search_properties(
+    query: str,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: PropertyFilters | None = None,
+) -> list[dict[str, Any]]:
+    """Async :func:`properties_store.search_properties`."""
+
+    stmt = properties_store._search_statement(query, limit, filters)
+    if stmt is None:
+        return []
+    async with read_engine.connect() as conn:
+        rows = (await conn.execute(stmt)).all()
+    return [properties_store._row_to_api(row) for row in rows]
+
+
+@_or_in_thread(properties_store.find_nearby)
+async def find_nearby(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: PropertyFilters | None = None,
+) -> list[dict[str, Any]]:
+    """Async :func:`properties_store.find_nearby`."""
+
+    bbox = properties_store._radius_bbox(lat, lng, radius_km)
+    return await _geo_query(bbox, (lat, lng), radius_km, limit, filters)
+
+
+@_or_in_thread(properties_store.find_in_bbox)
+async def find_in_bbox(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: PropertyFilters | None = None,
+) -> list[dict[str, Any]]:
+    """Async :func:`properties_store.find_in_bbox`."""
+
+    centre = properties_store._bbox_centre(south, west, north, east)
+    return await _geo_query((south, west, north, east), centre, None, limit, filters)
+
+
+async def _geo_query(
+    bbox: tuple[float, float, float, float],
+    origin: tuple[float, float],
+    radius_km: float | None,
+    limit: int,
+    filters: PropertyFilters | None,
+) -> list[dict[str, Any]]:
+    async with read_engine.connect() as conn:
+        stmt = properties_store._geo_candidates_statement(bbox, origin, limit, filters)
+        candidates = (await conn.execute(stmt)).all()
+        ranked = properties_store._rank_by_distance(candidates, origin, radius_km, limit)
+        if not ranked:
+            return []
+        stmt = properties_store._rows_by_id_statement([pid for _, pid in ranked])
+        rows = (await conn.execute(stmt)).all()
+    return properties_store._geo_result(ranked, rows)
+
+
+@_or_in_thread(properties_store.create_property)
+async def create_property(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Insert a property and return the stored record."""
+
+    data = properties_store._normalise_payload(payload)
+    async with engine.begin() as conn:
+        row = (await conn.execute(properties_store._create_statement(data))).one()
+        version = (await conn.execute(properties_store._BUMP_DATA_VERSION)).scalar_one()
+    properties_store._after_commit(version, {}, properties_store._row_stats(row), [row])
+    return properties_store._row_to_api(row)
+
+
+@_or_in_thread(properties_store.set_in_system)
+async def set_in_system(property_id: str, in_system: bool) -> dict[str, Any]:
+    """Update the in_system flag for ``property_id`` and return the row."""
+
+    async with engine.begin() as conn:
+        before = await conn.run_sync(properties_store._stats_snapshot, [property_id])
+        stmt = properties_store._set_in_system_statement(property_id, in_system)
+        row = (await conn.execute(stmt)).first()
+        if row is None:
+            raise KeyError(property_id)
+        version = (await conn.execute(properties_store._BUMP_DATA_VERSION)).scalar_one()
+    properties_store._after_commit(version, before, properties_store._row_stats(row), [row])
+    return properties_store._row_to_api(row)
+
+
+@_or_in_thread(properties_store.get_listing_stats)
+async def get_listing_stats() -> dict[str, Any]:
+    """Async :func:`properties_store.get_listing_stats`.
+
+    Current statistics are answered without leaving the event loop; a
+    rebuild after a missed write runs in a worker thread.
+    """
+
+    stats = properties_store.listing_stats.cached(await data_version(primary=True))
+    if stats is None:
+        stats = await anyio.to_thread.run_sync(properties_store.get_listing_stats)
+    return stats
@@ -0,0 +1,208 @@
+"""BM25 keyword ranking for local listing retrieval.
+
+Listings and queries go through the same :func:`tokenize`, so a query term
+matches a listing only when both reduce to the same stem: "condos" matches
+"condo", but "fl" no longer matches "Florida".
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+import heapq
+import math
+import re
+import threading
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Words too common in queries and listing titles to carry any signal.
+STOP_WORDS = frozenset(
+    "a an and any are at by for from have i in is it me my near of on or "
+    "show some that the to with".split()
+)
+
+
+def _idf(count: int, frequency: int) -> float:
+    return math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+
+
+def _stem(token: str) -> str:
+    """Strip common English inflections from ``token``.
+
+    A deliberately light stemmer: plural forms plus ``-ing`` and ``-ed``
+    endings, leaving short words and numbers alone.
+    """
+
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "shes", "ches", "xes", "zes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    if token.endswith("ing") and len(token) > 5:
+        return token[:-3]
+    if token.endswith("ed") and len(token) > 4 and not token.endswith("eed"):
+        return token[:-2]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lower-cased, stemmed alphanumeric terms, leaving
+    out :data:`STOP_WORDS`."""
+
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOP_WORDS:
+            continue
+        token = token[:-2] if token.endswith("'s") else token.replace("'", "")
+        terms.append(_stem(token))
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 index over a fixed sequence of documents.
+
+    Postings hold the term frequency of each document containing a term.
+    IDF values and each document's length normalisation are computed once
+    when the index is built, so a query only sums precomputed factors over
+    the postings of its terms and keeps the best ``limit`` with a heap.
+    """
+
+    def __init__(self, documents: Iterable[str], *, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths: List[int] = []
+        for position, text in enumerate(documents):
+            terms = Counter(tokenize(text))
+            lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                postings[term].append((position, frequency))
+        self.postings = dict(postings)
+
+        count = len(lengths)
+        average = sum(lengths) / count if count else 0.0
+        self.idf = {term: _idf(count, len(docs)) for term, docs in self.postings.items()}
+        self._norms = [
+            k1 * (1 - b + b * length / average) if average else k1 for length in lengths
+        ]
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def top(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Return up to ``limit`` ``(position, score)`` pairs, best first.
+
+        Ties keep document order.  Repeated query terms count once.
+        """
+
+        scores: Dict[int, float] = defaultdict(float)
+        norms = self._norms
+        boost = self.k1 + 1
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf[term]
+            for position, frequency in docs:
+                scores[position] += idf * frequency * boost / (frequency + norms[position])
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+class IncrementalBM25Index:
+    """Okapi BM25 index over documents keyed by id, updated one at a time.
+
+    Unlike :class:`BM25Index` nothing is precomputed: postings map each term
+    to the ids and term frequencies of its documents, and IDF and length
+    normalisation are derived from the live document count and total length
+    at query time.  Adding or removing a document therefore only touches the
+    postings of its own terms.  Updates and queries may run on different
+    threads.
+    """
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._terms: Dict[Hashable, Tuple[Tuple[str, int], ...]] = {}
+        self._lengths: Dict[Hashable, int] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._total_length = 0
+        self._added = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._lengths
+
+    def put(self, key: Hashable, text: str) -> None:
+        """Index ``text`` under ``key``, replacing any earlier text.
+
+        A replaced document keeps its place for breaking ties.
+        """
+
+        terms = tuple(Counter(tokenize(text)).items())
+        with self._lock:
+            self._discard(key)
+            self._terms[key] = terms
+            length = sum(frequency for _, frequency in terms)
+            self._lengths[key] = length
+            self._total_length += length
+            if key not in self._order:
+                self._order[key] = self._added
+                self._added += 1
+            for term, frequency in terms:
+                self._postings.setdefault(term, {})[key] = frequency
+
+    def discard(self, key: Hashable) -> None:
+        """Remove the document indexed under ``key``, if any."""
+
+        with self._lock:
+            self._discard(key)
+            self._order.pop(key, None)
+
+    def _discard(self, key: Hashable) -> None:
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(key)
+        for term, _ in terms:
+            docs = self._postings[term]
+            del docs[key]
+            if not docs:
+                del self._postings[term]
+
+    def top(self, query: str, limit: int) -> List[Tuple[Hashable, float]]:
+        """Return up to ``limit`` ``(key, score)`` pairs, best first.
+
+        Ties keep the order in which documents were first added.  Repeated
+        query terms count once.
+        """
+
+        terms = set(tokenize(query))
+        scores: Dict[Hashable, float] = defaultdict(float)
+        k1, b = self.k1, self.b
+        boost = k1 + 1
+        with self._lock:
+            count = len(self._lengths)
+            if not count:
+                return []
+            average = self._total_length / count
+            lengths = self._lengths
+            for term in terms:
+                docs = self._postings.get(term)
+                if not docs:
+                    continue
+                idf = _idf(count, len(docs))
+                for key, frequency in docs.items():
+                    norm = k1 * (1 - b + b * lengths[key] / average) if average else k1
+                    scores[key] += idf * frequency * boost / (frequency + norm)
+            order = self._order
+            return heapq.nlargest(
+                limit, scores.items(), key=lambda item: (item[1], -order[item[0]])
+            )
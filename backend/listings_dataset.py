@@ -0,0 +1,360 @@
+"""Process-wide registry of parsed listing CSV files.
+
+The MLS export in ``frontend/data/listings.csv`` feeds the chat retriever,
+the intent classifier, the SQL executor agents and the RAG server.  Instead
+of each of them reading the file on its own,
+:func:`load_listings` parses a file once per process and hands every caller
+the same :class:`ListingsDataset`.  Structures built from the rows, such as
+a search index, are shared the same way through
+:meth:`ListingsDataset.derived`.
+
+Parsed files are also written to an on-disk snapshot (``marshal`` format) so
+later processes skip CSV parsing.  A snapshot is used while the file's
+modification time and size match, or its content hash does after the file
+was touched without changing.  Snapshots live in ``LISTINGS_SNAPSHOT_DIR``
+(``$XDG_CACHE_HOME/real-estate-agent/listing-snapshots`` by default, with
+``~/.cache`` standing in for an unset ``XDG_CACHE_HOME``);
+``LISTINGS_SNAPSHOTS=0`` turns them off.
+
+Long-lived consumers register with :func:`watch_listings` to be handed the
+new dataset when the file changes.  A background thread checks the watched
+files every ``LISTINGS_RELOAD_INTERVAL`` seconds (5 by default, ``0``
+disables it), so consumers rebuild their structures off the request path and
+swap them in once ready.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+import hashlib
+import io
+import logging
+import marshal
+import mmap
+import os
+from pathlib import Path
+import sys
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+import weakref
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, eq=False)
+class ListingsDataset:
+    """The header and rows of a listings CSV, with surrounding whitespace
+    stripped from every name and value.
+
+    Rows are tuples in header order and may be shorter than the header when
+    the file has ragged lines; blank lines are skipped.  The dataset is
+    shared by every consumer of the file and must not be modified.
+    """
+
+    path: Path
+    mtime_ns: int
+    size: int
+    digest: str
+    columns: Tuple[str, ...]
+    rows: Tuple[Tuple[str, ...], ...]
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def records(self) -> Iterator[Dict[str, str]]:
+        """Yield each row as a dict keyed by column name.
+
+        The dicts are built on the fly; when a column name repeats, the
+        last value wins as with ``csv.DictReader``.
+        """
+
+        columns = self.columns
+        for row in self.rows:
+            yield dict(zip(columns, row))
+
+    def derived(self, name: str, build: Callable[["ListingsDataset"], T]) -> T:
+        """Return ``build(self)``, computed once per dataset under ``name``."""
+
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+
+_datasets: Dict[Path, ListingsDataset] = {}
+_lock = threading.Lock()
+
+# Bump when the snapshot layout changes so older snapshots are ignored.
+SNAPSHOT_FORMAT = 1
+
+
+def load_listings(path: Path | str) -> ListingsDataset:
+    """Return the parsed dataset for the CSV file at ``path``.
+
+    The file is loaded on first use and again only after its modification
+    time or size changes, from its snapshot when that is still valid.
+    Raises ``FileNotFoundError`` if it does not exist.
+    """
+
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    with _lock:
+        dataset = _datasets.get(resolved)
+        if dataset is None or (dataset.mtime_ns, dataset.size) != (stat.st_mtime_ns, stat.st_size):
+            dataset = _datasets[resolved] = _load(resolved, stat.st_mtime_ns, stat.st_size)
+        return dataset
+
+
+def watch_listings(path: Path | str, callback: Callable[[ListingsDataset], None]) -> None:
+    """Call ``callback`` with the new dataset whenever the file at ``path``
+    changes.
+
+    Callbacks run on the watcher thread, in registration order.  Bound
+    methods are held weakly so watching does not keep their object alive.
+    """
+
+    _watcher.add(Path(path).resolve(), callback)
+
+
+def check_for_changes() -> None:
+    """Reload changed watched files and notify their callbacks now."""
+
+    _watcher.poll()
+
+
+class _Watcher:
+    def __init__(self) -> None:
+        self._callbacks: Dict[Path, List[Callable[[], Optional[Callable[..., None]]]]] = {}
+        self._seen: Dict[Path, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, path: Path, callback: Callable[[ListingsDataset], None]) -> None:
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            ref: Callable[[], Optional[Callable[..., None]]] = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731 - plain functions are held strongly
+        with self._lock:
+            self._callbacks.setdefault(path, []).append(ref)
+            if path not in self._seen:
+                dataset = _datasets.get(path)
+                if dataset is not None:
+                    self._seen[path] = (dataset.mtime_ns, dataset.size)
+            self._start()
+
+    def _start(self) -> None:
+        interval = float(os.getenv("LISTINGS_RELOAD_INTERVAL", "5"))
+        if interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="listings-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self.poll()
+            except Exception:  # pragma: no cover - the watcher must keep running
+                logger.exception("Listings watcher failed")
+
+    def poll(self) -> None:
+        with self._poll_lock:
+            with self._lock:
+                watched = {path: list(refs) for path, refs in self._callbacks.items()}
+            for path, refs in watched.items():
+                self._check(path, refs)
+
+    def _check(self, path: Path, refs: List[Callable[[], Optional[Callable[..., None]]]]) -> None:
+        try:
+            before = path.stat()
+        except FileNotFoundError:
+            return
+        seen = (before.st_mtime_ns, before.st_size)
+        if self._seen.get(path) == seen:
+            return
+        dataset = load_listings(path)
+        after = path.stat()
+        if (after.st_mtime_ns, after.st_size) != seen:
+            # Still being written; pick it up on a later check.
+            return
+        self._seen[path] = seen
+        logger.info("Listings file %s changed; reloading %d consumers", path, len(refs))
+        live = []
+        for ref in refs:
+            callback = ref()
+            if callback is None:
+                continue
+            live.append(ref)
+            try:
+                callback(dataset)
+            except Exception:
+                logger.exception("Reloading listings from %s failed for %r", path, callback)
+        with self._lock:
+            current = self._callbacks.get(path, [])
+            self._callbacks[path] = [ref for ref in current if ref in live or ref not in refs]
+
+
+_watcher = _Watcher()
+
+
+def snapshot_dir() -> Optional[Path]:
+    """Return the directory holding dataset snapshots, or ``None`` if disabled."""
+
+    if os.getenv("LISTINGS_SNAPSHOTS", "1") == "0":
+        return None
+    configured = os.getenv("LISTINGS_SNAPSHOT_DIR")
+    if configured:
+        return Path(configured)
+    cache = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache / "real-estate-agent" / "listing-snapshots"
+
+
+def _snapshot_path(path: Path) -> Optional[Path]:
+    directory = snapshot_dir()
+    if directory is None:
+        return None
+    key = hashlib.blake2b(str(path).encode("utf-8"), digest_size=10).hexdigest()
+    return directory / f"{path.stem}-{key}.snapshot"
+
+
+def _load(path: Path, mtime_ns: int, size: int) -> ListingsDataset:
+    started = time.perf_counter()
+    snapshot = _snapshot_path(path)
+    content: Optional[bytes] = None
+    if snapshot is not None:
+        header = _read_snapshot_header(snapshot)
+        if header is not None and header["path"] == str(path):
+            fresh = (header["mtime_ns"], header["size"]) == (mtime_ns, size)
+            if not fresh and header["size"] == size:
+                content = path.read_bytes()
+                fresh = _digest(content) == header["digest"]
+            if fresh:
+                columns, rows = _read_snapshot_body(snapshot, header["body_offset"])
+                if columns is not None:
+                    logger.info(
+                        "Loaded %d listings from snapshot %s in %.3fs",
+                        len(rows),
+                        snapshot,
+                        time.perf_counter() - started,
+                    )
+                    dataset = ListingsDataset(
+                        path=path,
+                        mtime_ns=mtime_ns,
+                        size=size,
+                        digest=header["digest"],
+                        columns=columns,
+                        rows=rows,
+                    )
+                    if header["mtime_ns"] != mtime_ns:
+                        _write_snapshot(snapshot, dataset)
+                    return dataset
+
+    if content is None:
+        content = path.read_bytes()
+    dataset = _parse(path, mtime_ns, size, content)
+    logger.info(
+        "Parsed %d listings from %s in %.3fs", len(dataset), path, time.perf_counter() - started
+    )
+    if snapshot is not None:
+        _write_snapshot(snapshot, dataset)
+    return dataset
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _parse(path: Path, mtime_ns: int, size: int, content: bytes) -> ListingsDataset:
+    reader = csv.reader(io.StringIO(content.decode("utf-8"), newline=""))
+    columns = tuple(name.strip() for name in next(reader, []))
+    # Repeated values (cities, states, Y/N flags, ...) share one string
+    # object, which shrinks the dataset in memory and in its snapshot.
+    values: Dict[str, str] = {}
+    share = values.setdefault
+    rows = tuple(
+        tuple(share(stripped, stripped) for stripped in map(str.strip, row))
+        for row in reader
+        if row
+    )
+    return ListingsDataset(
+        path=path,
+        mtime_ns=mtime_ns,
+        size=size,
+        digest=_digest(content),
+        columns=columns,
+        rows=rows,
+    )
+
+
+# A snapshot is a marshalled header, prefixed with its length so it can be
+# checked without reading the rest, followed by the marshalled
+# ``(columns, rows)`` body, which is read straight from a memory map.
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def _read_snapshot_header(snapshot: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with snapshot.open("rb") as fh:
+            (length,) = _HEADER_LENGTH.unpack(fh.read(_HEADER_LENGTH.size))
+            header = marshal.loads(fh.read(length))
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError, struct.error) as exc:
+        logger.warning("Ignoring unreadable listings snapshot %s: %s", snapshot, exc)
+        return None
+    if not isinstance(header, dict) or header.get("format") != (
+        SNAPSHOT_FORMAT,
+        sys.implementation.cache_tag,
+    ):
+        return None
+    header["body_offset"] = _HEADER_LENGTH.size + length
+    return header
+
+
+def _read_snapshot_body(snapshot: Path, offset: int) -> Tuple[Any, Any]:
+    try:
+        with snapshot.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                columns, rows = marshal.loads(view[offset:])
+    except (OSError, EOFError, ValueError, TypeError) as exc:
+        logger.warning("Ignoring unreadable listings snapshot %s: %s", snapshot, exc)
+        return None, None
+    return columns, rows
+
+
+def _write_snapshot(snapshot: Path, dataset: ListingsDataset) -> None:
+    header = {
+        "format": (SNAPSHOT_FORMAT, sys.implementation.cache_tag),
+        "path": str(dataset.path),
+        "mtime_ns": dataset.mtime_ns,
+        "size": dataset.size,
+        "digest": dataset.digest,
+    }
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename it into place so readers in
+        # other processes never see a partial snapshot.
+        fd, tmp_name = tempfile.mkstemp(dir=snapshot.parent, suffix=".tmp")
+        try:
+            encoded_header = marshal.dumps(header)
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(_HEADER_LENGTH.pack(len(encoded_header)))
+                fh.write(encoded_header)
+                fh.write(marshal.dumps((dataset.columns, dataset.rows)))
+            os.replace(tmp_name, snapshot)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError as exc:
+        logger.warning("Could not write listings snapshot %s: %s", snapshot, exc)
@@ -2,16 +2,90 @@
 
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import csv
+import hashlib
+import io
+from itertools import islice
+import json
+import logging
+import tempfile
+import threading
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+import async_properties_store
 import properties_store
 from location_intel import fetch_location_references
 
 
-router = APIRouter(prefix="/properties", tags=["properties"])
+logger = logging.getLogger(__name__)
+
+# Seconds clients are told to wait before retrying while the store starts up.
+STARTUP_RETRY_AFTER_SECONDS = 5
+
+# Upper bound of the numeric listing filters.  Larger values and infinities
+# do not bind to the 64-bit columns they are compared with (prices in cents),
+# so they are rejected with ``422``.
+MAX_FILTER_VALUE = 10**12
+
+
+# Delay before retrying a failed store initialisation, doubled after each
+# further failure up to the maximum.
+INIT_RETRY_INITIAL_SECONDS = 1.0
+INIT_RETRY_MAX_SECONDS = 60.0
+
+
+async def _initialise_store() -> None:
+    """Run ``init_db``, retrying with backoff until it succeeds.
+
+    A database that is unreachable at startup would otherwise leave the
+    worker answering ``503`` until it is restarted.
+    """
+
+    delay = INIT_RETRY_INITIAL_SECONDS
+    while True:
+        try:
+            await run_in_threadpool(properties_store.init_db)
+            return
+        except Exception:
+            logger.exception("Property store initialisation failed; retrying in %.0fs", delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, INIT_RETRY_MAX_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Initialise the store in the background so startup does not wait on seeding."""
+
+    task = asyncio.create_task(_initialise_store())
+    try:
+        yield
+    finally:
+        if not task.done():
+            task.cancel()
+        await async_properties_store.dispose()
+
+
+router = APIRouter(prefix="/properties", tags=["properties"], lifespan=lifespan)
+
+
+def require_ready() -> None:
+    """Reject requests with ``503`` until ``init_db`` has finished."""
+
+    if not properties_store.init_progress.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Property store is starting up",
+            headers={"Retry-After": str(STARTUP_RETRY_AFTER_SECONDS)},
+        )
 
 
 class PropertyCreate(BaseModel):
@@ -27,6 +101,17 @@ class PropertyCreate(BaseModel):
     status: Optional[str] = None
     type: Optional[str] = None
     saleOrRent: Optional[str] = None
+    subtype: Optional[str] = None
+    style: Optional[str] = None
+    zoning: Optional[str] = None
+    livingAreaSqft: Optional[int] = Field(None, ge=0)
+    lotSizeSqft: Optional[int] = Field(None, ge=0)
+    lotSizeAcres: Optional[float] = Field(None, ge=0)
+    pricePerSqft: Optional[float] = Field(None, ge=0)
+    parkingTotal: Optional[int] = Field(None, ge=0)
+    pool: Optional[bool] = None
+    garage: Optional[bool] = None
+    waterfront: Optional[bool] = None
     lat: Optional[float] = None
     lng: Optional[float] = None
     metadata: Optional[dict[str, Any]] = None
@@ -38,29 +123,398 @@ class Property(PropertyCreate):
     removedAt: Optional[str] = None
 
 
+class NearbyProperty(Property):
+    distanceKm: float
+
+
+class PropertyChange(Property):
+    updatedAt: str
+    change: str
+
+
+class PropertyChangeFeed(BaseModel):
+    changes: list[PropertyChange]
+    nextToken: Optional[str] = None
+    hasMore: bool
+
+
+class BulkImportError(BaseModel):
+    row: int
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    processed: int
+    upserted: int
+    failed: int
+    errors: list[BulkImportError]
+
+
+class SyncReport(BaseModel):
+    processed: int
+    inserted: int
+    updated: int
+    unchanged: int
+    removed: int
+    failed: int
+    errors: list[BulkImportError]
+
+
 class LocationLink(BaseModel):
     title: str
     url: str
     snippet: Optional[str] = None
 
 
+class StoreReadiness(BaseModel):
+    state: str
+    ready: bool
+    rowsSeeded: int
+    source: Optional[str] = None
+    startedAt: Optional[str] = None
+    finishedAt: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ListingAggregate(BaseModel):
+    count: int
+    avgPrice: Optional[float] = None
+    medianPrice: Optional[float] = None
+    avgPricePerSqft: Optional[float] = None
+    medianPricePerSqft: Optional[float] = None
+
+
+class ListingGroup(ListingAggregate):
+    value: Optional[str] = None
+
+
+class PropertyStats(BaseModel):
+    version: int
+    total: ListingAggregate
+    byCity: list[ListingGroup]
+    byPropertyType: list[ListingGroup]
+    byStatus: list[ListingGroup]
+    bySaleOrRent: list[ListingGroup]
+
+
 class PropertyIntel(BaseModel):
     property: Property
     query: str
     links: list[LocationLink]
 
 
-@router.get("", response_model=list[Property])
-def list_properties() -> list[dict[str, Any]]:
-    """Return all property records."""
+class ListingCache:
+    """Serialized listing pages for the current data version.
+
+    Entries are keyed by the normalised query string and hold the JSON body,
+    its strong ETag and the next-page cursor.  Seeing a newer data version
+    drops every entry, so a write to the store invalidates the whole cache.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._version: Optional[int] = None
+        self._entries: OrderedDict[str, tuple[bytes, str, Optional[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: int, key: str) -> Optional[tuple[bytes, str, Optional[str]]]:
+        with self._lock:
+            if version != self._version:
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, version: int, key: str, entry: tuple[bytes, str, Optional[str]]) -> None:
+        with self._lock:
+            if self._version is not None and version < self._version:
+                return
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_listing_cache = ListingCache()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+# Column order for CSV exports; ``metadata`` is written as a JSON string.
+EXPORT_COLUMNS = list(Property.model_fields)
+
+
+def _export_chunks(records: Iterator[dict[str, Any]], export_format: str) -> Iterator[str | bytes]:
+    """Serialise ``records`` a batch at a time for a streaming response."""
+
+    batch_size = properties_store.EXPORT_BATCH_SIZE
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        yield buffer.getvalue()
+        while batch := list(islice(records, batch_size)):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                {**record, "metadata": json.dumps(record.get("metadata") or {})} for record in batch
+            )
+            yield buffer.getvalue()
+        return
+
+    dumps = properties_store.to_json_bytes
+    while batch := list(islice(records, batch_size)):
+        yield b"".join(dumps(record) + b"\n" for record in batch)
+
+
+def property_filters(
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    zip_code: Optional[str] = Query(None, alias="zipCode"),
+    listing_status: Optional[str] = Query(None, alias="status"),
+    property_type: Optional[str] = Query(None, alias="type"),
+    sale_or_rent: Optional[str] = Query(None, alias="saleOrRent"),
+    min_price: Optional[float] = Query(
+        None, alias="minPrice", ge=0, le=MAX_FILTER_VALUE, allow_inf_nan=False
+    ),
+    max_price: Optional[float] = Query(
+        None, alias="maxPrice", ge=0, le=MAX_FILTER_VALUE, allow_inf_nan=False
+    ),
+    min_beds: Optional[float] = Query(
+        None, alias="minBeds", ge=0, le=MAX_FILTER_VALUE, allow_inf_nan=False
+    ),
+    min_baths: Optional[float] = Query(
+        None, alias="minBaths", ge=0, le=MAX_FILTER_VALUE, allow_inf_nan=False
+    ),
+    in_system: Optional[bool] = Query(None, alias="inSystem"),
+    listing_agent: Optional[str] = Query(None, alias="listingAgent"),
+    listing_office: Optional[str] = Query(None, alias="listingOffice"),
+    county: Optional[str] = None,
+    subdivision: Optional[str] = None,
+    subtype: Optional[str] = None,
+    style: Optional[str] = None,
+    zoning: Optional[str] = None,
+    min_sqft: Optional[int] = Query(None, alias="minSqft", ge=0, le=MAX_FILTER_VALUE),
+    max_sqft: Optional[int] = Query(None, alias="maxSqft", ge=0, le=MAX_FILTER_VALUE),
+    min_lot_acres: Optional[float] = Query(
+        None, alias="minLotAcres", ge=0, le=MAX_FILTER_VALUE, allow_inf_nan=False
+    ),
+    max_price_per_sqft: Optional[float] = Query(
+        None, alias="maxPricePerSqft", ge=0, le=MAX_FILTER_VALUE, allow_inf_nan=False
+    ),
+    pool: Optional[bool] = None,
+    garage: Optional[bool] = None,
+    waterfront: Optional[bool] = None,
+) -> properties_store.PropertyFilters:
+    """Collect the listing filters shared by the query endpoints."""
+
+    return properties_store.PropertyFilters(
+        city=city,
+        state=state,
+        zip_code=zip_code,
+        status=listing_status,
+        property_type=property_type,
+        sale_or_rent=sale_or_rent,
+        min_price=min_price,
+        max_price=max_price,
+        min_beds=min_beds,
+        min_baths=min_baths,
+        in_system=in_system,
+        listing_agent=listing_agent,
+        listing_office=listing_office,
+        county=county,
+        subdivision=subdivision,
+        property_subtype=subtype,
+        style=style,
+        zoning=zoning,
+        min_living_area=min_sqft,
+        max_living_area=max_sqft,
+        min_lot_acres=min_lot_acres,
+        max_price_per_sqft=max_price_per_sqft,
+        pool=pool,
+        garage=garage,
+        waterfront=waterfront,
+    )
+
 
-    return properties_store.list_properties()
+@router.get("/ready", response_model=StoreReadiness)
+def store_readiness(response: Response) -> Mapping[str, Any]:
+    """Report startup progress; answers ``503`` until the store is ready."""
 
+    progress = properties_store.init_progress
+    if not progress.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        response.headers["Retry-After"] = str(STARTUP_RETRY_AFTER_SECONDS)
+    return progress.to_api()
+
+
+@router.get("", response_model=list[Property], dependencies=[Depends(require_ready)])
+async def list_properties(
+    request: Request,
+    filters: properties_store.PropertyFilters = Depends(property_filters),
+    limit: int = Query(properties_store.DEFAULT_PAGE_SIZE, ge=1, le=properties_store.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated listing ids to fetch"),
+) -> Response:
+    """Return one page of property records matching the given filters.
+
+    The cursor for the following page is returned in the ``X-Next-Cursor``
+    header; it is omitted on the last page.  Pages carry a strong ``ETag``
+    and a matching ``If-None-Match`` is answered with ``304 Not Modified``.
+    Serialized pages are cached until the store's data version changes.
+
+    With ``ids`` the listed properties are returned in the order given
+    instead, skipping unknown ids; filters and pagination do not apply.
+    """
+
+    property_ids = [pid for pid in (part.strip() for part in ids.split(",")) if pid] if ids else []
+    if len(property_ids) > properties_store.MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {properties_store.MAX_PAGE_SIZE} ids can be requested at once",
+        )
+
+    version = await async_properties_store.data_version()
+    key = urlencode(sorted(request.query_params.multi_items()))
+    entry = _listing_cache.get(version, key)
+    if entry is None:
+        try:
+            if property_ids:
+                page = await async_properties_store.get_properties(property_ids)
+                next_cursor = None
+            else:
+                page, next_cursor = await async_properties_store.list_properties_page(
+                    filters, limit=limit, cursor=cursor
+                )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        # Store output is already API-shaped, so it is serialised directly
+        # instead of being re-validated against ``Property`` row by row.
+        body = properties_store.to_json_bytes(page)
+        entry = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', next_cursor)
+        _listing_cache.put(version, key, entry)
+
+    body, etag, next_cursor = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/stats", response_model=PropertyStats, dependencies=[Depends(require_ready)])
+async def property_stats() -> Mapping[str, Any]:
+    """Return inventory counts, prices and price per square foot.
+
+    Figures cover the listings in the system, overall and grouped by city,
+    property type, status and sale or rent.  They are kept up to date as
+    listings are written, so this does not scan the table.
+    """
+
+    return await async_properties_store.get_listing_stats()
+
+
+@router.get("/changes", response_model=PropertyChangeFeed, dependencies=[Depends(require_ready)])
+async def property_changes(
+    since: Optional[str] = None,
+    limit: int = Query(properties_store.DEFAULT_PAGE_SIZE, ge=1, le=properties_store.MAX_PAGE_SIZE),
+) -> Mapping[str, Any]:
+    """Return listings created, updated or removed after the ``since`` token.
+
+    Clients store ``nextToken`` and pass it back as ``since`` on the next
+    poll; ``hasMore`` means another page is already available.
+    """
 
-@router.post("", response_model=Property, status_code=status.HTTP_201_CREATED)
-def create_property(payload: PropertyCreate) -> Mapping[str, Any]:
     try:
-        return properties_store.create_property(payload.model_dump())
+        changes, next_token, has_more = await async_properties_store.list_changes(
+            since, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return {"changes": changes, "nextToken": next_token, "hasMore": has_more}
+
+
+@router.get("/export", response_class=StreamingResponse, dependencies=[Depends(require_ready)])
+def export_properties(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    filters: properties_store.PropertyFilters = Depends(property_filters),
+) -> StreamingResponse:
+    """Stream every matching property as NDJSON or CSV."""
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_chunks(properties_store.iter_properties(filters), export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="properties.{export_format}"'},
+    )
+
+
+@router.get("/search", response_model=list[Property], dependencies=[Depends(require_ready)])
+async def search_properties(
+    q: str = Query(..., min_length=1, max_length=200),
+    filters: properties_store.PropertyFilters = Depends(property_filters),
+    limit: int = Query(50, ge=1, le=properties_store.MAX_PAGE_SIZE),
+) -> list[dict[str, Any]]:
+    """Return properties matching a free-text query, best match first."""
+
+    return await async_properties_store.search_properties(q, limit=limit, filters=filters)
+
+
+@router.get("/nearby", response_model=list[NearbyProperty], dependencies=[Depends(require_ready)])
+async def nearby_properties(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(5.0, gt=0, le=500, description="Search radius in kilometres"),
+    filters: properties_store.PropertyFilters = Depends(property_filters),
+    limit: int = Query(100, ge=1, le=properties_store.MAX_PAGE_SIZE),
+) -> list[dict[str, Any]]:
+    """Return properties within ``radius`` km of a point, nearest first."""
+
+    return await async_properties_store.find_nearby(
+        lat, lng, radius, limit=limit, filters=filters
+    )
+
+
+@router.get("/bbox", response_model=list[NearbyProperty], dependencies=[Depends(require_ready)])
+async def bbox_properties(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    filters: properties_store.PropertyFilters = Depends(property_filters),
+    limit: int = Query(properties_store.DEFAULT_PAGE_SIZE, ge=1, le=properties_store.MAX_PAGE_SIZE),
+) -> list[dict[str, Any]]:
+    """Return properties inside a bounding box, nearest to its centre first."""
+
+    if south > north or west > east:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bounding box must satisfy south <= north and west <= east",
+        )
+    return await async_properties_store.find_in_bbox(
+        south, west, north, east, limit=limit, filters=filters
+    )
+
+
+@router.post(
+    "",
+    response_model=Property,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_ready)],
+)
+async def create_property(payload: PropertyCreate) -> Mapping[str, Any]:
+    try:
+        return await async_properties_store.create_property(payload.model_dump())
     except ValueError as exc:  # validation from persistence layer
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except properties_store.IntegrityError as exc:  # type: ignore[attr-defined]
@@ -69,27 +523,125 @@ def create_property(payload: PropertyCreate) -> Mapping[str, Any]:
         raise HTTPException(status_code=500, detail="Failed to store property") from exc
 
 
-@router.post("/{property_id}/remove", response_model=Property)
-def remove_property(property_id: str) -> Mapping[str, Any]:
+# Uploads larger than this are spooled to a temporary file instead of memory.
+BULK_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+async def _spool_body(request: Request, spool: Any) -> None:
+    """Copy the request body into ``spool``.
+
+    Writes run in a worker thread, as the spool moves to disk once it grows
+    past ``BULK_SPOOL_BYTES``.
+    """
+
+    async for chunk in request.stream():
+        await run_in_threadpool(spool.write, chunk)
+
+
+def _decoded(spool: Any) -> io.TextIOWrapper:
+    """Return the spooled body as text.
+
+    Bytes that are not valid UTF-8 are kept as lone surrogates instead of
+    failing the upload part way through; the store reports the rows holding
+    them as errors.
+    """
+
+    spool.seek(0)
+    return io.TextIOWrapper(spool, encoding="utf-8-sig", errors="surrogateescape", newline="")
+
+
+def _import_spooled(spool: Any, import_format: str) -> dict[str, Any]:
+    text = _decoded(spool)
+    try:
+        if import_format == "csv":
+            rows = properties_store.parse_csv_rows(text)
+        else:
+            rows = properties_store.parse_ndjson_rows(text)
+        return properties_store.bulk_upsert(rows).to_api()
+    finally:
+        text.detach()
+
+
+@router.post("/bulk", response_model=BulkImportReport, dependencies=[Depends(require_ready)])
+async def bulk_import_properties(
+    request: Request,
+    import_format: Optional[str] = Query(None, alias="format", pattern="^(ndjson|csv)$"),
+) -> Mapping[str, Any]:
+    """Insert or update many properties from a CSV or NDJSON request body.
+
+    CSV bodies use the MLS export columns (as in ``listings.csv``); NDJSON
+    bodies hold one ``PropertyCreate``-shaped object per line.  The format
+    comes from ``?format=`` or else the ``Content-Type`` header.  Invalid rows
+    are listed in the report while the remaining rows are still stored.
+    """
+
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if "csv" in content_type else "ndjson"
+
+    with tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_BYTES) as spool:
+        await _spool_body(request, spool)
+        return await run_in_threadpool(_import_spooled, spool, import_format)
+
+
+def _sync_spooled(spool: Any, remove_missing: bool) -> dict[str, Any]:
+    text = _decoded(spool)
+    try:
+        return properties_store.sync_csv(text, remove_missing=remove_missing).to_api()
+    finally:
+        text.detach()
+
+
+@router.post("/sync", response_model=SyncReport, dependencies=[Depends(require_ready)])
+async def sync_properties(
+    request: Request,
+    remove_missing: bool = Query(True, alias="removeMissing"),
+) -> Mapping[str, Any]:
+    """Re-sync the MLS listings from a full export CSV in the request body.
+
+    Only new listings and listings whose content changed are written.  MLS
+    listings missing from the export are marked removed unless
+    ``removeMissing=false``.
+    """
+
+    with tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_BYTES) as spool:
+        await _spool_body(request, spool)
+        return await run_in_threadpool(_sync_spooled, spool, remove_missing)
+
+
+@router.post(
+    "/{property_id}/remove",
+    response_model=Property,
+    dependencies=[Depends(require_ready)],
+)
+async def remove_property(property_id: str) -> Mapping[str, Any]:
     try:
-        return properties_store.set_in_system(property_id, False)
+        return await async_properties_store.set_in_system(property_id, False)
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Property not found") from exc
 
 
-@router.post("/{property_id}/restore", response_model=Property)
-def restore_property(property_id: str) -> Mapping[str, Any]:
+@router.post(
+    "/{property_id}/restore",
+    response_model=Property,
+    dependencies=[Depends(require_ready)],
+)
+async def restore_property(property_id: str) -> Mapping[str, Any]:
     try:
-        return properties_store.set_in_system(property_id, True)
+        return await async_properties_store.set_in_system(property_id, True)
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Property not found") from exc
 
 
-@router.get("/{property_id}/intel", response_model=PropertyIntel)
+@router.get(
+    "/{property_id}/intel",
+    response_model=PropertyIntel,
+    dependencies=[Depends(require_ready)],
+)
 async def property_intel(property_id: str) -> Mapping[str, Any]:
     """Return property information plus related location references."""
 
-    record = properties_store.get_property(property_id)
+    record = await async_properties_store.get_property(property_id)
     if not record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Property not found")
 
@@ -10,12 +10,37 @@ changing application code.  The connection string is controlled by the
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+import base64
+import bisect
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+import hashlib
+from itertools import chain, islice
+import heapq
+import io
 import json
+import logging
+import math
+import operator
 import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional
+import re
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+)
 from uuid import uuid4
 
 from sqlalchemy import (
@@ -23,44 +48,161 @@ from sqlalchemy import (
     Column,
     DateTime,
     Float,
+    Index,
     Integer,
+    JSON,
     MetaData,
     String,
     Table,
     Text,
+    and_,
+    bindparam,
+    cast,
+    literal_column,
+    or_,
     create_engine,
+    event,
     func,
     insert,
+    inspect,
     select,
+    text,
+    false,
+    true,
+    tuple_,
     update,
 )
-from sqlalchemy.engine import Engine, Row
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection, Engine, Row
 from sqlalchemy.exc import IntegrityError as SQLAlchemyIntegrityError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 IntegrityError = SQLAlchemyIntegrityError
+from sqlalchemy.schema import CreateIndex, DropIndex
 from sqlalchemy.sql import Select
 
+try:  # Optional dependency for faster JSON encoding and decoding
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # POSIX file locks serialise SQLite initialisation across workers
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 DEFAULT_SQLITE_PATH = DATA_DIR / "properties.db"
 
+# Page sizes for keyset-paginated listing queries.
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+
+# Rows fetched per round trip when streaming an export.
+EXPORT_BATCH_SIZE = 1000
+
+# Rows sent per executemany call when seeding or bulk loading listings.
+INSERT_BATCH_SIZE = 5000
+
+# Rows written within this window are held back from the change feed so a
+# slower concurrent transaction with an earlier ``updated_at`` cannot commit
+# behind a token that has already been handed out.
+CHANGE_FEED_SETTLE_SECONDS = 2.0
+
+# Listings changed by other workers that the statistics re-read one by one;
+# beyond this they rebuild from a scan of the table.
+STATS_CATCH_UP_ROWS = 10_000
+
+# Per-row errors kept in a bulk import report; later failures are only counted.
+MAX_REPORTED_ERRORS = 1000
+
+# ``source`` of rows read from an MLS export CSV; ``sync_listings`` only
+# removes listings of the feed it is syncing.
+MLS_SOURCE = "mls"
+
+# ``removed_by`` of listings a sync marked removed because its feed omitted
+# them.  Unlike listings removed by hand, they are restored when they
+# reappear in a later feed.
+SYNC_REMOVAL = "sync"
+
+# PostgreSQL advisory lock key held by the worker running ``init_db``.
+INIT_LOCK_KEY = 0x70726F70
 
-def _build_engine() -> Engine:
-    """Return the SQLAlchemy engine configured from the environment."""
+# SQLite page cache (KiB) and memory-map size (bytes) per connection.
+SQLITE_CACHE_KIB = 64 * 1024
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Mean kilometres per degree of latitude, used for bounding-box maths.
+KM_PER_DEGREE = 111.32
+EARTH_RADIUS_KM = 6371.0088
+
+# Geo queries read this many candidates per requested result, nearest first
+# by a flat-earth approximation, and rank them by great-circle distance.
+GEO_CANDIDATES_PER_RESULT = 4
+
+
+def _build_engine(url: str | None = None, *, read_only: bool = False) -> Engine:
+    """Return an engine for ``url`` tuned for its dialect.
+
+    SQLite connections run in WAL mode so readers never block the writer,
+    with ``synchronous=NORMAL`` and a memory-mapped file; read-only engines
+    also set ``query_only``.  Server databases get a sized connection pool
+    with pre-ping and periodic recycling (``PROPERTIES_DB_POOL_SIZE`` and
+    ``PROPERTIES_DB_MAX_OVERFLOW`` override the defaults).
+    """
 
-    url = os.getenv("PROPERTIES_DB_URL")
     if not url:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
         url = f"sqlite:///{DEFAULT_SQLITE_PATH}"  # pragma: no cover - env dependent
 
-    connect_args: dict[str, Any] = {}
     if url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
+        new_engine = create_engine(
+            url, future=True, connect_args={"check_same_thread": False, "timeout": 30}
+        )
+        in_memory = url in ("sqlite://", "sqlite:///:memory:")
+        _configure_sqlite_engine(new_engine, in_memory=in_memory, read_only=read_only)
+        return new_engine
 
-    return create_engine(url, future=True, connect_args=connect_args)
+    return create_engine(url, future=True, **_server_pool_options())
+
+
+def _configure_sqlite_engine(new_engine: Engine, *, in_memory: bool, read_only: bool) -> None:
+    """Apply the per-connection SQLite PRAGMAs to every connection of ``new_engine``."""
+
+    @event.listens_for(new_engine, "connect")
+    def _configure_sqlite(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            if not in_memory:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=1")
+        finally:
+            cursor.close()
+
+
+def _server_pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": int(os.getenv("PROPERTIES_DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("PROPERTIES_DB_MAX_OVERFLOW", "20")),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
 
 
-engine: Engine = _build_engine()
+# ``engine`` takes every write; read-only queries go through ``read_engine``,
+# which points at ``PROPERTIES_DB_READ_URL`` (e.g. a streaming replica) when
+# set and is otherwise the same engine.
+engine: Engine = _build_engine(os.getenv("PROPERTIES_DB_URL"))
+_read_url = os.getenv("PROPERTIES_DB_READ_URL")
+read_engine: Engine = _build_engine(_read_url, read_only=True) if _read_url else engine
 metadata = MetaData()
 
 
@@ -74,19 +216,151 @@ properties_table = Table(
     Column("state", String, nullable=True),
     Column("zip_code", String, nullable=True),
     Column("price", String, nullable=True),
+    Column("price_cents", Integer, nullable=True),
     Column("beds", Float, nullable=True),
     Column("baths", Float, nullable=True),
     Column("year_built", Integer, nullable=True),
     Column("status", String, nullable=True),
     Column("property_type", String, nullable=True),
     Column("sale_or_rent", String, nullable=True),
+    Column("property_subtype", String, nullable=True),
+    Column("style", String, nullable=True),
+    Column("zoning", String, nullable=True),
+    Column("living_area_sqft", Integer, nullable=True),
+    Column("lot_size_sqft", Integer, nullable=True),
+    Column("lot_size_acres", Float, nullable=True),
+    Column("price_per_sqft", Float, nullable=True),
+    Column("parking_total", Integer, nullable=True),
+    Column("pool", Boolean, nullable=True),
+    Column("garage", Boolean, nullable=True),
+    Column("waterfront", Boolean, nullable=True),
     Column("lat", Float, nullable=True),
     Column("lng", Float, nullable=True),
     Column("in_system", Boolean, nullable=False, server_default="1"),
     Column("removed_at", DateTime, nullable=True),
-    Column("metadata", Text, nullable=True),
+    Column("removed_by", String, nullable=True),
+    Column("source", String, nullable=True),
+    Column("content_hash", String, nullable=True),
+    Column(
+        "metadata",
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    ),
     Column("created_at", DateTime, nullable=False, default=datetime.utcnow),
     Column("updated_at", DateTime, nullable=False, default=datetime.utcnow),
+    Index("ix_properties_price_cents", "price_cents"),
+    Index("ix_properties_listing_number", "listing_number"),
+    Index("ix_properties_state_city", "state", "city"),
+    Index("ix_properties_zip_code", "zip_code"),
+    Index("ix_properties_property_type", "property_type"),
+    Index("ix_properties_status", "status"),
+    Index("ix_properties_address_id", "address", "id"),
+    Index("ix_properties_lat_lng", "lat", "lng"),
+    Index("ix_properties_updated_at_id", "updated_at", "id"),
+    Index("ix_properties_living_area_sqft", "living_area_sqft"),
+    Index("ix_properties_price_per_sqft", "price_per_sqft"),
+    Index("ix_properties_lot_size_acres", "lot_size_acres"),
+    Index("ix_properties_amenities", "waterfront", "pool", "garage"),
+    Index("ix_properties_property_subtype", "property_subtype"),
+    Index("ix_properties_style", "style"),
+    Index("ix_properties_zoning", "zoning"),
+    Index("ix_properties_source_in_system", "source", "in_system"),
+    Index(
+        "ix_properties_in_system_address",
+        "address",
+        "id",
+        sqlite_where=text("in_system = 1"),
+        postgresql_where=text("in_system = true"),
+    ),
+)
+
+
+# SQLite R*Tree over listing coordinates, keyed by the ``properties`` rowid.
+# It lives outside ``metadata`` because ``create_all`` cannot create virtual
+# tables; ``_add_geo_index`` creates it and the triggers that keep it in sync.
+geo_rtree_table = Table(
+    "properties_geo",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lng", Float),
+    Column("max_lng", Float),
+)
+
+# Set by ``init_db`` once the R*Tree is known to exist; other dialects fall
+# back to the ``(lat, lng)`` B-tree index.
+_use_geo_rtree = False
+
+# SQLite FTS5 index over the searchable listing text, keyed by the
+# ``properties`` rowid and maintained by triggers from ``_add_full_text_index``.
+fts_table = Table(
+    "properties_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("address", Text),
+    Column("city", Text),
+    Column("subdivision", Text),
+    Column("county", Text),
+    Column("agent", Text),
+    Column("office", Text),
+    Column("metadata", Text),
+)
+
+# Text indexed for full-text search on PostgreSQL; must match the expression
+# of ``ix_properties_search_tsv`` for the GIN index to be used.
+_PG_SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(properties.address, '') || ' ' || "
+    "coalesce(properties.city, '') || ' ' || coalesce(properties.metadata::text, ''))"
+)
+
+# Metadata keys with an expression index, mapped to the index name suffix.
+INDEXED_METADATA_KEYS = {
+    "listingAgentName": "listing_agent",
+    "listingOfficeName": "listing_office",
+    "county": "county",
+    "subdivision": "subdivision",
+}
+
+
+def _metadata_field_sql(key: str, dialect: str, column: str = "metadata") -> str:
+    """Return the SQL text extracting ``key`` from the metadata JSON.
+
+    Queries and the expression indexes must use exactly the same text (with
+    the key inlined rather than bound) for the planner to match them.
+    """
+
+    if key not in INDEXED_METADATA_KEYS:
+        raise ValueError(f"Metadata key {key!r} is not indexed")
+    if dialect == "postgresql":
+        return f"({column} ->> '{key}')"
+    return f"json_extract({column}, '$.{key}')"
+
+
+def _metadata_field(key: str):
+    return literal_column(
+        _metadata_field_sql(key, read_engine.dialect.name, "properties.metadata")
+    )
+
+
+# Which full-text backend ``search_properties`` uses: ``"fts5"``,
+# ``"tsvector"`` or ``None`` for the ``LIKE`` fallback.  Set by ``init_db``.
+_full_text_backend: str | None = None
+
+
+# Single-row table recording which entries of ``MIGRATIONS`` have been applied.
+schema_version_table = Table(
+    "properties_schema_version",
+    metadata,
+    Column("version", Integer, nullable=False),
+)
+
+# Single-row counter incremented in the same transaction as every write to
+# ``properties`` so readers can cheaply tell whether listing data changed.
+data_version_table = Table(
+    "properties_data_version",
+    metadata,
+    Column("version", Integer, nullable=False),
 )
 
 
@@ -107,6 +381,17 @@ class PropertyRecord:
     status: Optional[str] = None
     property_type: Optional[str] = None
     sale_or_rent: Optional[str] = None
+    property_subtype: Optional[str] = None
+    style: Optional[str] = None
+    zoning: Optional[str] = None
+    living_area_sqft: Optional[int] = None
+    lot_size_sqft: Optional[int] = None
+    lot_size_acres: Optional[float] = None
+    price_per_sqft: Optional[float] = None
+    parking_total: Optional[int] = None
+    pool: Optional[bool] = None
+    garage: Optional[bool] = None
+    waterfront: Optional[bool] = None
     lat: Optional[float] = None
     lng: Optional[float] = None
     in_system: bool = True
@@ -130,6 +415,17 @@ class PropertyRecord:
             "status": self.status,
             "type": self.property_type,
             "saleOrRent": self.sale_or_rent,
+            "subtype": self.property_subtype,
+            "style": self.style,
+            "zoning": self.zoning,
+            "livingAreaSqft": self.living_area_sqft,
+            "lotSizeSqft": self.lot_size_sqft,
+            "lotSizeAcres": self.lot_size_acres,
+            "pricePerSqft": self.price_per_sqft,
+            "parkingTotal": self.parking_total,
+            "pool": self.pool,
+            "garage": self.garage,
+            "waterfront": self.waterfront,
             "lat": self.lat,
             "lng": self.lng,
             "inSystem": self.in_system,
@@ -138,10 +434,154 @@ class PropertyRecord:
         }
 
 
+@dataclass(slots=True)
+class PropertyFilters:
+    """Optional server-side filters applied to listing queries.
+
+    Text filters are exact matches so they can be served from an index;
+    ``None`` means "do not filter on this field".
+    """
+
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip_code: Optional[str] = None
+    status: Optional[str] = None
+    property_type: Optional[str] = None
+    sale_or_rent: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_beds: Optional[float] = None
+    min_baths: Optional[float] = None
+    in_system: Optional[bool] = None
+    listing_agent: Optional[str] = None
+    listing_office: Optional[str] = None
+    county: Optional[str] = None
+    subdivision: Optional[str] = None
+    property_subtype: Optional[str] = None
+    style: Optional[str] = None
+    zoning: Optional[str] = None
+    min_living_area: Optional[int] = None
+    max_living_area: Optional[int] = None
+    min_lot_acres: Optional[float] = None
+    max_price_per_sqft: Optional[float] = None
+    pool: Optional[bool] = None
+    garage: Optional[bool] = None
+    waterfront: Optional[bool] = None
+
+
+@dataclass(slots=True)
+class InitProgress:
+    """How far ``init_db`` has got, as reported by the readiness endpoint.
+
+    ``state`` moves from ``pending`` through ``waiting`` (for another worker
+    holding the initialisation lock), ``migrating`` and ``seeding`` to
+    ``ready``, or to ``failed`` with ``error`` set.
+    """
+
+    state: str = "pending"
+    rows_seeded: int = 0
+    source: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def to_api(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "rowsSeeded": self.rows_seeded,
+            "source": self.source,
+            "startedAt": self.started_at.isoformat() if self.started_at else None,
+            "finishedAt": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+init_progress = InitProgress()
+
+
 def init_db(seed_sources: Iterable[Path] | None = None) -> None:
-    """Create tables and seed data if the properties table is empty."""
+    """Create tables, apply migrations and seed data if the table is empty.
+
+    Nothing runs at import time; the API calls this from a background task at
+    startup and reports progress through ``init_progress``.  Workers take a
+    cross-process lock first, so only one of them migrates and seeds while the
+    rest wait and then find the work already done.
+    """
+
+    global init_progress
+    init_progress = progress = InitProgress(state="waiting", started_at=datetime.utcnow())
+    try:
+        with _initialisation_lock():
+            progress.state = "migrating"
+            _prepare_schema()
+            progress.state = "seeding"
+            _seed(seed_sources, progress)
+    except Exception as exc:
+        progress.state = "failed"
+        progress.error = str(exc)
+        raise
+    finally:
+        progress.finished_at = datetime.utcnow()
+    progress.state = "ready"
+
+
+@contextmanager
+def _initialisation_lock() -> Iterator[None]:
+    """Hold a lock shared by every process initialising this database.
+
+    PostgreSQL uses a session advisory lock; SQLite files use an exclusive
+    ``flock`` on a sibling ``.init-lock`` file.
+    """
+
+    if engine.dialect.name == "postgresql":
+        # Session-level advisory locks need no transaction.  Autocommit keeps
+        # the session from sitting idle in a transaction for the whole run,
+        # where idle_in_transaction_session_timeout could end it and it would
+        # hold back vacuum.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": INIT_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": INIT_LOCK_KEY})
+        return
+
+    database = engine.url.database if engine.dialect.name == "sqlite" else None
+    if not database or database == ":memory:" or fcntl is None:
+        yield
+        return
+    with open(f"{database}.init-lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _prepare_schema() -> None:
+    global _use_geo_rtree, _full_text_backend
 
     metadata.create_all(engine)
+    with engine.begin() as conn:
+        _migrate(conn)
+        tables = set(inspect(conn).get_table_names())
+        dialect = conn.dialect.name
+        if conn.execute(select(data_version_table.c.version)).first() is None:
+            conn.execute(insert(data_version_table).values(version=0))
+        _use_geo_rtree = dialect == "sqlite" and "properties_geo" in tables
+        if dialect == "sqlite":
+            _full_text_backend = "fts5" if "properties_fts" in tables else None
+        else:
+            _full_text_backend = "tsvector" if dialect == "postgresql" else None
+
+
+def _seed_candidates(seed_sources: Iterable[Path] | None = None) -> List[Path]:
+    """Return the CSV files the database is seeded from, in load order."""
 
     candidates: List[Path] = []
     if seed_sources:
@@ -159,31 +599,1334 @@ def init_db(seed_sources: Iterable[Path] | None = None) -> None:
     if default_csv.exists():
         candidates.append(default_csv)
 
+    return [
+        path for path in candidates if path.exists() and path.suffix.lower() == ".csv"
+    ]
+
+
+def _seed(seed_sources: Iterable[Path] | None, progress: InitProgress) -> None:
+    candidates = _seed_candidates(seed_sources)
     if not candidates:
         return
 
+    def count_rows(rows: int) -> None:
+        progress.rows_seeded += rows
+
     with engine.begin() as conn:
-        count = conn.execute(select(func.count()).select_from(properties_table)).scalar()
-        if count and count > 0:
-            return
+        populated = conn.execute(select(properties_table.c.id).limit(1)).first() is not None
+    if populated:
+        if os.getenv("PROPERTIES_SYNC_SEED", "").lower() in ("1", "true", "yes"):
+            progress.source = ", ".join(path.name for path in candidates)
+            result = sync_listings(chain.from_iterable(_read_csv(path) for path in candidates))
+            progress.rows_seeded = result.inserted + result.updated
+            logger.info("Synced seed listings: %s", result.to_api())
+        return
+
+    with engine.begin() as conn:
+
+        # Building the secondary indexes once after the load is much cheaper
+        # than maintaining them row by row while the empty table is filled.
+        started = time.perf_counter()
+        for index in properties_table.indexes:
+            conn.execute(DropIndex(index, if_exists=True))
+        _drop_derived_indexes(conn)
+
+        def seed_rows() -> Iterator[Dict[str, Any]]:
+            for csv_path in candidates:
+                progress.source = csv_path.name
+                yield from _read_csv(csv_path, hashed=False)
+
+        _load_rows(conn, seed_rows(), on_batch=count_rows)
+        _create_indexes(conn, *(index.name for index in properties_table.indexes))
+        _add_geo_index(conn)
+        _add_full_text_index(conn)
+        _add_metadata_indexes(conn)
+        _bump_data_version(conn)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Seeded %d property rows in %.2fs (%.0f rows/sec)",
+            progress.rows_seeded,
+            elapsed,
+            progress.rows_seeded / elapsed if elapsed else 0.0,
+        )
+
 
-        for csv_path in candidates:
-            if not csv_path.exists() or csv_path.suffix.lower() != ".csv":
+def _insert_rows(
+    conn: Connection,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """Insert ``rows`` in batches, skipping ids that already exist.
+
+    Rows are streamed in chunks of ``INSERT_BATCH_SIZE`` so memory stays flat
+    for large feeds.  Duplicate ids are skipped by the database with
+    ``ON CONFLICT DO NOTHING`` instead of raising, which on PostgreSQL would
+    abort the surrounding transaction.  ``on_batch`` is called with the size
+    of each batch once it is written.  Returns the number of rows processed.
+    """
+
+    stmt = _insert_ignoring_conflicts(conn)
+    iterator = iter(rows)
+    total = 0
+    while batch := list(islice(iterator, INSERT_BATCH_SIZE)):
+        conn.execute(stmt, batch)
+        total += len(batch)
+        if on_batch is not None:
+            on_batch(len(batch))
+    return total
+
+
+def _insert_ignoring_conflicts(conn: Connection):
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(properties_table).on_conflict_do_nothing(index_elements=["id"])
+    if dialect == "postgresql":
+        return postgresql.insert(properties_table).on_conflict_do_nothing(index_elements=["id"])
+    return insert(properties_table)  # pragma: no cover - other dialects
+
+
+# Columns written by the first seed.  ``in_system`` takes its server default
+# and ``content_hash`` is left for the first sync to fill in.
+_SEED_COLUMNS = tuple(
+    column.name
+    for column in properties_table.columns
+    if column.name not in {"in_system", "removed_at", "removed_by", "content_hash"}
+)
+
+
+def _load_rows(
+    conn: Connection,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """Load ``rows`` into the empty table for the first seed.
+
+    Unlike :func:`_insert_rows`, each batch is turned into plain values and
+    handed straight to the driver, ``executemany`` on SQLite and ``COPY`` on
+    PostgreSQL with psycopg2, skipping SQLAlchemy's per-row parameter
+    processing.  Duplicate ids keep their first row.  Other drivers fall back
+    to :func:`_insert_rows`.  Returns the number of rows processed.
+    """
+
+    driver = conn.dialect.driver
+    if driver not in ("pysqlite", "psycopg2"):  # pragma: no cover - other drivers
+        return _insert_rows(conn, rows, on_batch=on_batch)
+
+    cursor = conn.connection.cursor()
+    try:
+        if driver == "pysqlite":
+            write = _executemany_writer(conn, cursor)
+        else:  # pragma: no cover - needs a PostgreSQL server
+            write = _copy_writer(cursor)
+        iterator = iter(rows)
+        total = 0
+        while batch := list(islice(iterator, INSERT_BATCH_SIZE)):
+            write(batch)
+            total += len(batch)
+            if on_batch is not None:
+                on_batch(len(batch))
+        return total
+    finally:
+        cursor.close()
+
+
+def _executemany_writer(conn: Connection, cursor: Any) -> Callable[[list[Dict[str, Any]]], None]:
+    dialect = conn.dialect
+    compiled = _insert_ignoring_conflicts(conn).compile(
+        dialect=dialect, column_keys=list(_SEED_COLUMNS)
+    )
+    names = compiled.positiontup
+    values_of = operator.itemgetter(*names)
+    # Only a few types need converting for the driver, such as JSON and dates.
+    converters = []
+    for position, name in enumerate(names):
+        column_type = properties_table.c[name].type.dialect_impl(dialect)
+        process = column_type.bind_processor(dialect)
+        if process is not None:
+            converters.append((position, _reusing_last_result(process)))
+    sql = str(compiled)
+
+    def write(batch: list[Dict[str, Any]]) -> None:
+        params = []
+        for row in batch:
+            values = list(values_of(row))
+            for position, process in converters:
+                values[position] = process(values[position])
+            params.append(values)
+        cursor.executemany(sql, params)
+
+    return write
+
+
+def _reusing_last_result(process: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Wrap a bind processor to skip it while the same value repeats.
+
+    Seed rows share their timestamps and mostly repeat the same flags.
+    """
+
+    last_value: Any = object()
+    last_result: Any = None
+
+    def convert(value: Any) -> Any:
+        nonlocal last_value, last_result
+        if value is not last_value:
+            last_value, last_result = value, process(value)
+        return last_result
+
+    return convert
+
+
+# Characters escaped in PostgreSQL's ``COPY`` text format.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_writer(cursor: Any) -> Callable[[list[Dict[str, Any]]], None]:  # pragma: no cover
+    sql = f"COPY properties ({', '.join(_SEED_COLUMNS)}) FROM STDIN"
+    values_of = operator.itemgetter(*_SEED_COLUMNS)
+    # ``COPY`` cannot skip conflicting rows, so duplicates are dropped here.
+    seen: set[str] = set()
+
+    def write(batch: list[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        for row in batch:
+            if row["id"] in seen:
                 continue
-            for row in _read_csv(csv_path):
-                try:
-                    conn.execute(insert(properties_table).values(**row))
-                except SQLAlchemyIntegrityError:
-                    continue
+            seen.add(row["id"])
+            buffer.write("\t".join(_copy_text(value) for value in values_of(row)))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
 
+    return write
 
-def list_properties() -> list[dict[str, Any]]:
-    """Return all property records ordered by address."""
 
-    stmt: Select = select(properties_table).order_by(properties_table.c.address.asc())
-    with engine.connect() as conn:
+def _copy_text(value: Any) -> str:  # pragma: no cover - needs a PostgreSQL server
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        value = json.dumps(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def data_version(*, primary: bool = False) -> int:
+    """Return the counter bumped by every write to the properties table.
+
+    The counter is read from the read replica, matching the data readers
+    see, unless ``primary`` is set.
+    """
+
+    with (engine if primary else read_engine).connect() as conn:
+        return conn.execute(select(data_version_table.c.version)).scalar() or 0
+
+
+_BUMP_DATA_VERSION = (
+    update(data_version_table)
+    .values(version=data_version_table.c.version + 1)
+    .returning(data_version_table.c.version)
+)
+
+
+def _bump_data_version(conn: Connection) -> int:
+    """Bump the data version and return the new value."""
+
+    return conn.execute(_BUMP_DATA_VERSION).scalar_one()
+
+
+# Grouping columns of ``GET /properties/stats`` keyed by their API name.
+STATS_DIMENSIONS = {
+    "city": "city",
+    "propertyType": "property_type",
+    "status": "status",
+    "saleOrRent": "sale_or_rent",
+}
+
+_STATS_COLUMNS = tuple(
+    properties_table.c[name]
+    for name in ("id", *STATS_DIMENSIONS.values(), "price_cents", "price_per_sqft")
+)
+
+# One listing's contribution to the statistics: its dimension values, price
+# in cents and price per square foot in hundredths, so sums stay exact.
+StatsEntry = tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[int], Optional[int]]
+
+
+def _stats_entry(row: Any) -> StatsEntry:
+    values = [getattr(row, name) for name in STATS_DIMENSIONS.values()]
+    ppsf = None if row.price_per_sqft is None else round(row.price_per_sqft * 100)
+    return (*values, row.price_cents, ppsf)
+
+
+@dataclass(slots=True)
+class _Aggregate:
+    """Count, sums and sorted values of one group of listings."""
+
+    count: int = 0
+    price_sum: int = 0
+    prices: list[int] = field(default_factory=list)
+    ppsf_sum: int = 0
+    ppsfs: list[int] = field(default_factory=list)
+
+    def add(self, price_cents: int | None, ppsf: int | None) -> None:
+        self.count += 1
+        if price_cents is not None:
+            self.price_sum += price_cents
+            bisect.insort(self.prices, price_cents)
+        if ppsf is not None:
+            self.ppsf_sum += ppsf
+            bisect.insort(self.ppsfs, ppsf)
+
+    def discard(self, price_cents: int | None, ppsf: int | None) -> None:
+        self.count -= 1
+        if price_cents is not None:
+            self.price_sum -= price_cents
+            del self.prices[bisect.bisect_left(self.prices, price_cents)]
+        if ppsf is not None:
+            self.ppsf_sum -= ppsf
+            del self.ppsfs[bisect.bisect_left(self.ppsfs, ppsf)]
+
+    def to_api(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avgPrice": _scaled_mean(self.price_sum, self.prices),
+            "medianPrice": _scaled_median(self.prices),
+            "avgPricePerSqft": _scaled_mean(self.ppsf_sum, self.ppsfs),
+            "medianPricePerSqft": _scaled_median(self.ppsfs),
+        }
+
+
+def _scaled_mean(total: int, values: list[int]) -> float | None:
+    return round(total / len(values) / 100, 2) if values else None
+
+
+def _scaled_median(values: list[int]) -> float | None:
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle] / 100
+    return round((values[middle - 1] + values[middle]) / 200, 2)
+
+
+class ListingStats:
+    """Inventory statistics for the listings in the system.
+
+    The aggregates are built from one scan of the table the first time they
+    are read and then kept current by the writers in this process, which pass
+    the stats entries of the rows they touched from before and after the
+    write together with the data version it produced.  A write this process
+    did not see, such as one from another worker, shows up as a gap in the
+    version sequence.  The next read then re-reads only the listings updated
+    since the last read, through the change-feed index, and rescans the
+    table only when too many of them changed.
+
+    Reading the database never happens under ``_lock``: new aggregates are
+    built aside and swapped in, so the event loop, which takes the lock to
+    read the cached statistics and to apply its own writes, is never held up
+    by a scan.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Serialises refreshes so concurrent readers do not repeat a scan.
+        # Only taken by worker threads.
+        self._refresh_lock = threading.Lock()
+        self._version: int | None = None
+        # Latest ``updated_at`` read from the table, where catching up starts.
+        self._watermark: datetime | None = None
+        self._entries: dict[str, StatsEntry] = {}
+        self._total = _Aggregate()
+        self._groups: dict[str, dict[Optional[str], _Aggregate]] = {}
+        self._snapshot: dict[str, Any] | None = None
+
+    @property
+    def tracking(self) -> bool:
+        """Whether writers need to report their changes."""
+
+        return self._version is not None
+
+    def cached(self, version: int) -> dict[str, Any] | None:
+        """Return the statistics if they are current for ``version``."""
+
+        with self._lock:
+            if self._version is None or self._version < version:
+                return None
+            if self._snapshot is None:
+                self._snapshot = self._to_api()
+            return self._snapshot
+
+    def load(self) -> dict[str, Any]:
+        """Return current statistics, catching up on writes made elsewhere."""
+
+        # Writers report the primary's versions, so the primary is compared;
+        # a lagging replica would otherwise force a refresh after each write.
+        version = data_version(primary=True)
+        snapshot = self.cached(version)
+        if snapshot is None:
+            with self._refresh_lock:
+                if self.cached(version) is None:
+                    self._refresh()
+            snapshot = self.cached(version)
+        return snapshot
+
+    def apply(
+        self,
+        version: int,
+        before: Mapping[str, StatsEntry] | None,
+        after: Mapping[str, StatsEntry] | None,
+    ) -> None:
+        """Fold the effect of the write that produced ``version`` into the stats.
+
+        ``before`` and ``after`` map the ids touched by the write to their
+        entries, leaving out rows that were not in the system.  ``None``
+        means the writer did not collect them.  A write that does not follow
+        the current version is left for the next read to catch up on.
+        """
+
+        with self._lock:
+            if self._version != version - 1 or before is None or after is None:
+                return
+            for property_id in before.keys() | after.keys():
+                self._replace(property_id, after.get(property_id))
+            self._version = version
+            self._snapshot = None
+
+    def _invalidate(self) -> None:
+        self._version = None
+        self._watermark = None
+        self._entries = {}
+        self._total = _Aggregate()
+        self._groups = {}
+        self._snapshot = None
+
+    def _refresh(self) -> None:
+        with self._lock:
+            version, watermark = self._version, self._watermark
+        if version is None or watermark is None or not self._catch_up(watermark):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        fresh = ListingStats()
+        dv = data_version_table
+        # Reading the version and the rows in one statement keeps them from
+        # the same snapshot; the outer join still yields the version when no
+        # listing is in the system.
+        stmt = select(dv.c.version, *_STATS_COLUMNS, properties_table.c.updated_at).select_from(
+            dv.outerjoin(properties_table, properties_table.c.in_system == true())
+        )
+        version = 0
+        with engine.connect() as conn:
+            for row in conn.execute(stmt):
+                version = row.version
+                if row.id is not None:
+                    fresh._replace(row.id, _stats_entry(row))
+                    fresh._advance(row.updated_at)
+        with self._lock:
+            if self._version is not None and self._version >= version:
+                return
+            self._entries, self._total, self._groups = fresh._entries, fresh._total, fresh._groups
+            self._version, self._watermark = version, fresh._watermark
+            self._snapshot = None
+
+    def _catch_up(self, watermark: datetime) -> bool:
+        """Re-read the listings updated since ``watermark``.
+
+        Returns ``False`` without changing anything when more than
+        ``STATS_CATCH_UP_ROWS`` listings changed, as a rebuild is then cheaper.
+        """
+
+        c = properties_table.c
+        dv = data_version_table
+        # Writes stamped shortly before the watermark may have committed
+        # after it was read, as in the change feed.
+        since = watermark - timedelta(seconds=CHANGE_FEED_SETTLE_SECONDS)
+        stmt = (
+            select(dv.c.version, *_STATS_COLUMNS, c.in_system, c.updated_at)
+            .select_from(dv.outerjoin(properties_table, c.updated_at >= since))
+            .limit(STATS_CATCH_UP_ROWS + 1)
+        )
+        with engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        if len(rows) > STATS_CATCH_UP_ROWS:
+            return False
+        with self._lock:
+            # Rows read before a write this process has since applied are stale.
+            if self._version is None or self._version >= rows[0].version:
+                return True
+            for row in rows:
+                if row.id is not None:
+                    self._replace(row.id, _stats_entry(row) if row.in_system else None)
+                    self._advance(row.updated_at)
+            self._version = rows[0].version
+            self._snapshot = None
+        return True
+
+    def _advance(self, updated_at: datetime | None) -> None:
+        if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def _replace(self, property_id: str, entry: StatsEntry | None) -> None:
+        previous = self._entries.pop(property_id, None)
+        if previous is not None:
+            self._total.discard(*previous[-2:])
+            for dimension, value in zip(STATS_DIMENSIONS, previous):
+                self._groups[dimension][value].discard(*previous[-2:])
+        if entry is not None:
+            self._entries[property_id] = entry
+            self._total.add(*entry[-2:])
+            for dimension, value in zip(STATS_DIMENSIONS, entry):
+                group = self._groups.setdefault(dimension, {})
+                group.setdefault(value, _Aggregate()).add(*entry[-2:])
+
+    def _to_api(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {"version": self._version, "total": self._total.to_api()}
+        for dimension in STATS_DIMENSIONS:
+            groups = self._groups.get(dimension, {})
+            ranked = sorted(
+                ((value, aggregate) for value, aggregate in groups.items() if aggregate.count),
+                key=lambda item: (-item[1].count, item[0] is None, item[0] or ""),
+            )
+            stats["by" + dimension[0].upper() + dimension[1:]] = [
+                {"value": value, **aggregate.to_api()} for value, aggregate in ranked
+            ]
+        return stats
+
+
+listing_stats = ListingStats()
+
+
+def get_listing_stats() -> dict[str, Any]:
+    """Return counts, prices and price per square foot of the listings in the
+    system, overall and grouped by city, property type, status and sale or
+    rent."""
+
+    return listing_stats.load()
+
+
+def _stats_snapshot(conn: Connection, property_ids: Iterable[str]) -> dict[str, StatsEntry] | None:
+    """Return the stats entries of ``property_ids`` for :meth:`ListingStats.apply`.
+
+    Returns ``None`` without querying while no statistics have been built.
+    """
+
+    if not listing_stats.tracking:
+        return None
+    ids = list(property_ids)
+    if not ids:
+        return {}
+    stmt = select(*_STATS_COLUMNS).where(
+        properties_table.c.id.in_(ids), properties_table.c.in_system == true()
+    )
+    return {row.id: _stats_entry(row) for row in conn.execute(stmt)}
+
+
+def _row_stats(row: Any) -> dict[str, StatsEntry]:
+    return {row.id: _stats_entry(row)} if row.in_system else {}
+
+
+WriteListener = Callable[[list[dict[str, Any]]], None]
+
+_write_listeners: list[WriteListener] = []
+
+
+def add_write_listener(callback: WriteListener) -> None:
+    """Call ``callback`` with the records touched by each committed write.
+
+    Every write made through this module (creating a listing, adding or
+    removing it, bulk imports and syncs) passes the stored records of the
+    rows it wrote, including removed ones, once its transaction has
+    committed.  Callbacks run on the writing thread, so they must be quick;
+    the records are shared between listeners and must not be modified.
+    Writes made by other processes are not reported: follow
+    :func:`list_changes` for those.
+    """
+
+    _write_listeners.append(callback)
+
+
+def remove_write_listener(callback: WriteListener) -> None:
+    """Stop calling a callback registered with :func:`add_write_listener`."""
+
+    try:
+        _write_listeners.remove(callback)
+    except ValueError:
+        pass
+
+
+def _written_rows(conn: Connection, property_ids: list[str]) -> list[Row[Any]]:
+    """Return the rows of ``property_ids`` for the write listeners, or
+    nothing without querying while there are none."""
+
+    if not _write_listeners or not property_ids:
+        return []
+    return conn.execute(_rows_by_id_statement(property_ids)).all()
+
+
+def _after_commit(
+    version: int,
+    before: dict[str, StatsEntry] | None,
+    after: dict[str, StatsEntry] | None,
+    rows: Sequence[Any] = (),
+) -> None:
+    """Pass a committed write on to the statistics and the write listeners."""
+
+    listing_stats.apply(version, before, after)
+    if not rows or not _write_listeners:
+        return
+    records = [_row_to_api(row) for row in rows]
+    for callback in list(_write_listeners):
+        try:
+            callback(records)
+        except Exception:
+            logger.exception("Property write listener %r failed", callback)
+
+
+def _migrate(conn: Connection) -> None:
+    """Apply any entries of ``MIGRATIONS`` newer than the stored version.
+
+    ``create_all`` only creates missing tables, so columns and indexes added
+    after a database was first created are introduced here.  Every step is
+    idempotent because a freshly created table already has the current shape.
+    """
+
+    current = conn.execute(select(func.max(schema_version_table.c.version))).scalar() or 0
+    for version, step in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info("Applying properties schema migration %d (%s)", version, step.__name__)
+        step(conn)
+        current = version
+
+    conn.execute(schema_version_table.delete())
+    conn.execute(insert(schema_version_table).values(version=current))
+
+
+def _create_indexes(conn: Connection, *names: str) -> None:
+    for index in properties_table.indexes:
+        if index.name in names:
+            # ``IF NOT EXISTS`` rather than ``checkfirst`` avoids reflecting
+            # the table, which warns about the metadata expression indexes.
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _add_price_cents(conn: Connection) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("properties")}
+    if "price_cents" not in columns:
+        conn.execute(text("ALTER TABLE properties ADD COLUMN price_cents INTEGER"))
+        _backfill_price_cents(conn)
+    _create_indexes(conn, "ix_properties_price_cents")
+
+
+def _add_secondary_indexes(conn: Connection) -> None:
+    _create_indexes(
+        conn,
+        "ix_properties_listing_number",
+        "ix_properties_state_city",
+        "ix_properties_zip_code",
+        "ix_properties_property_type",
+        "ix_properties_status",
+        "ix_properties_address_id",
+        "ix_properties_in_system_address",
+    )
+
+
+def _backfill_price_cents(conn) -> None:
+    rows = conn.execute(
+        select(properties_table.c.id, properties_table.c.price).where(
+            properties_table.c.price.is_not(None)
+        )
+    ).all()
+    updates = [
+        {"row_id": row.id, "price_cents": cents}
+        for row in rows
+        if (cents := _parse_price_cents(row.price)) is not None
+    ]
+    if updates:
+        conn.execute(
+            update(properties_table)
+            .where(properties_table.c.id == bindparam("row_id"))
+            .values(price_cents=bindparam("price_cents")),
+            updates,
+        )
+
+
+def _add_geo_index(conn: Connection) -> None:
+    _create_indexes(conn, "ix_properties_lat_lng")
+    if conn.dialect.name != "sqlite":
+        return
+    try:
+        conn.execute(
+            text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS properties_geo "
+                "USING rtree(id, min_lat, max_lat, min_lng, max_lng)"
+            )
+        )
+    except OperationalError:  # pragma: no cover - SQLite built without R*Tree
+        logger.warning("SQLite R*Tree module unavailable; geo queries use the lat/lng index")
+        return
+    for statement in (
+        """
+        CREATE TRIGGER IF NOT EXISTS properties_geo_insert AFTER INSERT ON properties
+        WHEN new.lat IS NOT NULL AND new.lng IS NOT NULL
+        BEGIN
+            INSERT OR REPLACE INTO properties_geo VALUES (new.rowid, new.lat, new.lat, new.lng, new.lng);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS properties_geo_update AFTER UPDATE OF lat, lng ON properties
+        BEGIN
+            DELETE FROM properties_geo WHERE id = old.rowid;
+            INSERT INTO properties_geo
+            SELECT new.rowid, new.lat, new.lat, new.lng, new.lng
+            WHERE new.lat IS NOT NULL AND new.lng IS NOT NULL;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS properties_geo_delete AFTER DELETE ON properties
+        BEGIN
+            DELETE FROM properties_geo WHERE id = old.rowid;
+        END
+        """,
+        """
+        INSERT OR REPLACE INTO properties_geo
+        SELECT rowid, lat, lat, lng, lng FROM properties
+        WHERE lat IS NOT NULL AND lng IS NOT NULL
+        """,
+    ):
+        conn.execute(text(statement))
+
+
+def _add_full_text_index(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_properties_search_tsv ON properties "
+                f"USING GIN (({_PG_SEARCH_DOCUMENT.replace('properties.', '')}))"
+            )
+        )
+        return
+    if conn.dialect.name != "sqlite":
+        return
+    try:
+        conn.execute(
+            text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5("
+                "address, city, subdivision, county, agent, office, metadata, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        )
+    except OperationalError:  # pragma: no cover - SQLite built without FTS5
+        logger.warning("SQLite FTS5 module unavailable; search falls back to LIKE")
+        return
+
+    document = (
+        "{row}.rowid, {row}.address, {row}.city, "
+        "json_extract({row}.metadata, '$.subdivision'), "
+        "json_extract({row}.metadata, '$.county'), "
+        "json_extract({row}.metadata, '$.listingAgentName'), "
+        "json_extract({row}.metadata, '$.listingOfficeName'), "
+        "{row}.metadata"
+    )
+    columns = "rowid, address, city, subdivision, county, agent, office, metadata"
+    for statement in (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS properties_fts_insert AFTER INSERT ON properties
+        BEGIN
+            INSERT INTO properties_fts ({columns}) VALUES ({document.format(row="new")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS properties_fts_update
+        AFTER UPDATE OF address, city, metadata ON properties
+        BEGIN
+            DELETE FROM properties_fts WHERE rowid = old.rowid;
+            INSERT INTO properties_fts ({columns}) VALUES ({document.format(row="new")});
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS properties_fts_delete AFTER DELETE ON properties
+        BEGIN
+            DELETE FROM properties_fts WHERE rowid = old.rowid;
+        END
+        """,
+        "DELETE FROM properties_fts",
+        f"INSERT INTO properties_fts ({columns}) SELECT {document.format(row='properties')} FROM properties",
+    ):
+        conn.execute(text(statement))
+
+
+def _drop_derived_indexes(conn: Connection) -> None:
+    """Drop the spatial, full-text and metadata indexes before a bulk load.
+
+    ``_add_geo_index``, ``_add_full_text_index`` and ``_add_metadata_indexes``
+    recreate them and repopulate the derived tables in one statement each,
+    which is far cheaper than firing the sync triggers once per inserted row.
+    """
+
+    for suffix in INDEXED_METADATA_KEYS.values():
+        conn.execute(text(f"DROP INDEX IF EXISTS ix_properties_meta_{suffix}"))
+    if conn.dialect.name == "sqlite":
+        for trigger in (
+            "properties_geo_insert",
+            "properties_geo_update",
+            "properties_geo_delete",
+            "properties_fts_insert",
+            "properties_fts_update",
+            "properties_fts_delete",
+        ):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("DROP INDEX IF EXISTS ix_properties_search_tsv"))
+
+
+def _add_change_feed_index(conn: Connection) -> None:
+    _create_indexes(conn, "ix_properties_updated_at_id")
+
+
+def _native_json_metadata(conn: Connection) -> None:
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # The full-text index expression depends on the column type, so it is
+        # rebuilt around the conversion.
+        conn.execute(text("DROP INDEX IF EXISTS ix_properties_search_tsv"))
+        column_type = conn.execute(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'properties' AND column_name = 'metadata'"
+            )
+        ).scalar()
+        if column_type != "jsonb":
+            conn.execute(
+                text(
+                    "ALTER TABLE properties ALTER COLUMN metadata TYPE JSONB "
+                    "USING NULLIF(metadata, '')::jsonb"
+                )
+            )
+        _add_full_text_index(conn)
+    # SQLite keeps JSON as text and reads it in place with the JSON1 functions.
+    _add_metadata_indexes(conn)
+
+
+def _add_metadata_indexes(conn: Connection) -> None:
+    """Index the metadata keys that listing filters look up by value."""
+
+    dialect = conn.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+    for key, suffix in INDEXED_METADATA_KEYS.items():
+        conn.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_properties_meta_{suffix} "
+                f"ON properties ({_metadata_field_sql(key, dialect)})"
+            )
+        )
+
+
+# Typed listing details added in migration 7, previously dropped from the CSV.
+LISTING_DETAIL_COLUMNS = (
+    "property_subtype",
+    "style",
+    "zoning",
+    "living_area_sqft",
+    "lot_size_sqft",
+    "lot_size_acres",
+    "price_per_sqft",
+    "parking_total",
+    "pool",
+    "garage",
+    "waterfront",
+)
+
+
+def _add_listing_detail_columns(conn: Connection) -> None:
+    existing = {column["name"] for column in inspect(conn).get_columns("properties")}
+    missing = [name for name in LISTING_DETAIL_COLUMNS if name not in existing]
+    for name in missing:
+        column_type = properties_table.c[name].type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE properties ADD COLUMN {name} {column_type}"))
+    if missing:
+        _backfill_listing_details(conn)
+    _create_indexes(
+        conn,
+        "ix_properties_living_area_sqft",
+        "ix_properties_price_per_sqft",
+        "ix_properties_lot_size_acres",
+        "ix_properties_amenities",
+        "ix_properties_property_subtype",
+        "ix_properties_style",
+        "ix_properties_zoning",
+    )
+
+
+def _backfill_listing_details(conn: Connection) -> None:
+    """Fill the detail columns of seeded rows from their source CSV files."""
+
+    c = properties_table.c
+    stmt = (
+        update(properties_table)
+        .where(c.id == bindparam("b_id"))
+        .values({name: bindparam(name) for name in LISTING_DETAIL_COLUMNS})
+    )
+    for csv_path in _seed_candidates():
+        rows = (
+            {"b_id": row["id"], **{name: row[name] for name in LISTING_DETAIL_COLUMNS}}
+            for row in _read_csv(csv_path)
+        )
+        while batch := list(islice(rows, INSERT_BATCH_SIZE)):
+            conn.execute(stmt, batch)
+
+
+def _add_sync_columns(conn: Connection) -> None:
+    existing = {column["name"] for column in inspect(conn).get_columns("properties")}
+    for name in ("source", "content_hash"):
+        if name not in existing:
+            column_type = properties_table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE properties ADD COLUMN {name} {column_type}"))
+    if "source" not in existing:
+        # Seeded rows belong to the MLS feed; their hashes stay empty until
+        # the first sync fills them in.
+        stmt = (
+            update(properties_table)
+            .where(properties_table.c.id == bindparam("b_id"))
+            .values(source=MLS_SOURCE)
+        )
+        for csv_path in _seed_candidates():
+            ids = ({"b_id": row["id"]} for row in _read_csv(csv_path))
+            while batch := list(islice(ids, INSERT_BATCH_SIZE)):
+                conn.execute(stmt, batch)
+    _create_indexes(conn, "ix_properties_source_in_system")
+
+
+def _add_removed_by_column(conn: Connection) -> None:
+    existing = {column["name"] for column in inspect(conn).get_columns("properties")}
+    if "removed_by" not in existing:
+        column_type = properties_table.c.removed_by.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE properties ADD COLUMN removed_by {column_type}"))
+
+
+MIGRATIONS: list[tuple[int, Callable[[Connection], None]]] = [
+    (1, _add_price_cents),
+    (2, _add_secondary_indexes),
+    (3, _add_geo_index),
+    (4, _add_full_text_index),
+    (5, _add_change_feed_index),
+    (6, _native_json_metadata),
+    (7, _add_listing_detail_columns),
+    (8, _add_sync_columns),
+    (9, _add_removed_by_column),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# Query plans that read every row of the properties table.
+_FULL_SCAN_PATTERNS = (
+    re.compile(r"^SCAN properties$"),  # SQLite
+    re.compile(r"Seq Scan on properties\b"),  # PostgreSQL
+)
+# Expanded ``IN`` lists, whose length varies from one call to the next.
+_IN_LIST = re.compile(r"\bIN\s*\([^()]*\)", re.IGNORECASE)
+_explained_statements: set[str] = set()
+
+# Explaining queries costs a round trip per new statement, so the check is a
+# development aid enabled with ``PROPERTIES_REPORT_SCANS=1``.
+REPORT_FULL_SCANS = os.getenv("PROPERTIES_REPORT_SCANS", "0") == "1"
+
+
+def _report_full_scans(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Log a warning the first time a query on ``properties`` needs a full scan.
+
+    Statements are explained once per process, with ``IN`` lists of any
+    length counting as the same statement.  On PostgreSQL the ``EXPLAIN``
+    runs inside a savepoint so a failure cannot abort the caller's
+    transaction.
+    """
+
+    if executemany:
+        return
+    head = statement.lstrip()[:6].upper()
+    if head != "SELECT" or "FROM properties" not in statement:
+        return
+    key = _IN_LIST.sub("IN (...)", statement)
+    if key in _explained_statements:
+        return
+    _explained_statements.add(key)
+
+    postgresql = conn.dialect.name == "postgresql"
+    prefix = "EXPLAIN " if postgresql else "EXPLAIN QUERY PLAN "
+    plan_cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if postgresql:
+            plan_cursor.execute("SAVEPOINT report_full_scans")
+        try:
+            plan_cursor.execute(prefix + statement, parameters)
+            plan = [str(row[-1]) for row in plan_cursor.fetchall()]
+        finally:
+            if postgresql:
+                plan_cursor.execute("ROLLBACK TO SAVEPOINT report_full_scans")
+                plan_cursor.execute("RELEASE SAVEPOINT report_full_scans")
+    except Exception:  # pragma: no cover - diagnostics must never break queries
+        return
+    finally:
+        plan_cursor.close()
+
+    if any(p.search(line.strip()) for line in plan for p in _FULL_SCAN_PATTERNS):
+        logger.warning("Full table scan on properties for query: %s", " ".join(statement.split()))
+
+
+if REPORT_FULL_SCANS:
+    event.listen(engine, "before_cursor_execute", _report_full_scans)
+    if read_engine is not engine:
+        event.listen(read_engine, "before_cursor_execute", _report_full_scans)
+
+
+def list_properties(filters: PropertyFilters | None = None) -> list[dict[str, Any]]:
+    """Return all property records matching ``filters`` ordered by address."""
+
+    stmt = _filtered_select(filters).order_by(
+        properties_table.c.address.asc(), properties_table.c.id.asc()
+    )
+    with read_engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+    return [_row_to_api(row) for row in rows]
+
+
+def iter_properties(
+    filters: PropertyFilters | None = None, *, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield every matching property ordered by address without buffering.
+
+    Rows are read through a server-side cursor ``batch_size`` at a time, so
+    memory use does not depend on the size of the table.  The connection is
+    held until the iterator is exhausted or closed.
+    """
+
+    stmt = _filtered_select(filters).order_by(
+        properties_table.c.address.asc(), properties_table.c.id.asc()
+    )
+    with read_engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        for row in result:
+            yield _row_to_api(row)
+
+
+def list_properties_page(
+    filters: PropertyFilters | None = None,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return one page of properties plus the cursor for the next page.
+
+    Pages are ordered by ``(address, id)`` and continue strictly after the
+    position encoded in ``cursor`` so the cost of a page does not depend on how
+    far into the listing the client has scrolled.  The returned cursor is
+    ``None`` once the last page has been served.  Raises ``ValueError`` for a
+    malformed cursor.
+    """
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    stmt = _page_statement(filters, limit, cursor)
+    with read_engine.connect() as conn:
         rows = conn.execute(stmt).all()
-    return [PropertyRecord(**_row_to_record(row)).to_api() for row in rows]
+    return _page_result(rows, limit)
+
+
+def _page_statement(filters: PropertyFilters | None, limit: int, cursor: str | None) -> Select:
+    stmt = _filtered_select(filters)
+    if cursor:
+        address, property_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(properties_table.c.address, properties_table.c.id)
+            > tuple_(address, property_id)
+        )
+    return stmt.order_by(
+        properties_table.c.address.asc(), properties_table.c.id.asc()
+    ).limit(limit + 1)
+
+
+def _page_result(rows: list[Row[Any]], limit: int) -> tuple[list[dict[str, Any]], str | None]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.address, last.id)
+    return [_row_to_api(row) for row in rows], next_cursor
+
+
+def list_changes(
+    since: str | None = None, *, limit: int = DEFAULT_PAGE_SIZE
+) -> tuple[list[dict[str, Any]], str | None, bool]:
+    """Return properties written after the ``since`` token, oldest first.
+
+    Each record carries ``updatedAt`` and a ``change`` of ``"created"``,
+    ``"updated"`` or ``"removed"`` (soft-removed via :func:`set_in_system`).
+    Returns ``(changes, next_token, has_more)``; passing ``next_token`` back
+    resumes the feed, and without ``since`` the feed starts from the first
+    row.  Raises ``ValueError`` for a malformed token.
+    """
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    stmt, since_at = _changes_statement(since, limit)
+    with read_engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+    return _changes_result(rows, since, since_at, limit)
+
+
+def _changes_statement(since: str | None, limit: int) -> tuple[Select, datetime | None]:
+    c = properties_table.c
+    stmt = select(properties_table).where(
+        c.updated_at <= datetime.utcnow() - timedelta(seconds=CHANGE_FEED_SETTLE_SECONDS)
+    )
+    since_at: datetime | None = None
+    if since:
+        since_iso, since_id = decode_cursor(since)
+        try:
+            since_at = datetime.fromisoformat(since_iso)
+        except ValueError as exc:
+            raise ValueError("Invalid cursor") from exc
+        stmt = stmt.where(tuple_(c.updated_at, c.id) > tuple_(since_at, since_id))
+    return stmt.order_by(c.updated_at.asc(), c.id.asc()).limit(limit + 1), since_at
+
+
+def _changes_result(
+    rows: list[Row[Any]], since: str | None, since_at: datetime | None, limit: int
+) -> tuple[list[dict[str, Any]], str | None, bool]:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = []
+    for row in rows:
+        record = _row_to_api(row)
+        record["updatedAt"] = row.updated_at.isoformat()
+        if not row.in_system:
+            record["change"] = "removed"
+        elif since_at is None or row.created_at > since_at:
+            record["change"] = "created"
+        else:
+            record["change"] = "updated"
+        changes.append(record)
+
+    next_token = since
+    if rows:
+        next_token = encode_cursor(rows[-1].updated_at.isoformat(), rows[-1].id)
+    return changes, next_token, has_more
+
+
+def encode_cursor(address: str, property_id: str) -> str:
+    """Return an opaque, URL-safe cursor for the ``(address, id)`` position."""
+
+    raw = json.dumps([address, property_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Return the ``(address, id)`` pair encoded by :func:`encode_cursor`."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        address, property_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(address, str) or not isinstance(property_id, str):
+        raise ValueError("Invalid cursor")
+    return address, property_id
+
+
+def search_properties(
+    query: str,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: PropertyFilters | None = None,
+) -> list[dict[str, Any]]:
+    """Return properties matching every word of ``query``, best match first.
+
+    Searches address, city, subdivision, county, listing agent and office
+    names and the rest of the listing metadata.  Uses SQLite FTS5 with BM25
+    ranking or a PostgreSQL ``tsvector`` GIN index, and falls back to ``LIKE``
+    on other databases.
+    """
+
+    stmt = _search_statement(query, limit, filters)
+    if stmt is None:
+        return []
+    with read_engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+    return [_row_to_api(row) for row in rows]
+
+
+def _search_statement(query: str, limit: int, filters: PropertyFilters | None) -> Select | None:
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    stmt = _filtered_select(filters)
+    c = properties_table.c
+
+    if _full_text_backend == "fts5":
+        # Quote every term so user input can never be parsed as FTS5 syntax;
+        # the last term is a prefix so results appear while the user types.
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        stmt = (
+            stmt.join(fts_table, fts_table.c.rowid == literal_column("properties.rowid"))
+            .where(text("properties_fts MATCH :fts_query").bindparams(fts_query=match))
+            .order_by(text("properties_fts.rank"), c.id)
+        )
+    elif _full_text_backend == "tsvector":
+        tsquery = func.plainto_tsquery("simple", " ".join(terms))
+        document = literal_column(_PG_SEARCH_DOCUMENT)
+        stmt = stmt.where(document.op("@@")(tsquery)).order_by(
+            func.ts_rank(document, tsquery).desc(), c.id
+        )
+    else:
+        for term in terms:
+            pattern = f"%{term}%"
+            stmt = stmt.where(
+                or_(
+                    c.address.ilike(pattern),
+                    c.city.ilike(pattern),
+                    cast(c.metadata, Text).ilike(pattern),
+                )
+            )
+        stmt = stmt.order_by(c.address, c.id)
+    return stmt.limit(limit)
+
+
+def find_nearby(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: PropertyFilters | None = None,
+) -> list[dict[str, Any]]:
+    """Return properties within ``radius_km`` of a point, nearest first.
+
+    Each record carries an extra ``distanceKm`` key.
+    """
+
+    return _geo_query(_radius_bbox(lat, lng, radius_km), (lat, lng), radius_km, limit, filters)
+
+
+def _radius_bbox(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+    return (lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+
+
+def find_in_bbox(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: PropertyFilters | None = None,
+) -> list[dict[str, Any]]:
+    """Return properties inside a bounding box, nearest to its centre first."""
+
+    centre = _bbox_centre(south, west, north, east)
+    return _geo_query((south, west, north, east), centre, None, limit, filters)
+
+
+def _bbox_centre(south: float, west: float, north: float, east: float) -> tuple[float, float]:
+    return ((south + north) / 2, (west + east) / 2)
+
+
+def _geo_query(
+    bbox: tuple[float, float, float, float],
+    origin: tuple[float, float],
+    radius_km: float | None,
+    limit: int,
+    filters: PropertyFilters | None,
+) -> list[dict[str, Any]]:
+    """Rank the listings inside ``bbox`` by distance from ``origin``.
+
+    Only ids and coordinates of the candidates are read to rank them; full
+    rows are fetched for the ``limit`` nearest ones.
+    """
+
+    with read_engine.connect() as conn:
+        stmt = _geo_candidates_statement(bbox, origin, limit, filters)
+        candidates = conn.execute(stmt).all()
+        ranked = _rank_by_distance(candidates, origin, radius_km, limit)
+        if not ranked:
+            return []
+        rows = conn.execute(_rows_by_id_statement([pid for _, pid in ranked])).all()
+    return _geo_result(ranked, rows)
+
+
+def _geo_candidates_statement(
+    bbox: tuple[float, float, float, float],
+    origin: tuple[float, float],
+    limit: int,
+    filters: PropertyFilters | None,
+) -> Select:
+    """Select the ids and coordinates of the listings in ``bbox`` nearest to
+    ``origin``, at most ``GEO_CANDIDATES_PER_RESULT`` per result."""
+
+    south, west, north, east = bbox
+    c = properties_table.c
+    stmt = _filtered_select(filters).with_only_columns(c.id, c.lat, c.lng)
+    if _use_geo_rtree:
+        g = geo_rtree_table.c
+        stmt = stmt.where(
+            literal_column("properties.rowid").in_(
+                select(g.id).where(
+                    g.max_lat >= south, g.min_lat <= north, g.max_lng >= west, g.min_lng <= east
+                )
+            )
+        )
+    # The R*Tree stores float32 bounds, so its matches are checked against
+    # the exact coordinates.
+    stmt = stmt.where(c.lat.between(south, north), c.lng.between(west, east))
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    lat, lng = origin
+    dlat = c.lat - lat
+    dlng = (c.lng - lng) * math.cos(math.radians(lat))
+    return stmt.order_by(dlat * dlat + dlng * dlng, c.id).limit(
+        limit * GEO_CANDIDATES_PER_RESULT
+    )
+
+
+def _rank_by_distance(
+    candidates: list[Row[Any]],
+    origin: tuple[float, float],
+    radius_km: float | None,
+    limit: int,
+) -> list[tuple[float, str]]:
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    matches = []
+    for row in candidates:
+        distance = _haversine_km(origin[0], origin[1], row.lat, row.lng)
+        if radius_km is None or distance <= radius_km:
+            matches.append((distance, row.id))
+    return heapq.nsmallest(limit, matches)
+
+
+def _rows_by_id_statement(property_ids: list[str]) -> Select:
+    return select(properties_table).where(properties_table.c.id.in_(property_ids))
+
+
+def _geo_result(ranked: list[tuple[float, str]], rows: list[Row[Any]]) -> list[dict[str, Any]]:
+    by_id = {row.id: row for row in rows}
+    results = []
+    for distance, property_id in ranked:
+        record = _row_to_api(by_id[property_id])
+        record["distanceKm"] = round(distance, 3)
+        results.append(record)
+    return results
+
+
+def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
 
 
 def get_property(property_id: str) -> dict[str, Any] | None:
@@ -192,15 +1935,40 @@ def get_property(property_id: str) -> dict[str, Any] | None:
     if not property_id:
         return None
 
-    with engine.connect() as conn:
-        row = conn.execute(
-            select(properties_table).where(properties_table.c.id == property_id)
-        ).first()
+    with read_engine.connect() as conn:
+        row = conn.execute(_rows_by_id_statement([property_id])).first()
 
     if row is None:
         return None
 
-    return PropertyRecord(**_row_to_record(row)).to_api()
+    return _row_to_api(row)
+
+
+def get_properties(property_ids: Iterable[str]) -> list[dict[str, Any]]:
+    """Return the properties for ``property_ids`` in the order given.
+
+    Ids are looked up with primary-key ``IN`` queries of up to
+    ``MAX_PAGE_SIZE`` ids each over a single connection.  Unknown ids are
+    skipped and repeated ids are returned once.
+    """
+
+    ids = _unique_ids(property_ids)
+    rows: list[Row[Any]] = []
+    if ids:
+        with read_engine.connect() as conn:
+            for start in range(0, len(ids), MAX_PAGE_SIZE):
+                chunk = ids[start : start + MAX_PAGE_SIZE]
+                rows.extend(conn.execute(_rows_by_id_statement(chunk)).all())
+    return _in_id_order(ids, rows)
+
+
+def _unique_ids(property_ids: Iterable[str]) -> list[str]:
+    return [pid for pid in dict.fromkeys(property_ids) if pid]
+
+
+def _in_id_order(ids: list[str], rows: list[Row[Any]]) -> list[dict[str, Any]]:
+    by_id = {row.id: row for row in rows}
+    return [_row_to_api(by_id[pid]) for pid in ids if pid in by_id]
 
 
 def create_property(payload: Mapping[str, Any]) -> dict[str, Any]:
@@ -208,38 +1976,632 @@ def create_property(payload: Mapping[str, Any]) -> dict[str, Any]:
 
     data = _normalise_payload(payload)
     with engine.begin() as conn:
-        conn.execute(insert(properties_table).values(**data))
-        row = conn.execute(
-            select(properties_table).where(properties_table.c.id == data["id"])
-        ).one()
-    return PropertyRecord(**_row_to_record(row)).to_api()
+        row = conn.execute(_create_statement(data)).one()
+        version = _bump_data_version(conn)
+    _after_commit(version, {}, _row_stats(row), [row])
+    return _row_to_api(row)
+
+
+def _create_statement(data: Mapping[str, Any]):
+    return insert(properties_table).values(**data).returning(properties_table)
 
 
 def set_in_system(property_id: str, in_system: bool) -> dict[str, Any]:
     """Update the in_system flag for ``property_id`` and return the row."""
 
-    timestamp = datetime.utcnow() if not in_system else None
     with engine.begin() as conn:
-        result = conn.execute(
-            update(properties_table)
-            .where(properties_table.c.id == property_id)
-            .values(
-                in_system=in_system,
-                removed_at=timestamp,
-                updated_at=datetime.utcnow(),
-            )
-            .returning(properties_table)
-        )
-        row = result.first()
+        before = _stats_snapshot(conn, [property_id])
+        row = conn.execute(_set_in_system_statement(property_id, in_system)).first()
         if row is None:
             raise KeyError(property_id)
-    return PropertyRecord(**_row_to_record(row)).to_api()
+        version = _bump_data_version(conn)
+    _after_commit(version, before, _row_stats(row), [row])
+    return _row_to_api(row)
+
+
+def _set_in_system_statement(property_id: str, in_system: bool):
+    now = datetime.utcnow()
+    return (
+        update(properties_table)
+        .where(properties_table.c.id == property_id)
+        .values(
+            in_system=in_system,
+            removed_at=None if in_system else now,
+            removed_by=None,
+            updated_at=now,
+        )
+        .returning(properties_table)
+    )
+
+
+@dataclass(slots=True)
+class BulkImportResult:
+    """Outcome of :func:`bulk_upsert`."""
+
+    processed: int = 0
+    upserted: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_api(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "upserted": self.upserted,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def parse_csv_rows(lines: Iterable[str]) -> Iterator[tuple[int, Dict[str, Any] | None, str | None]]:
+    """Yield ``(row_number, row, error)`` for an MLS export CSV stream."""
+
+    for number, row in enumerate(_map_csv_rows(lines), start=1):
+        if row is None:
+            yield number, None, "Unreadable CSV record"
+        elif _undecodable(row):
+            yield number, None, "Invalid UTF-8"
+        elif not row.get("address"):
+            yield number, None, "Address is required"
+        else:
+            yield number, row, None
+
+
+def parse_ndjson_rows(lines: Iterable[str]) -> Iterator[tuple[int, Dict[str, Any] | None, str | None]]:
+    """Yield ``(row_number, row, error)`` for API-shaped NDJSON records."""
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(payload, Mapping):
+            yield number, None, "Expected a JSON object"
+            continue
+        try:
+            row = _normalise_payload(payload)
+        except (ValueError, OverflowError) as exc:
+            yield number, None, str(exc)
+            continue
+        if _undecodable(row):
+            yield number, None, "Invalid UTF-8"
+        else:
+            yield number, row, None
+
+
+def _undecodable(row: Mapping[str, Any]) -> bool:
+    """Return whether ``row`` holds bytes that were not valid UTF-8.
+
+    Uploaded bodies are decoded with ``errors="surrogateescape"``, which keeps
+    such bytes as lone surrogates instead of failing part way through.
+    """
+
+    for value in row.values():
+        if isinstance(value, str) and not value.isascii():
+            try:
+                value.encode("utf-8")
+            except UnicodeEncodeError:
+                return True
+        elif isinstance(value, Mapping) and _undecodable(value):
+            return True
+    return False
+
+
+# Errors that reject a row rather than the whole import.  Some drivers raise
+# ``OverflowError`` themselves while binding a value the column cannot hold.
+_ROW_ERRORS = (SQLAlchemyError, OverflowError)
+
+
+def bulk_upsert(
+    rows: Iterable[tuple[int, Dict[str, Any] | None, str | None]],
+    *,
+    batch_size: int = INSERT_BATCH_SIZE,
+) -> BulkImportResult:
+    """Insert or update parsed rows in batched transactions.
+
+    ``rows`` comes from :func:`parse_csv_rows` or :func:`parse_ndjson_rows`.
+    Existing listings are updated in place, except for ``in_system`` and
+    ``removed_at`` so an import never restores a listing removed by hand.
+    Each batch commits on its own; if one fails, its rows are retried one by
+    one so a bad row is reported without discarding the rest of the batch.
+    """
+
+    result = BulkImportResult()
+    batch: list[tuple[int, Dict[str, Any]]] = []
+
+    def flush() -> None:
+        if not batch:
+            return
+        # Stamp rows at write time so the change feed sees them in commit order.
+        now = datetime.utcnow()
+        for _, row in batch:
+            row["updated_at"] = now
+        try:
+            with engine.begin() as conn:
+                change = _upsert_tracked(conn, [row for _, row in batch])
+            _after_commit(*change)
+            result.upserted += len(batch)
+        except _ROW_ERRORS:
+            for number, row in batch:
+                # Retrying can take long enough for other writers to commit
+                # later stamps, which the batch stamp would fall behind.
+                row["updated_at"] = datetime.utcnow()
+                try:
+                    with engine.begin() as conn:
+                        change = _upsert_tracked(conn, [row])
+                    _after_commit(*change)
+                    result.upserted += 1
+                except _ROW_ERRORS as exc:
+                    result.add_error(number, str(getattr(exc, "orig", None) or exc).splitlines()[0])
+        batch.clear()
+
+    for number, row, error in rows:
+        result.processed += 1
+        if error is not None:
+            result.add_error(number, error)
+            continue
+        batch.append((number, row))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return result
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """Outcome of :func:`sync_listings`."""
+
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_api(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def sync_listings(
+    rows: Iterable[Dict[str, Any] | None],
+    *,
+    source: str = MLS_SOURCE,
+    remove_missing: bool = True,
+    batch_size: int = INSERT_BATCH_SIZE,
+) -> SyncResult:
+    """Bring the listings of ``source`` in line with a full feed of ``rows``.
+
+    ``rows`` are mapped rows as produced by ``_read_csv``.  Rows are compared
+    with the stored ``content_hash``: new listings are inserted, listings
+    whose hash changed are updated and the rest are not written at all.
+    Listings of ``source`` that are still in the system but absent from the
+    feed are then marked removed, as :func:`set_in_system` would.  Such a
+    listing is restored, and counted as updated, when it reappears in a
+    later feed; as with :func:`bulk_upsert`, a listing removed by hand is
+    not.  Rows without a listing number or address, or holding invalid
+    UTF-8, are reported and never cause their listing to be removed.  A
+    ``None`` row stands for a record the CSV reader rejected; its listing is
+    unknown, so nothing is removed from such a feed.
+    """
+
+    result = SyncResult()
+    seen: set[str] = set()
+    unreadable = False
+    c = properties_table.c
+
+    def write(batch: list[Dict[str, Any]]) -> None:
+        ids = [row["id"] for row in batch]
+        change = None
+        with engine.begin() as conn:
+            stored = {}
+            restored = set()
+            for property_id, content_hash, removed_by in conn.execute(
+                select(c.id, c.content_hash, c.removed_by).where(c.id.in_(ids))
+            ):
+                stored[property_id] = content_hash
+                if removed_by == SYNC_REMOVAL:
+                    restored.add(property_id)
+            unhashed = [property_id for property_id, value in stored.items() if value is None]
+            if unhashed:
+                stored.update(_backfill_content_hashes(conn, unhashed))
+            changed = [
+                row
+                for row in batch
+                if stored.get(row["id"], "") != row["content_hash"] or row["id"] in restored
+            ]
+            if changed:
+                now = datetime.utcnow()
+                for row in changed:
+                    row["updated_at"] = now
+                change = _upsert_tracked(conn, changed, restore=restored)
+        if change is not None:
+            _after_commit(*change)
+        inserted = sum(1 for row in changed if row["id"] not in stored)
+        result.inserted += inserted
+        result.updated += len(changed) - inserted
+        result.unchanged += len(batch) - len(changed)
+
+    batch: dict[str, Dict[str, Any]] = {}
+    for number, row in enumerate(rows, start=1):
+        result.processed += 1
+        if row is None:
+            unreadable = True
+            result.add_error(number, "Unreadable CSV record")
+            continue
+        if not row.get("listing_number"):
+            result.add_error(number, "Listing Number is required")
+            continue
+        seen.add(row["id"])
+        if _undecodable(row):
+            result.add_error(number, "Invalid UTF-8")
+            continue
+        if not row.get("address"):
+            result.add_error(number, "Address is required")
+            continue
+        row["source"] = source
+        # A later row for the same listing wins, as it would in a full reload.
+        batch[row["id"]] = row
+        if len(batch) >= batch_size:
+            write(list(batch.values()))
+            batch.clear()
+    if batch:
+        write(list(batch.values()))
+
+    if remove_missing:
+        if unreadable:
+            logger.warning("Feed for %s had unreadable records; skipping removal", source)
+        elif seen:
+            result.removed = _remove_missing(source, seen, batch_size)
+        else:
+            logger.warning("Feed for %s had no listings; skipping removal", source)
+    return result
+
+
+def _remove_missing(source: str, seen: set[str], batch_size: int) -> int:
+    c = properties_table.c
+    # Read from the primary: a lagging replica would miss listings the feed
+    # just restored or inserted and still list ones already removed.
+    with engine.connect() as conn:
+        stored = conn.execute(
+            select(c.id).where(c.source == source, c.in_system == true())
+        ).scalars()
+        missing = [property_id for property_id in stored if property_id not in seen]
+
+    removed = 0
+    for start in range(0, len(missing), batch_size):
+        chunk = missing[start : start + batch_size]
+        now = datetime.utcnow()
+        with engine.begin() as conn:
+            before = _stats_snapshot(conn, chunk)
+            # Listings removed by hand since the read above are not counted.
+            removed += conn.execute(
+                update(properties_table)
+                .where(c.id.in_(chunk), c.in_system == true())
+                .values(in_system=False, removed_at=now, removed_by=SYNC_REMOVAL, updated_at=now)
+            ).rowcount
+            version = _bump_data_version(conn)
+            rows = _written_rows(conn, chunk)
+        _after_commit(version, before, {}, rows)
+    return removed
+
+
+def _backfill_content_hashes(conn: Connection, property_ids: list[str]) -> dict[str, str]:
+    """Hash and store the content of listings saved without a hash.
+
+    The first seed leaves the hashes out to load faster, so the first sync
+    hashes the stored listings instead of rewriting every one of them.
+    """
+
+    hashes = {
+        row.id: _content_hash(row._mapping)
+        for row in conn.execute(_rows_by_id_statement(property_ids))
+    }
+    conn.execute(
+        update(properties_table)
+        .where(properties_table.c.id == bindparam("b_id"))
+        .values(content_hash=bindparam("b_hash")),
+        [{"b_id": property_id, "b_hash": value} for property_id, value in hashes.items()],
+    )
+    return hashes
+
+
+def sync_csv(lines: Iterable[str], **kwargs: Any) -> SyncResult:
+    """Run :func:`sync_listings` over the lines of an MLS export CSV."""
+
+    return sync_listings(_map_csv_rows(lines), **kwargs)
+
+
+def _content_hash(row: Mapping[str, Any]) -> str:
+    """Return a digest of the listing content of a mapped row.
+
+    Bookkeeping columns are left out so re-reading an unchanged listing
+    always yields the same hash.  Values are hashed through ``repr``, which is
+    much cheaper than a canonical JSON encoding and stable for these types.
+    """
+
+    encoded = repr(tuple(row.get(name) for name in _HASHED_COLUMNS))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+_HASHED_COLUMNS = tuple(
+    column.name
+    for column in properties_table.columns
+    if column.name
+    not in {
+        "id",
+        "in_system",
+        "removed_at",
+        "removed_by",
+        "source",
+        "content_hash",
+        "created_at",
+        "updated_at",
+    }
+)
+
+
+def _upsert_tracked(
+    conn: Connection, rows: list[Dict[str, Any]], *, restore: Iterable[str] = ()
+) -> tuple[int, dict[str, StatsEntry] | None, dict[str, StatsEntry] | None, list[Row[Any]]]:
+    """Upsert ``rows`` and bump the data version.
+
+    Listings in ``restore`` that a sync marked removed are put back in the
+    system.  Returns the arguments for :func:`_after_commit`, to be passed
+    on once the transaction has committed.
+    """
+
+    ids = [row["id"] for row in rows]
+    before = _stats_snapshot(conn, ids)
+    conn.execute(_upsert_statement(conn), rows)
+    restore = list(restore)
+    if restore:
+        c = properties_table.c
+        conn.execute(
+            update(properties_table)
+            .where(c.id.in_(restore), c.removed_by == SYNC_REMOVAL)
+            .values(in_system=True, removed_at=None, removed_by=None)
+        )
+    after = _stats_snapshot(conn, ids) if before is not None else None
+    return _bump_data_version(conn), before, after, _written_rows(conn, ids)
+
+
+def _upsert_statement(conn: Connection):
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite.insert(properties_table)
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(properties_table)
+    else:  # pragma: no cover - other dialects
+        raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+    preserved = {"id", "created_at", "in_system", "removed_at", "removed_by"}
+    set_ = {
+        column.name: stmt.excluded[column.name]
+        for column in properties_table.columns
+        if column.name not in preserved
+    }
+    # Rows without a source (API imports) keep the feed the listing came from.
+    set_["source"] = func.coalesce(stmt.excluded.source, properties_table.c.source)
+    return stmt.on_conflict_do_update(index_elements=["id"], set_=set_)
+
+
+def _filtered_select(filters: PropertyFilters | None) -> Select:
+    stmt: Select = select(properties_table)
+    if filters is None:
+        return stmt
+
+    c = properties_table.c
+    conditions = []
+    for column, value in (
+        (c.city, filters.city),
+        (c.state, filters.state),
+        (c.zip_code, filters.zip_code),
+        (c.status, filters.status),
+        (c.property_type, filters.property_type),
+        (c.sale_or_rent, filters.sale_or_rent),
+        (c.property_subtype, filters.property_subtype),
+        (c.style, filters.style),
+        (c.zoning, filters.zoning),
+    ):
+        if value is not None:
+            conditions.append(column == value)
+    for column, flag in (
+        (c.waterfront, filters.waterfront),
+        (c.pool, filters.pool),
+        (c.garage, filters.garage),
+    ):
+        if flag is not None:
+            conditions.append(column == (true() if flag else false()))
+    if filters.min_living_area is not None:
+        conditions.append(c.living_area_sqft >= filters.min_living_area)
+    if filters.max_living_area is not None:
+        conditions.append(c.living_area_sqft <= filters.max_living_area)
+    if filters.min_lot_acres is not None:
+        conditions.append(c.lot_size_acres >= filters.min_lot_acres)
+    if filters.max_price_per_sqft is not None:
+        conditions.append(c.price_per_sqft <= filters.max_price_per_sqft)
+    if filters.min_price is not None:
+        conditions.append(c.price_cents >= round(filters.min_price * 100))
+    if filters.max_price is not None:
+        conditions.append(c.price_cents <= round(filters.max_price * 100))
+    if filters.min_beds is not None:
+        conditions.append(c.beds >= filters.min_beds)
+    if filters.min_baths is not None:
+        conditions.append(c.baths >= filters.min_baths)
+    for key, value in (
+        ("listingAgentName", filters.listing_agent),
+        ("listingOfficeName", filters.listing_office),
+        ("county", filters.county),
+        ("subdivision", filters.subdivision),
+    ):
+        if value is not None:
+            conditions.append(_metadata_field(key) == value)
+    if filters.in_system is not None:
+        # Compare against a literal so the planner can match the partial
+        # ``in_system`` index.
+        conditions.append(c.in_system == true() if filters.in_system else c.in_system != true())
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+    return stmt
+
+
+# Columns of a full ``properties`` row in the order ``_row_to_api`` unpacks them.
+_API_COLUMNS = (
+    "id",
+    "listing_number",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+    "price",
+    "beds",
+    "baths",
+    "year_built",
+    "status",
+    "property_type",
+    "sale_or_rent",
+    "property_subtype",
+    "style",
+    "zoning",
+    "living_area_sqft",
+    "lot_size_sqft",
+    "lot_size_acres",
+    "price_per_sqft",
+    "parking_total",
+    "pool",
+    "garage",
+    "waterfront",
+    "lat",
+    "lng",
+    "in_system",
+    "removed_at",
+    "metadata",
+)
+_api_values = operator.itemgetter(
+    *(properties_table.columns.keys().index(name) for name in _API_COLUMNS)
+)
+
+
+def _row_to_api(row: Row[Any]) -> dict[str, Any]:
+    """Map a full ``properties`` row straight to its API representation.
+
+    Produces the same dict as ``PropertyRecord(**_row_to_record(row)).to_api()``
+    but reads the row positionally, skipping the intermediate mapping and
+    dataclass, since listing responses call this once per row.
+    """
+
+    (
+        property_id,
+        listing_number,
+        address,
+        city,
+        state,
+        zip_code,
+        price,
+        beds,
+        baths,
+        year_built,
+        status,
+        property_type,
+        sale_or_rent,
+        property_subtype,
+        style,
+        zoning,
+        living_area_sqft,
+        lot_size_sqft,
+        lot_size_acres,
+        price_per_sqft,
+        parking_total,
+        pool,
+        garage,
+        waterfront,
+        lat,
+        lng,
+        in_system,
+        removed_at,
+        meta,
+    ) = _api_values(row)
+    return {
+        "id": property_id,
+        "listingNumber": listing_number,
+        "address": address,
+        "city": city,
+        "state": state,
+        "zipCode": zip_code,
+        "price": price,
+        "beds": beds,
+        "baths": baths,
+        "year": year_built,
+        "status": status,
+        "type": property_type,
+        "saleOrRent": sale_or_rent,
+        "subtype": property_subtype,
+        "style": style,
+        "zoning": zoning,
+        "livingAreaSqft": living_area_sqft,
+        "lotSizeSqft": lot_size_sqft,
+        "lotSizeAcres": lot_size_acres,
+        "pricePerSqft": price_per_sqft,
+        "parkingTotal": parking_total,
+        "pool": None if pool is None else bool(pool),
+        "garage": None if garage is None else bool(garage),
+        "waterfront": None if waterfront is None else bool(waterfront),
+        "lat": lat,
+        "lng": lng,
+        "inSystem": bool(in_system),
+        "removedAt": removed_at.isoformat() if removed_at else None,
+        "metadata": _load_metadata(meta),
+    }
+
+
+def _load_metadata(value: Any) -> dict[str, Any]:
+    if not value:
+        return {}
+    if isinstance(value, Mapping):
+        return dict(value)
+    try:
+        decoded = orjson.loads(value) if orjson is not None else json.loads(value)
+    except ValueError:  # pragma: no cover - defensive
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """Serialise API data to JSON bytes, using ``orjson`` when installed."""
+
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
 
 
 def _row_to_record(row: Row[Any]) -> dict[str, Any]:
     data = dict(row._mapping)
     data.pop("created_at", None)
     data.pop("updated_at", None)
+    data.pop("price_cents", None)
+    data.pop("source", None)
+    data.pop("content_hash", None)
+    data.pop("removed_by", None)
     meta = data.get("metadata")
     if isinstance(meta, str) and meta:
         try:
@@ -253,6 +2615,7 @@ def _row_to_record(row: Row[Any]) -> dict[str, Any]:
 
 def _normalise_payload(payload: Mapping[str, Any]) -> Dict[str, Any]:
     data: MutableMapping[str, Any] = dict(payload)
+    price = _maybe_str(data.get("price") or data.get("listPrice"))
     identifier = str(data.pop("id", "") or data.get("listingNumber") or uuid4())
 
     metadata_blob = data.pop("metadata", None)
@@ -267,20 +2630,37 @@ def _normalise_payload(payload: Mapping[str, Any]) -> Dict[str, Any]:
         "city": _maybe_str(data.get("city")),
         "state": _maybe_str(data.get("state")),
         "zip_code": _maybe_str(data.get("zipCode")),
-        "price": _maybe_str(data.get("price") or data.get("listPrice")),
+        "price": price,
+        "price_cents": _parse_price_cents(price),
         "beds": _maybe_float(data.get("beds") or data.get("bedrooms")),
         "baths": _maybe_float(data.get("baths") or data.get("bathrooms")),
         "year_built": _maybe_int(data.get("year") or data.get("yearBuilt")),
         "status": _maybe_str(data.get("status") or data.get("listingStatus")),
         "property_type": _maybe_str(data.get("type") or data.get("propertyType")),
         "sale_or_rent": _maybe_str(data.get("saleOrRent")),
+        "property_subtype": _maybe_str(data.get("subtype") or data.get("propertySubtype")),
+        "style": _maybe_str(data.get("style")),
+        "zoning": _maybe_str(data.get("zoning")),
+        "living_area_sqft": _maybe_int(_parse_number(data.get("livingAreaSqft"))),
+        "lot_size_sqft": _maybe_int(_parse_number(data.get("lotSizeSqft"))),
+        "lot_size_acres": _parse_number(data.get("lotSizeAcres")),
+        "price_per_sqft": _parse_number(data.get("pricePerSqft")),
+        "parking_total": _maybe_int(_parse_number(data.get("parkingTotal"))),
+        "pool": _parse_flag(data.get("pool")),
+        "garage": _parse_flag(data.get("garage")),
+        "waterfront": _parse_flag(data.get("waterfront")),
         "lat": _maybe_float(data.get("lat") or data.get("latitude")),
         "lng": _maybe_float(data.get("lng") or data.get("longitude")),
         "in_system": bool(data.get("inSystem", True)),
-        "metadata": json.dumps(metadata_payload or _extract_metadata(data)),
+        "metadata": metadata_payload or _extract_metadata(data),
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
     }
+    if data_map["price_per_sqft"] is None:
+        data_map["price_per_sqft"] = _derive_price_per_sqft(
+            data_map["price_cents"], data_map["living_area_sqft"]
+        )
+    data_map["content_hash"] = _content_hash(data_map)
     return data_map
 
 
@@ -307,47 +2687,146 @@ def _extract_metadata(raw: Mapping[str, Any]) -> dict[str, Any]:
         "latitude",
         "lng",
         "longitude",
+        "subtype",
+        "propertySubtype",
+        "style",
+        "zoning",
+        "livingAreaSqft",
+        "lotSizeSqft",
+        "lotSizeAcres",
+        "pricePerSqft",
+        "parkingTotal",
+        "pool",
+        "garage",
+        "waterfront",
         "inSystem",
     }
     return {k: v for k, v in raw.items() if k not in ignore}
 
 
-def _read_csv(path: Path) -> Iterable[Dict[str, Any]]:
-    import csv
+# MLS export columns read by ``_read_csv``; all other columns are skipped
+# without being stripped or copied.
+_CSV_COLUMNS = (
+    "Listing Number",
+    "Address",
+    "City",
+    "State",
+    "Zip Code",
+    "List Price",
+    "Bedrooms",
+    "Full Bathrooms",
+    "Half Bathrooms",
+    "Year Built",
+    "Listing Status",
+    "Property Type",
+    "Sale or Rent",
+    "Property Subtype",
+    "Style",
+    "Zoning",
+    "Building/Living Area (sf)",
+    "Lot Size (sf)",
+    "Lot Size (acres)",
+    "PPSF",
+    "Parking Total",
+    "Pool (Y/N)",
+    "Garage (Y/N)",
+    "Waterfront (Y/N)",
+    "Latitude",
+    "Longitude",
+    "Listing Agent Name",
+    "Listing Office Name",
+    "County",
+    "Subdivision",
+)
+
 
+def _read_csv(path: Path, *, hashed: bool = True) -> Iterable[Dict[str, Any]]:
+    # Streamed rather than read through ``listings_dataset``: seed and sync
+    # files can hold millions of rows and are only read once.
     with path.open("r", encoding="utf-8", newline="") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            cleaned = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-            baths = _safe_float(cleaned.get("Full Bathrooms")) + 0.5 * _safe_float(
-                cleaned.get("Half Bathrooms")
-            )
-            metadata = {
-                "listingAgentName": cleaned.get("Listing Agent Name"),
-                "listingOfficeName": cleaned.get("Listing Office Name"),
-                "county": cleaned.get("County"),
-                "subdivision": cleaned.get("Subdivision"),
-            }
-            yield {
-                "id": cleaned.get("Listing Number") or str(uuid4()),
-                "listing_number": cleaned.get("Listing Number"),
-                "address": cleaned.get("Address"),
-                "city": cleaned.get("City"),
-                "state": cleaned.get("State"),
-                "zip_code": cleaned.get("Zip Code"),
-                "price": cleaned.get(" List Price "),
-                "beds": _safe_float(cleaned.get("Bedrooms")),
-                "baths": baths if baths else None,
-                "year_built": _safe_int(cleaned.get("Year Built")),
-                "status": cleaned.get("Listing Status"),
-                "property_type": cleaned.get("Property Type"),
-                "sale_or_rent": cleaned.get("Sale or Rent"),
-                "lat": _safe_float(cleaned.get("Latitude")),
-                "lng": _safe_float(cleaned.get("Longitude")),
-                "metadata": json.dumps(metadata),
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-            }
+        for row in _map_csv_rows(fh, hashed=hashed):
+            if row is None:
+                logger.warning("Skipping unreadable CSV record in %s", path.name)
+            else:
+                yield row
+
+
+def _map_csv_rows(
+    lines: Iterable[str], *, hashed: bool = True
+) -> Iterator[Dict[str, Any] | None]:
+    """Map MLS export CSV lines to ``properties`` rows.
+
+    Yields ``None`` for a record the CSV reader rejects, such as one with an
+    oversized field, and carries on with the next one.  ``hashed=False``
+    leaves out ``content_hash``.
+    """
+
+    import csv
+
+    now = datetime.utcnow()
+    reader = csv.reader(lines)
+    header = [name.strip() for name in next(reader, [])]
+    positions = [(name, header.index(name)) for name in _CSV_COLUMNS if name in header]
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            yield None
+            continue
+        width = len(values)
+        cleaned = {name: values[i].strip() for name, i in positions if i < width}
+        baths = _safe_float(cleaned.get("Full Bathrooms")) + 0.5 * _safe_float(
+            cleaned.get("Half Bathrooms")
+        )
+        metadata = {
+            "listingAgentName": cleaned.get("Listing Agent Name"),
+            "listingOfficeName": cleaned.get("Listing Office Name"),
+            "county": cleaned.get("County"),
+            "subdivision": cleaned.get("Subdivision"),
+        }
+        price_cents = _parse_price_cents(cleaned.get("List Price"))
+        living_area = _maybe_int(_parse_number(cleaned.get("Building/Living Area (sf)")))
+        price_per_sqft = _parse_number(cleaned.get("PPSF"))
+        if price_per_sqft is None:
+            price_per_sqft = _derive_price_per_sqft(price_cents, living_area)
+        row = {
+            "id": cleaned.get("Listing Number") or str(uuid4()),
+            "listing_number": cleaned.get("Listing Number"),
+            "address": cleaned.get("Address"),
+            "city": cleaned.get("City"),
+            "state": cleaned.get("State"),
+            "zip_code": cleaned.get("Zip Code"),
+            "price": cleaned.get("List Price"),
+            "price_cents": price_cents,
+            "beds": _safe_float(cleaned.get("Bedrooms")),
+            "baths": baths if baths else None,
+            "year_built": _safe_int(cleaned.get("Year Built")),
+            "status": cleaned.get("Listing Status"),
+            "property_type": cleaned.get("Property Type"),
+            "sale_or_rent": cleaned.get("Sale or Rent"),
+            "property_subtype": cleaned.get("Property Subtype") or None,
+            "style": cleaned.get("Style") or None,
+            "zoning": cleaned.get("Zoning") or None,
+            "living_area_sqft": living_area,
+            "lot_size_sqft": _maybe_int(_parse_number(cleaned.get("Lot Size (sf)"))),
+            "lot_size_acres": _parse_number(cleaned.get("Lot Size (acres)")),
+            "price_per_sqft": price_per_sqft,
+            "parking_total": _maybe_int(_parse_number(cleaned.get("Parking Total"))),
+            "pool": _parse_flag(cleaned.get("Pool (Y/N)")),
+            "garage": _parse_flag(cleaned.get("Garage (Y/N)")),
+            "waterfront": _parse_flag(cleaned.get("Waterfront (Y/N)")),
+            "lat": _safe_float(cleaned.get("Latitude")),
+            "lng": _safe_float(cleaned.get("Longitude")),
+            "metadata": metadata,
+            "source": MLS_SOURCE,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if hashed:
+            row["content_hash"] = _content_hash(row)
+        yield row
 
 
 def _require_str(value: Any) -> str:
@@ -371,11 +2850,73 @@ def _maybe_float(value: Any) -> Optional[float]:
 
 def _maybe_int(value: Any) -> Optional[int]:
     try:
-        return int(float(value)) if value not in (None, "") else None
-    except (TypeError, ValueError):
+        return _bounded_int(int(float(value))) if value not in (None, "") else None
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
+# Integers outside the range of a 64-bit column are rejected by the database
+# drivers (SQLite raises ``OverflowError`` while binding), so they are treated
+# as invalid values.
+_MAX_INTEGER = 2**63 - 1
+
+
+def _bounded_int(value: int) -> Optional[int]:
+    return value if -_MAX_INTEGER <= value <= _MAX_INTEGER else None
+
+
+def _parse_price_cents(value: Any) -> Optional[int]:
+    """Return ``value`` as a whole number of cents, e.g. ``" $895.00 "`` -> ``89500``."""
+
+    if value is None:
+        return None
+    cleaned = str(value).strip().replace("$", "").replace(",", "")
+    if not cleaned:
+        return None
+    try:
+        cents = Decimal(cleaned) * 100
+        # Skip converting absurd exponents such as "1e999999" to an int.
+        if cents.is_finite() and cents.adjusted() > 19:
+            return None
+        return _bounded_int(int(cents.to_integral_value()))
+    except (InvalidOperation, ValueError, OverflowError):
+        return None
+
+
+def _parse_number(value: Any) -> Optional[float]:
+    """Return ``value`` as a float ignoring ``$`` and ``,``, or ``None`` if blank or invalid."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    cleaned = str(value).strip().replace("$", "").replace(",", "")
+    if not cleaned:
+        return None
+    try:
+        number = float(cleaned)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _parse_flag(value: Any) -> Optional[bool]:
+    """Return a ``Y``/``N`` style flag as a bool, or ``None`` if unknown."""
+
+    if value is None or isinstance(value, bool):
+        return value
+    cleaned = str(value).strip().lower()
+    if cleaned in ("y", "yes", "true", "1"):
+        return True
+    if cleaned in ("n", "no", "false", "0"):
+        return False
+    return None
+
+
+def _derive_price_per_sqft(price_cents: Optional[int], living_area: Optional[int]) -> Optional[float]:
+    if not price_cents or not living_area or living_area <= 0:
+        return None
+    return round(price_cents / 100 / living_area, 2)
+
+
 def _safe_float(value: Any) -> float:
     try:
         return float(str(value).replace(",", "").replace("$", ""))
@@ -385,11 +2926,6 @@ def _safe_float(value: Any) -> float:
 
 def _safe_int(value: Any) -> Optional[int]:
     try:
-        return int(float(str(value).replace(",", "")))
-    except (TypeError, ValueError):
+        return _bounded_int(int(float(str(value).replace(",", ""))))
+    except (TypeError, ValueError, OverflowError):
         return None
-
-
-# Initialise the database when the module is imported.
-init_db()
-
@@ -2,17 +2,28 @@ from __future__ import annotations
 
 import argparse
 import base64
+from datetime import datetime, timedelta
 import json
 import os
+import threading
+import time
+from types import ModuleType
 import uuid
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 from urllib.parse import unquote
 
 import boto3
 import requests
 from botocore.exceptions import NoCredentialsError, ClientError
 from dotenv import load_dotenv
+
+try:  # pragma: no cover - import flexibility for different entry points
+    from .listing_search import BM25Index, IncrementalBM25Index
+    from .listings_dataset import ListingsDataset, load_listings, watch_listings
+except ImportError:  # fallback when running from the backend directory
+    from listing_search import BM25Index, IncrementalBM25Index
+    from listings_dataset import ListingsDataset, load_listings, watch_listings
 
 # Load environment variables from a .env file at the project root so boto3
 # can pick up AWS credentials during local development.
@@ -83,8 +94,82 @@ def normalize_listing(p: Dict[str, object]) -> Dict[str, object]:
     }
 
 
+def _search_text(p: Dict[str, object]) -> str:
+    """Return the text a listing is matched against."""
+    # Some datasets have only an "address" and others a "location" as well.
+    # Index both when present so the same retriever works with residential
+    # ``properties.json``, the commercial ``rag_data.json`` and the MLS CSV.
+    fields = (p.get("address"), p.get("location"), p.get("description"), p.get("type"))
+    return " ".join(str(value) for value in fields if value)
+
+
+def _listing(
+    listing_id: Optional[str],
+    address: Optional[str],
+    city: Optional[str],
+    state: Optional[str],
+    price: Optional[str],
+    property_type: Optional[str],
+    subtype: Optional[str],
+) -> Dict[str, object]:
+    """Build a listing in the retriever's schema."""
+    state_abbr = (state or "").upper()
+    state_full = _STATE_ABBREVIATIONS.get(state_abbr, state_abbr)
+    location = f"{city or ''}, {state_full}".strip(", ")
+    price_str = (price or "").replace("$", "").replace(",", "")
+    try:
+        price_value = int(float(price_str)) if price_str else None
+    except ValueError:
+        price_value = None
+    return {
+        "id": listing_id,
+        "address": address,
+        "location": location,
+        "price": price_value,
+        "type": property_type,
+        "description": subtype,
+    }
+
+
+def _csv_listing(cleaned: Dict[str, str]) -> Dict[str, object]:
+    """Map an MLS export row to the retriever's listing schema."""
+    return _listing(
+        cleaned.get("Listing Number"),
+        cleaned.get("Address"),
+        cleaned.get("City"),
+        cleaned.get("State"),
+        cleaned.get("List Price"),
+        cleaned.get("Property Type"),
+        cleaned.get("Property Subtype"),
+    )
+
+
+def _store_listing(record: Mapping[str, Any]) -> Dict[str, object]:
+    """Map a ``properties_store`` record to the retriever's listing schema."""
+    price = record.get("price")
+    return _listing(
+        record.get("id"),
+        record.get("address"),
+        record.get("city"),
+        record.get("state"),
+        None if price is None else str(price),
+        record.get("type"),
+        record.get("subtype"),
+    )
+
+
+def _index_csv_listings(dataset: ListingsDataset) -> Tuple[Tuple[Dict[str, object], ...], BM25Index]:
+    properties = tuple(_csv_listing(record) for record in dataset.records())
+    return properties, BM25Index(_search_text(p) for p in properties)
+
+
 class PropertyRetriever:
-    """Naive retrieval over local property listing data."""
+    """BM25 keyword retrieval over local property listing data.
+
+    CSV listings are reloaded in the background when the file changes.  The
+    listings and their index are swapped in together, so a search always
+    runs against one consistent snapshot.
+    """
 
     def __init__(self, data_file: Path | str):
         """Load property data from ``data_file`` if it exists.
@@ -95,66 +180,185 @@ class PropertyRetriever:
         front end can continue to function.
         """
 
+        self._reload_listeners: List[Callable[[Sequence[Dict[str, object]]], None]] = []
         path = Path(data_file).resolve()
         try:
             if path.suffix.lower() == ".csv":
-                import csv
-
-                with path.open("r", encoding="utf-8", newline="") as f:
-                    reader = csv.DictReader(f)
-                    self.properties = []
-                    for row in reader:
-                        cleaned = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                        state_abbr = cleaned.get("State", "").upper()
-                        state_full = _STATE_ABBREVIATIONS.get(state_abbr, state_abbr)
-                        location = f"{cleaned.get('City', '')}, {state_full}".strip(", ")
-                        price_str = cleaned.get("List Price", "").replace("$", "").replace(",", "")
-                        try:
-                            price = int(float(price_str)) if price_str else None
-                        except ValueError:
-                            price = None
-                        self.properties.append(
-                            {
-                                "id": cleaned.get("Listing Number"),
-                                "address": cleaned.get("Address"),
-                                "location": location,
-                                "price": price,
-                                "type": cleaned.get("Property Type"),
-                                "description": cleaned.get("Property Subtype"),
-                            }
-                        )
+                # CSV listings are parsed and indexed once per process and
+                # shared by every retriever over the same file.
+                dataset = load_listings(path)
+                self._state = dataset.derived("property_retriever", _index_csv_listings)
+                watch_listings(path, self._reload)
             else:
                 with path.open("r", encoding="utf-8") as f:
-                    self.properties = json.load(f)
+                    properties = json.load(f)
+                self._state = (properties, BM25Index(_search_text(p) for p in properties))
         except FileNotFoundError:
             # Gracefully handle missing data file so the server can still run.
-            self.properties = []
+            self._state = ([], BM25Index(()))
             print(f"Property data file not found: {path}. Using empty dataset.")
 
+    @property
+    def properties(self) -> Sequence[Dict[str, object]]:
+        return self._state[0]
+
+    def add_reload_listener(self, callback: Callable[[Sequence[Dict[str, object]]], None]) -> None:
+        """Call ``callback`` with the new listings each time they are reloaded."""
+        self._reload_listeners.append(callback)
+
+    def _reload(self, dataset: ListingsDataset) -> None:
+        self._state = dataset.derived("property_retriever", _index_csv_listings)
+        for callback in self._reload_listeners:
+            callback(self._state[0])
+
     def search(self, query: str, limit: int = 3) -> List[Dict[str, object]]:
-        q_words = query.lower().split()
-        scored: List[Tuple[int, Dict[str, object]]] = []
-        for p in self.properties:
-            # Some datasets use "address" instead of "location". Use ``get`` to
-            # avoid ``KeyError`` and to support both schemas so the same
-            # retriever can work with residential ``properties.json`` and the
-            # commercial ``rag_data.json``.
-            location = p.get("location") or p.get("address", "")
-            description = p.get("description", "")
-            category = p.get("type", "")
-            text = f"{location} {description} {category}".lower()
-            score = sum(word in text for word in q_words)
-            if score:
-                scored.append((score, p))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [p for _, p in scored[:limit]]
+        """Return up to ``limit`` listings ranked by BM25 relevance to ``query``."""
+        properties, index = self._state
+        return [properties[position] for position, _ in index.top(query, limit)]
+
+
+class StorePropertyRetriever:
+    """BM25 retrieval over the listings in the property database.
+
+    Once a store has been attached with :meth:`attach` and is initialised,
+    the listings still in the system are loaded in the background and then
+    kept current one row at a time: writes made through the store here update
+    the index as they commit, and the change feed is polled every
+    ``PROPERTIES_RETRIEVER_POLL_INTERVAL`` seconds (5 by default, ``0``
+    disables it) for writes made by other workers.  Until the first load has
+    finished, searches go to ``fallback``.
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[PropertyRetriever] = None,
+        *,
+        poll_interval: Optional[float] = None,
+    ):
+        self.fallback = fallback
+        if poll_interval is None:
+            poll_interval = float(os.getenv("PROPERTIES_RETRIEVER_POLL_INTERVAL", "5"))
+        self.poll_interval = poll_interval
+        self._listings: Dict[str, Dict[str, object]] = {}
+        self._index = IncrementalBM25Index()
+        self._update_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._source: Optional[ModuleType] = None
+        self._store: Optional[ModuleType] = None
+        self._fallback_reason: Optional[str] = None
+        self._since: Optional[str] = None
+        self._loaded = threading.Event()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    def attach(self, store: ModuleType) -> None:
+        """Search the listings of ``store`` once its ``init_db`` has finished."""
+        self._source = store
+
+    def search(self, query: str, limit: int = 3) -> List[Dict[str, object]]:
+        """Return up to ``limit`` listings ranked by BM25 relevance to ``query``."""
+        if not self._loaded.is_set():
+            reason = self._start()
+            if reason != self._fallback_reason:
+                self._fallback_reason = reason
+                print(f"Searching the fallback listings: {reason}.")
+            return self.fallback.search(query, limit) if self.fallback else []
+        listings = self._listings
+        results = []
+        for key, _ in self._index.top(query, limit):
+            # A listing removed after ranking is simply left out.
+            listing = listings.get(key)
+            if listing is not None:
+                results.append(listing)
+        return results
+
+    def _start(self) -> str:
+        """Start loading the attached store and return why it is not used yet."""
+        # Only a process serving the property API attaches the store; others
+        # keep using the fallback.
+        store = self._source
+        if store is None:
+            return "no property store is attached"
+        if not store.init_progress.ready:
+            return "the property store is not ready"
+        with self._start_lock:
+            if self._store is None:
+                self._store = store
+                threading.Thread(
+                    target=self._run, args=(store,), name="store-retriever", daemon=True
+                ).start()
+        return "the property store is still loading"
+
+    def _run(self, store: ModuleType) -> None:
+        try:
+            self.load(store)
+        except Exception as exc:  # broad catch to keep chat running
+            print("Loading listings from the property store failed:", exc)
+            self._store = None
+            return
+        while self.poll_interval > 0:
+            time.sleep(self.poll_interval)
+            try:
+                self.catch_up()
+            except Exception as exc:  # the poller must keep running
+                print("Following property changes failed:", exc)
+
+    def load(self, store: ModuleType) -> None:
+        """Load the listings in the system from ``store`` and follow its writes."""
+        self._store = store
+        started = datetime.utcnow()
+        store.add_write_listener(self._apply)
+        try:
+            self._apply(store.iter_properties(store.PropertyFilters(in_system=True)))
+        except Exception:
+            store.remove_write_listener(self._apply)
+            raise
+        # Rows written while the table was being read are seen again through
+        # the change feed, which holds rows back for a settling period.
+        settle = timedelta(seconds=store.CHANGE_FEED_SETTLE_SECONDS)
+        self._since = store.encode_cursor((started - settle).isoformat(), "")
+        self._loaded.set()
+
+    def catch_up(self) -> None:
+        """Apply the changes listed by the store's change feed since the last call."""
+        store = self._store
+        if store is None or self._since is None:
+            return
+        has_more = True
+        while has_more:
+            changes, self._since, has_more = store.list_changes(
+                self._since, limit=store.MAX_PAGE_SIZE
+            )
+            self._apply(changes)
+
+    def close(self) -> None:
+        """Stop following the store's writes."""
+        if self._store is not None:
+            self._store.remove_write_listener(self._apply)
+
+    def _apply(self, records: Iterable[Mapping[str, Any]]) -> None:
+        for record in records:
+            key = record["id"]
+            with self._update_lock:
+                if record.get("inSystem"):
+                    listing = _store_listing(record)
+                    self._index.put(key, _search_text(listing))
+                    self._listings[key] = listing
+                else:
+                    self._index.discard(key)
+                    self._listings.pop(key, None)
 
 
 class RAGRetriever:
     """Retrieve property listings from an external RAG service."""
 
-    def __init__(self, endpoint: str, fallback: Optional[PropertyRetriever] = None):
+    def __init__(
+        self,
+        endpoint: str,
+        fallback: Optional[PropertyRetriever | StorePropertyRetriever] = None,
+    ):
         self.endpoint = endpoint
         self.fallback = fallback
 
@@ -467,15 +671,14 @@ def main() -> None:
         parser.print_help()
 
 
-
 if __name__ == "__main__":
     main()
 
 
 # Global chatbot instance reused by the web API
-# Prefer an external RAG service if configured; otherwise fall back to the
-# bundled commercial listing data. The local data is also used as a fallback if
-# the remote service is unavailable.
+# Prefer an external RAG service if configured; otherwise search the property
+# database, or the bundled listings CSV until the database is ready. The local
+# data is also used as a fallback if the remote service is unavailable.
 _rag_url = os.getenv("RAG_SERVER_URL")
 _data_path = (
     Path(__file__).resolve().parents[1]
@@ -483,7 +686,7 @@ _data_path = (
     / "data"
     / "listings.csv"
 )
-_local_retriever = PropertyRetriever(_data_path)
+_local_retriever = StorePropertyRetriever(PropertyRetriever(_data_path))
 if _rag_url:
     _retriever = RAGRetriever(_rag_url, fallback=_local_retriever)
 else:
@@ -494,6 +697,14 @@ _sonic = SonicClient()
 _bot = PropertyChatbot(_retriever, _llm, _sonic)
 
 
+def use_property_store(store: ModuleType) -> None:
+    """Answer chat searches from ``store`` once it is ready instead of the CSV.
+
+    Called by the app serving the property API, which owns the store.
+    """
+    _local_retriever.attach(store)
+
+
 async def process_user_query(query: str):
     """Handle a user text query and return answer plus property cards."""
     answer, listings = _bot.ask_text(query)
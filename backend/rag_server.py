@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Any, NamedTuple, Sequence
 
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -29,24 +29,43 @@ _data_path = (
     Path(__file__).resolve().parents[1] / "frontend" / "data" / "listings.csv"
 )
 _retriever = PropertyRetriever(_data_path)
-_properties: List[dict] = _retriever.properties
 
-# Build simple TF-IDF index at startup
-_corpus = [
-    f"{p.get('address', '')} {p.get('description', '')} {p.get('type', '')}"
-    for p in _properties
-]
-_vectorizer = TfidfVectorizer().fit(_corpus)
-_doc_matrix = _vectorizer.transform(_corpus)
+
+class _TfidfIndex(NamedTuple):
+    properties: Sequence[dict]
+    vectorizer: TfidfVectorizer
+    doc_matrix: Any
+
+
+def _build_index(properties: Sequence[dict]) -> _TfidfIndex:
+    """Build a simple TF-IDF index over ``properties``."""
+    corpus = [
+        f"{p.get('address', '')} {p.get('description', '')} {p.get('type', '')}"
+        for p in properties
+    ]
+    vectorizer = TfidfVectorizer().fit(corpus)
+    return _TfidfIndex(properties, vectorizer, vectorizer.transform(corpus))
+
+
+def _reload_index(properties: Sequence[dict]) -> None:
+    # Rebuilt on the watcher thread and swapped in as one object, so a query
+    # never sees the listings of one version with the matrix of another.
+    global _index
+    _index = _build_index(properties)
+
+
+_index = _build_index(_retriever.properties)
+_retriever.add_reload_listener(_reload_index)
 
 
 @app.post("/query")
 def query_listings(q: Query):
     """Return top-k property listings matching the query."""
-    vec = _vectorizer.transform([q.query])
-    sims = cosine_similarity(vec, _doc_matrix)[0]
+    index = _index
+    vec = index.vectorizer.transform([q.query])
+    sims = cosine_similarity(vec, index.doc_matrix)[0]
     top = sims.argsort()[::-1][: q.k]
-    results = [_properties[i] for i in top]
+    results = [index.properties[i] for i in top]
     return {"results": results}
 
 
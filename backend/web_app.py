@@ -10,12 +10,13 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from langgraph_app import app_graph
-from property_chatbot import SonicClient
+from property_chatbot import SonicClient, use_property_store
 import auth
 from auth import get_current_user
 from appointments import router as appointments_router
 from leads import router as leads_router
 from properties import router as properties_router
+import properties_store
 from emails import EmailMessage, get_provider
 from gmail_accounts import (
     delete_account as delete_gmail_account,
@@ -37,6 +38,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 templates = Jinja2Templates(directory="templates")
@@ -47,6 +49,8 @@ _sonic = SonicClient()
 app.include_router(appointments_router)
 app.include_router(leads_router)
 app.include_router(properties_router)
+# Chat searches the listings served by the property API once it is ready.
+use_property_store(properties_store)
 
 # In-memory cache for per-user email credentials gathered during the sync flow.
 # Keys are provider names (``gmail`` or ``outlook``) and map to dictionaries of
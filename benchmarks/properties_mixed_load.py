@@ -0,0 +1,126 @@
+"""Compare listing throughput under a mixed read/write load.
+
+Runs the same workload twice against a freshly seeded SQLite database:
+
+* ``baseline`` - one default engine shared by readers and writers with the
+  rollback journal, as ``properties_store`` used before engine profiles.
+* ``tuned`` - the store's WAL profile with reads routed through a separate
+  read-only engine, as when ``PROPERTIES_DB_READ_URL`` is set.
+
+Usage::
+
+    python benchmarks/properties_mixed_load.py --seconds 5 --readers 8 --writers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _baseline_engine(url: str):
+    """Return the pre-profile engine after switching the file back to the rollback journal."""
+
+    import sqlite3
+
+    from sqlalchemy import create_engine
+
+    with sqlite3.connect(url.removeprefix("sqlite:///")) as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    return create_engine(url, future=True, connect_args={"check_same_thread": False})
+
+
+def _run(store, ids: list[str], cities: list[str], seconds: float, readers: int, writers: int) -> dict:
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader() -> None:
+        rng = random.Random()
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                if rng.random() < 0.5:
+                    store.list_properties_page(
+                        store.PropertyFilters(city=rng.choice(cities)), limit=50
+                    )
+                else:
+                    store.get_property(rng.choice(ids))
+                done += 1
+            except Exception:
+                errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    def writer() -> None:
+        rng = random.Random()
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                store.set_in_system(rng.choice(ids), rng.random() < 0.5)
+                done += 1
+            except Exception:
+                errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {key: value / seconds if key != "errors" else value for key, value in counts.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'properties.db'}"
+        os.environ["PROPERTIES_DB_URL"] = url
+        os.environ["PROPERTIES_REPORT_SCANS"] = "0"
+        import properties_store as store
+
+        store.init_db()
+        with store.engine.connect() as conn:
+            rows = conn.execute(
+                store.select(store.properties_table.c.id, store.properties_table.c.city)
+            ).all()
+        ids = [row.id for row in rows]
+        cities = sorted({row.city for row in rows if row.city})
+
+        store.engine.dispose()
+        baseline = _baseline_engine(url)
+        tuned = (store._build_engine(url), store._build_engine(url, read_only=True))
+        for name, (write_engine, read_engine) in (
+            ("baseline", (baseline, baseline)),
+            ("tuned", tuned),
+        ):
+            store.engine, store.read_engine = write_engine, read_engine
+            result = _run(store, ids, cities, args.seconds, args.readers, args.writers)
+            print(
+                f"{name:>8}: {result['reads']:8.0f} reads/s  "
+                f"{result['writes']:7.0f} writes/s  {result['errors']} errors"
+            )
+            write_engine.dispose()
+            read_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure how fast an empty listings database is seeded from an MLS export.
+
+Writes a CSV of ``--rows`` listings by repeating ``frontend/data/listings.csv``
+under fresh listing numbers, seeds a new SQLite database from it through
+``init_db`` and reports rows/sec, split into CSV mapping and the load itself
+(inserts plus index builds).
+
+Usage::
+
+    python benchmarks/properties_seed.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from itertools import count
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+SAMPLE_CSV = ROOT_DIR / "frontend" / "data" / "listings.csv"
+
+
+def _write_export(path: Path, rows: int) -> None:
+    with SAMPLE_CSV.open(encoding="utf-8", newline="") as fh:
+        header, *sample = list(csv.reader(fh))
+    with path.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        written = 0
+        for copy in count():
+            for values in sample:
+                if written == rows:
+                    return
+                writer.writerow([f"{values[0]}-{copy}", *values[1:]])
+                written += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export = Path(tmp) / "export.csv"
+        _write_export(export, args.rows)
+        os.environ["PROPERTIES_DB_URL"] = f"sqlite:///{Path(tmp) / 'properties.db'}"
+        os.environ["PROPERTIES_REPORT_SCANS"] = "0"
+        import properties_store as store
+
+        started = time.perf_counter()
+        for _ in store._read_csv(export, hashed=False):
+            pass
+        mapping = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store.init_db([export])
+        seeding = time.perf_counter() - started
+        # The bundled sample CSV is always seeded as well.
+        with store.engine.connect() as conn:
+            seeded = conn.execute(
+                store.select(store.func.count()).select_from(store.properties_table)
+            ).scalar()
+
+        print(f"{seeded} rows")
+        print(f"  CSV mapping: {mapping:6.1f} s  {args.rows / mapping:8.0f} rows/sec")
+        print(f"  full seed:   {seeding:6.1f} s  {seeded / seeding:8.0f} rows/sec")
+        print(f"  1M rows at this rate: ~{1_000_000 * seeding / seeded:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measure the per-row cost of turning listing rows into a JSON response.
+
+Compares the original path (``dict(row._mapping)`` -> ``PropertyRecord`` ->
+``to_api()`` -> pydantic ``Property`` validation -> JSON) against the store's
+positional ``_row_to_api`` mapper plus ``to_json_bytes``.
+
+Usage::
+
+    python benchmarks/properties_serialization.py --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _time_per_row(label: str, func, rows) -> None:
+    started = time.perf_counter()
+    body = func(rows)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:>9}: {elapsed * 1e6 / len(rows):6.2f} us/row  "
+        f"{elapsed * 1000:8.1f} ms total  {len(body) / 1e6:6.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PROPERTIES_DB_URL"] = f"sqlite:///{Path(tmp) / 'properties.db'}"
+        os.environ["PROPERTIES_REPORT_SCANS"] = "0"
+        import properties_store as store
+        from pydantic import TypeAdapter
+
+        from properties import Property
+
+        store.init_db()
+        with store.engine.connect() as conn:
+            sample = conn.execute(store.select(store.properties_table)).all()
+        rows = (sample * (args.rows // len(sample) + 1))[: args.rows]
+        adapter = TypeAdapter(list[Property])
+
+        def original(batch):
+            page = [store.PropertyRecord(**store._row_to_record(row)).to_api() for row in batch]
+            return adapter.dump_json(adapter.validate_python(page))
+
+        def fast(batch):
+            return store.to_json_bytes([store._row_to_api(row) for row in batch])
+
+        print(f"{len(rows)} rows, orjson {'enabled' if store.orjson else 'not installed'}")
+        _time_per_row("original", original, rows)
+        _time_per_row("fast", fast, rows)
+
+
+if __name__ == "__main__":
+    main()
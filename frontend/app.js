@@ -627,6 +627,40 @@ async function createPropertyRecord(payload) {
   return resp.json();
 }
 
+// Cursor of the next page of /properties, or null once the last page is loaded.
+let nextPropertyCursor = null;
+
+async function fetchPropertyPage(cursor) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const resp = await authFetch(`${window.API_BASE_URL}/properties${query}`);
+  if (!resp.ok) {
+    console.warn('Property API returned non-OK response', resp.status);
+    return null;
+  }
+  const data = await resp.json();
+  if (!Array.isArray(data)) return null;
+  nextPropertyCursor = resp.headers.get('X-Next-Cursor');
+  return data;
+}
+
+async function loadMoreProperties() {
+  if (!window.API_BASE_URL || !nextPropertyCursor) return;
+  let page = null;
+  try {
+    page = await fetchPropertyPage(nextPropertyCursor);
+  } catch (err) {
+    console.warn('Failed to load more properties', err);
+  }
+  if (!page) {
+    showToast('Failed to load more properties');
+    return;
+  }
+  const props = Array.isArray(state.data.properties) ? state.data.properties : [];
+  const known = new Set(props.map(p => String(p.id)));
+  state.data.properties = normaliseProperties([...props, ...page.filter(p => !known.has(String(p.id)))]);
+  refreshSourcingView();
+}
+
 async function loadInitialProperties() {
   const fallback = async () => {
     try {
@@ -642,13 +676,8 @@ async function loadInitialProperties() {
 
   if (window.API_BASE_URL) {
     try {
-      const resp = await authFetch(`${window.API_BASE_URL}/properties`);
-      if (resp.ok) {
-        const data = await resp.json();
-        if (Array.isArray(data)) return normaliseProperties(data);
-      } else {
-        console.warn('Property API returned non-OK response', resp.status);
-      }
+      const page = await fetchPropertyPage(null);
+      if (page) return normaliseProperties(page);
     } catch (err) {
       console.warn('Failed to load properties from API', err);
     }
@@ -1303,7 +1332,15 @@ async function router(){
       onRestore:id=>markPropertyStatus(id,true),
       onView:id=>openPropertyDetail(id)
     });
-    wrap.append(map,addBtn,grid.el);
+    const moreBtn=document.createElement('button');
+    moreBtn.textContent='Load more properties';
+    moreBtn.hidden=!nextPropertyCursor;
+    moreBtn.addEventListener('click',async()=>{
+      moreBtn.disabled=true;
+      try{ await loadMoreProperties(); }
+      finally{ moreBtn.disabled=false; }
+    });
+    wrap.append(map,addBtn,grid.el,moreBtn);
     grid.update(props);
     main.appendChild(wrap);
     if(addIntent==='property'){
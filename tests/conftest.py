@@ -0,0 +1,12 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def listing_snapshot_dir(tmp_path_factory):
+    """Keep listing snapshots written during tests out of the user's cache."""
+
+    os.environ["LISTINGS_SNAPSHOT_DIR"] = str(tmp_path_factory.mktemp("listing-snapshots"))
+    yield
+    os.environ.pop("LISTINGS_SNAPSHOT_DIR", None)
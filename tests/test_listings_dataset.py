@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sqlite3
+
+import pytest
+
+from backend.agents.sql import SQLQueryExecutorAgent
+from backend import listings_dataset
+from backend.listings_dataset import load_listings
+from backend.property_chatbot import PropertyRetriever
+
+CSV = (
+    "Listing Number, Address ,City,State,List Price,Property Subtype,Property Type\n"
+    "1, 1 Main St ,Doral,FL,$100,Condo,Residential\n"
+    "\n"
+    "2,2 Side St,Miami,FL,$200,Warehouse,Commercial\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "listings.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return path
+
+
+def test_listings_are_parsed_once_and_stripped(csv_path):
+    dataset = load_listings(csv_path)
+    assert load_listings(str(csv_path)) is dataset
+    assert dataset.columns[:2] == ("Listing Number", "Address")
+    assert [record["Address"] for record in dataset.records()] == ["1 Main St", "2 Side St"]
+
+
+def test_changed_file_is_parsed_again(csv_path):
+    dataset = load_listings(csv_path)
+    csv_path.write_text(CSV + "3,3 New St,Doral,FL,$300,Condo,Residential\n", encoding="utf-8")
+    reloaded = load_listings(csv_path)
+    assert reloaded is not dataset
+    assert len(reloaded) == 3 and len(dataset) == 2
+
+
+def test_retrievers_share_listings_and_index(csv_path):
+    first, second = PropertyRetriever(csv_path), PropertyRetriever(csv_path)
+    assert first.properties is second.properties
+    assert first._state is second._state
+    assert [p["id"] for p in second.search("warehouse")] == ["2"]
+
+
+def test_executors_share_a_read_only_database(csv_path):
+    first, second = SQLQueryExecutorAgent(csv_path), SQLQueryExecutorAgent(csv_path)
+    rows = asyncio.run(second.handle("SELECT address FROM properties WHERE price > 150"))["content"]
+    assert rows == [{"address": "2 Side St"}]
+    with pytest.raises(sqlite3.OperationalError):
+        first.conn.execute("DELETE FROM properties")
+    assert len(asyncio.run(first.handle("SELECT * FROM properties"))["content"]) == 2
+
+
+def test_snapshot_is_reused_until_the_content_changes(csv_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("LISTINGS_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    parsed = load_listings(csv_path)
+    assert list((tmp_path / "snapshots").glob("listings-*.snapshot"))
+
+    def fail(*args):
+        raise AssertionError("listings were parsed again")
+
+    monkeypatch.setattr(listings_dataset, "_parse", fail)
+    listings_dataset._datasets.clear()
+    assert load_listings(csv_path).rows == parsed.rows
+
+    # Touching the file without changing it keeps the snapshot valid.
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    listings_dataset._datasets.clear()
+    assert load_listings(csv_path).digest == parsed.digest
+
+    monkeypatch.undo()
+    monkeypatch.setenv("LISTINGS_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    csv_path.write_text(CSV.replace("$200", "$250"), encoding="utf-8")
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    listings_dataset._datasets.clear()
+    assert [r["List Price"] for r in load_listings(csv_path).records()] == ["$100", "$250"]
+
+
+def test_unreadable_snapshot_is_rebuilt(csv_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("LISTINGS_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    expected = load_listings(csv_path).rows
+    (snapshot,) = (tmp_path / "snapshots").glob("*.snapshot")
+    snapshot.write_bytes(snapshot.read_bytes()[:40])
+    listings_dataset._datasets.clear()
+    assert load_listings(csv_path).rows == expected
+
+
+def test_watched_consumers_swap_in_reloaded_listings(csv_path):
+    retriever = PropertyRetriever(csv_path)
+    executor = SQLQueryExecutorAgent(csv_path)
+    reloaded = []
+    retriever.add_reload_listener(reloaded.append)
+    old_properties, old_conn = retriever.properties, executor.conn
+
+    csv_path.write_text(CSV + "3,3 New St,Tampa,FL,$300,Warehouse,Commercial\n", encoding="utf-8")
+    listings_dataset.check_for_changes()
+
+    assert [p["id"] for p in retriever.search("warehouse tampa", limit=1)] == ["3"]
+    assert reloaded == [retriever.properties]
+    rows = asyncio.run(executor.handle("SELECT id FROM properties WHERE price = 300"))["content"]
+    assert rows == [{"id": "3"}]
+    # Whoever still holds the previous snapshot keeps reading it unchanged.
+    assert len(old_properties) == 2
+    assert old_conn.execute("SELECT COUNT(*) FROM properties").fetchone()[0] == 2
+
+
+def test_snapshots_default_to_the_user_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("LISTINGS_SNAPSHOT_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert listings_dataset.snapshot_dir() == tmp_path / "real-estate-agent" / "listing-snapshots"
+    monkeypatch.setenv("LISTINGS_SNAPSHOTS", "0")
+    assert listings_dataset.snapshot_dir() is None
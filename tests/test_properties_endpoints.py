@@ -0,0 +1,448 @@
+import csv
+import importlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# ``properties`` imports ``properties_store`` as a top-level module, so the
+# backend directory itself must be importable.
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("properties") / "properties.db"
+    os.environ["PROPERTIES_DB_URL"] = f"sqlite:///{db_path}"
+    import async_properties_store
+    import properties_store
+    import properties
+
+    importlib.reload(properties_store)
+    importlib.reload(async_properties_store)
+    importlib.reload(properties)
+    app = FastAPI()
+    app.include_router(properties.router)
+    # One client session keeps a single event loop for the async engine pool.
+    with TestClient(app) as test_client:
+        deadline = time.monotonic() + 60
+        while test_client.get("/properties/ready").status_code != 200:
+            assert time.monotonic() < deadline, "property store never became ready"
+            time.sleep(0.05)
+        yield test_client
+    os.environ.pop("PROPERTIES_DB_URL", None)
+
+
+def test_ready_reports_seeding_progress(client):
+    resp = client.get("/properties/ready")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["state"] == "ready"
+    assert body["rowsSeeded"] >= 5000
+    assert body["source"] == "listings.csv"
+
+
+def test_requests_are_rejected_until_store_is_ready(client, monkeypatch):
+    import properties_store
+
+    monkeypatch.setattr(properties_store, "init_progress", properties_store.InitProgress(state="seeding"))
+    resp = client.get("/properties", params={"limit": 1})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"]
+    resp = client.get("/properties/ready")
+    assert resp.status_code == 503
+    assert resp.json()["state"] == "seeding"
+
+
+def test_store_initialisation_is_retried_with_backoff(monkeypatch):
+    import asyncio
+
+    import properties
+    import properties_store
+
+    attempts = []
+
+    def init_db():
+        attempts.append(None)
+        if len(attempts) < 4:
+            raise properties_store.OperationalError("SELECT 1", {}, Exception("database is down"))
+
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(properties_store, "init_db", init_db)
+    monkeypatch.setattr(properties, "INIT_RETRY_INITIAL_SECONDS", 1.0)
+    monkeypatch.setattr(properties, "INIT_RETRY_MAX_SECONDS", 3.0)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    asyncio.run(properties._initialise_store())
+    assert len(attempts) == 4
+    assert delays == [1.0, 2.0, 3.0]
+
+
+def test_list_properties_is_paginated_with_cursor(client):
+    resp = client.get("/properties", params={"limit": 50})
+    assert resp.status_code == 200
+    first = resp.json()
+    assert len(first) == 50
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get("/properties", params={"limit": 50, "cursor": cursor})
+    second = resp.json()
+    assert len(second) == 50
+    assert not {p["id"] for p in first} & {p["id"] for p in second}
+    keys = [(p["address"], p["id"]) for p in first + second]
+    assert keys == sorted(keys)
+
+
+def test_list_properties_walks_every_page(client):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 1000, "city": "Tamarac"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/properties", params=params)
+        seen.extend(resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen
+    assert all(p["city"] == "Tamarac" for p in seen)
+    assert len({p["id"] for p in seen}) == len(seen)
+
+
+def test_list_properties_filters_in_sql(client):
+    resp = client.get(
+        "/properties",
+        params={"saleOrRent": "RENT", "minPrice": 1000, "maxPrice": 2000, "minBeds": 2},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data
+    for item in data:
+        assert item["saleOrRent"] == "RENT"
+        assert item["beds"] >= 2
+        price = float(item["price"].replace("$", "").replace(",", ""))
+        assert 1000 <= price <= 2000
+
+
+def test_list_properties_by_ids_keeps_requested_order(client):
+    sample = client.get("/properties", params={"limit": 3}).json()
+    ids = [sample[2]["id"], "NO-SUCH-ID", sample[0]["id"], sample[2]["id"]]
+    resp = client.get("/properties", params={"ids": ",".join(ids)})
+    assert resp.status_code == 200
+    assert [p["id"] for p in resp.json()] == [sample[2]["id"], sample[0]["id"]]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_properties_filters_on_listing_details(client):
+    params = {"waterfront": "true", "pool": "true", "minSqft": 2000, "maxPricePerSqft": 300}
+    resp = client.get("/properties", params=params)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data
+    for item in data:
+        assert item["waterfront"] is True and item["pool"] is True
+        assert item["livingAreaSqft"] >= 2000
+        assert item["pricePerSqft"] <= 300
+
+
+FILTERED_ENDPOINTS = {
+    "/properties": {},
+    "/properties/search": {"q": "Tamarac"},
+    "/properties/nearby": {"lat": 26.2, "lng": -80.25, "radius": 3},
+    "/properties/bbox": {"south": 26.0, "west": -80.3, "north": 26.1, "east": -80.2},
+    "/properties/export": {},
+}
+
+
+@pytest.mark.parametrize("path", FILTERED_ENDPOINTS)
+@pytest.mark.parametrize(
+    "bound", [{"minPrice": "1e300"}, {"maxPrice": "inf"}, {"maxPrice": "nan"}, {"minBeds": "inf"}]
+)
+def test_numeric_filters_reject_values_out_of_range(client, path, bound):
+    resp = client.get(path, params={**FILTERED_ENDPOINTS[path], **bound})
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize("path", FILTERED_ENDPOINTS)
+@pytest.mark.parametrize(
+    "bound",
+    [
+        {"minSqft": "1" + "0" * 30},
+        {"maxSqft": str(2**63)},
+        {"minLotAcres": "inf"},
+        {"maxPricePerSqft": "1e300"},
+    ],
+)
+def test_listing_detail_filters_reject_values_out_of_range(client, path, bound):
+    resp = client.get(path, params={**FILTERED_ENDPOINTS[path], **bound})
+    assert resp.status_code == 422
+
+
+def test_list_properties_rejects_bad_cursor(client):
+    resp = client.get("/properties", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+def test_nearby_returns_listings_sorted_by_distance(client):
+    resp = client.get("/properties/nearby", params={"lat": 26.2280705, "lng": -80.252189, "radius": 3})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data[0]["id"] == "F10317770"
+    distances = [p["distanceKm"] for p in data]
+    assert distances == sorted(distances)
+    assert all(d <= 3 for d in distances)
+
+
+def test_bbox_returns_only_listings_inside_box(client):
+    box = {"south": 26.0, "west": -80.3, "north": 26.1, "east": -80.2}
+    resp = client.get("/properties/bbox", params={**box, "limit": 1000})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data
+    for item in data:
+        assert box["south"] <= item["lat"] <= box["north"]
+        assert box["west"] <= item["lng"] <= box["east"]
+
+    resp = client.get("/properties/bbox", params={**box, "south": 27.0})
+    assert resp.status_code == 400
+
+
+def test_search_ranks_full_text_matches(client):
+    resp = client.get("/properties/search", params={"q": "University Tamarac"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data
+    for item in data:
+        text = f"{item['address']} {item['city']}".lower()
+        assert "universit" in text and "tamarac" in text
+
+
+def test_search_covers_metadata_and_tracks_writes(client):
+    created = client.post(
+        "/properties",
+        json={
+            "address": "77 Searchable Rd",
+            "city": "Doral",
+            "metadata": {"listingAgentName": "Quintessa Zephyrine"},
+        },
+    ).json()
+
+    data = client.get("/properties/search", params={"q": "zephyrine"}).json()
+    assert [p["id"] for p in data] == [created["id"]]
+
+    client.post(f"/properties/{created['id']}/remove")
+    data = client.get("/properties/search", params={"q": "zephyrine", "inSystem": "true"}).json()
+    assert data == []
+
+
+def test_list_properties_filters_on_metadata(client):
+    resp = client.get("/properties", params={"county": "Broward", "limit": 20})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data
+    assert all(p["metadata"]["county"] == "Broward" for p in data)
+
+
+def test_search_ignores_fts_syntax_in_query(client):
+    resp = client.get("/properties/search", params={"q": 'NEAR( "unbalanced AND OR *'})
+    assert resp.status_code == 200
+
+
+def test_list_properties_supports_conditional_requests(client):
+    params = {"limit": 5, "city": "Doral"}
+    resp = client.get("/properties", params=params)
+    etag = resp.headers["ETag"]
+
+    resp = client.get("/properties", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    client.post("/properties", json={"address": "1 Etag Ave", "city": "Doral"})
+    resp = client.get("/properties", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+def test_export_streams_ndjson(client):
+    resp = client.get("/properties/export", params={"city": "Tamarac"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert rows and all(r["city"] == "Tamarac" for r in rows)
+    assert len({r["id"] for r in rows}) == len(rows)
+
+
+def test_export_streams_csv(client):
+    resp = client.get("/properties/export", params={"format": "csv", "city": "Tamarac"})
+    assert resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert rows and all(r["city"] == "Tamarac" for r in rows)
+    assert "metadata" in rows[0]
+
+    assert client.get("/properties/export", params={"format": "xml"}).status_code == 422
+
+
+def test_bulk_import_ndjson_reports_bad_rows(client):
+    body = "\n".join(
+        [
+            json.dumps({"id": "BULK1", "address": "1 Bulk St", "city": "Doral", "price": "$100"}),
+            "{not json",
+            json.dumps({"id": "BULK2", "city": "Doral"}),
+            json.dumps({"id": "BULK3", "address": "3 Bulk St", "city": "Doral"}),
+        ]
+    )
+    resp = client.post(
+        "/properties/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["processed"] == 4
+    assert report["upserted"] == 2
+    assert [e["row"] for e in report["errors"]] == [2, 3]
+
+    resp = client.post(
+        "/properties/bulk",
+        content=json.dumps({"id": "BULK1", "address": "1 Bulk St", "city": "Doral", "price": "$250"}),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.json()["upserted"] == 1
+    data = client.get("/properties/search", params={"q": "Bulk", "limit": 10}).json()
+    assert {p["id"]: p["price"] for p in data}["BULK1"] == "$250"
+
+
+def test_bulk_import_csv_uses_mls_columns(client):
+    body = (
+        "Listing Number,Address,City,State, List Price \n"
+        "BULKCSV1,9 Csv Ct,Doral,FL, $1500.00 \n"
+        "BULKCSV2,,Doral,FL, $1.00 \n"
+    )
+    resp = client.post("/properties/bulk", params={"format": "csv"}, content=body)
+    report = resp.json()
+    assert report["upserted"] == 1
+    assert report["errors"] == [{"row": 2, "error": "Address is required"}]
+
+
+def test_bulk_import_survives_out_of_range_numbers(client):
+    body = "\n".join(
+        [
+            '{"id": "BIG1", "address": "1 Big St", "year": 1e400}',
+            json.dumps({"id": "BIG2", "address": "2 Big St", "year": 100000000000000000000}),
+            json.dumps({"id": "BIG3", "address": "3 Big St", "price": "$1e999"}),
+        ]
+    )
+    resp = client.post(
+        "/properties/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["upserted"] == 3
+    data = client.get("/properties/search", params={"q": "Big St", "limit": 10}).json()
+    assert {p["id"]: p["year"] for p in data}["BIG2"] is None
+
+    body = "Listing Number,Address,Year Built\nBIGCSV1,4 Big St,1e999\n"
+    resp = client.post("/properties/bulk", params={"format": "csv"}, content=body)
+    assert resp.status_code == 200
+    assert resp.json()["upserted"] == 1
+
+
+def test_bulk_import_reports_undecodable_rows(client):
+    body = (
+        b"Listing Number,Address,City\n"
+        b"UTF1,1 Caf\xc3\xa9 St,Doral\n"
+        b"UTF2,2 Caf\xe9 St,Doral\n"
+        b'UTF3,"' + b"x" * 200_000 + b'",Doral\n'
+        b"UTF4,4 Caf\xc3\xa9 St,Doral\n"
+    )
+    resp = client.post("/properties/bulk", params={"format": "csv"}, content=body)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["processed"], report["upserted"]) == (4, 2)
+    assert report["errors"] == [
+        {"row": 2, "error": "Invalid UTF-8"},
+        {"row": 3, "error": "Unreadable CSV record"},
+    ]
+    data = client.get("/properties/search", params={"q": "Café", "limit": 10}).json()
+    assert {p["id"] for p in data} >= {"UTF1", "UTF4"}
+
+    body = b'{"id": "UTF5", "address": "5 Caf\xe9 St"}\n{"id": "UTF6", "address": "6 Main St"}\n'
+    resp = client.post(
+        "/properties/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert resp.json()["errors"] == [{"row": 1, "error": "Invalid UTF-8"}]
+    assert resp.json()["upserted"] == 1
+
+
+def test_sync_reimports_only_changed_listings(client):
+    body = "Listing Number,Address,City, List Price \nSYNC1,1 Sync Way,Doral, $10 \n"
+    params = {"removeMissing": "false"}
+    report = client.post("/properties/sync", params=params, content=body).json()
+    assert (report["inserted"], report["updated"], report["removed"]) == (1, 0, 0)
+
+    report = client.post("/properties/sync", params=params, content=body).json()
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (0, 0, 1)
+
+
+def test_sync_reports_undecodable_rows(client):
+    body = b"Listing Number,Address,City\nSYNCUTF1,1 Caf\xe9 Way,Doral\nSYNCUTF2,2 Caf\xc3\xa9 Way,Doral\n"
+    resp = client.post("/properties/sync", params={"removeMissing": "false"}, content=body)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["processed"], report["inserted"]) == (2, 1)
+    assert report["errors"] == [{"row": 1, "error": "Invalid UTF-8"}]
+
+
+def test_change_feed_returns_only_new_writes(client, monkeypatch):
+    import properties_store
+
+    monkeypatch.setattr(properties_store, "CHANGE_FEED_SETTLE_SECONDS", 0)
+    params = {"limit": 1000}
+    while True:
+        feed = client.get("/properties/changes", params=params).json()
+        params["since"] = feed["nextToken"]
+        if not feed["hasMore"]:
+            break
+    token = params["since"]
+
+    created = client.post("/properties", json={"address": "5 Feed Ln", "city": "Doral"}).json()
+    feed = client.get("/properties/changes", params={"since": token}).json()
+    assert [(c["id"], c["change"]) for c in feed["changes"]] == [(created["id"], "created")]
+
+    client.post(f"/properties/{created['id']}/remove")
+    feed = client.get("/properties/changes", params={"since": feed["nextToken"]}).json()
+    assert [(c["id"], c["change"]) for c in feed["changes"]] == [(created["id"], "removed")]
+
+    feed = client.get("/properties/changes", params={"since": feed["nextToken"]}).json()
+    assert feed["changes"] == []
+    assert feed["hasMore"] is False
+
+
+def test_stats_track_creates_and_removals(client):
+    before = client.get("/properties/stats")
+    assert before.status_code == 200
+    stats = before.json()
+    assert stats["total"]["count"] == sum(group["count"] for group in stats["byCity"])
+    assert stats["total"]["medianPrice"] is not None
+
+    created = client.post(
+        "/properties", json={"address": "1 Stats Way", "city": "Statsville", "price": "$400,000"}
+    ).json()
+    after = client.get("/properties/stats").json()
+    assert after["total"]["count"] == stats["total"]["count"] + 1
+    assert {"value": "Statsville", "count": 1, "avgPrice": 400000.0}.items() <= next(
+        group for group in after["byCity"] if group["value"] == "Statsville"
+    ).items()
+
+    client.post(f"/properties/{created['id']}/remove")
+    removed = client.get("/properties/stats").json()
+    assert removed["total"] == stats["total"]
+    assert "Statsville" not in {group["value"] for group in removed["byCity"]}
@@ -0,0 +1,652 @@
+import asyncio
+import fcntl
+import importlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+LEGACY_SCHEMA = """
+CREATE TABLE properties (
+    id VARCHAR PRIMARY KEY,
+    listing_number VARCHAR,
+    address VARCHAR NOT NULL,
+    city VARCHAR,
+    state VARCHAR,
+    zip_code VARCHAR,
+    price VARCHAR,
+    beds FLOAT,
+    baths FLOAT,
+    year_built INTEGER,
+    status VARCHAR,
+    property_type VARCHAR,
+    sale_or_rent VARCHAR,
+    lat FLOAT,
+    lng FLOAT,
+    in_system BOOLEAN DEFAULT '1' NOT NULL,
+    removed_at DATETIME,
+    metadata TEXT,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL
+)
+"""
+
+
+def load_store(db_path):
+    os.environ["PROPERTIES_DB_URL"] = f"sqlite:///{db_path}"
+    try:
+        import properties_store
+
+        store = importlib.reload(properties_store)
+        store.init_db()
+        return store
+    finally:
+        os.environ.pop("PROPERTIES_DB_URL", None)
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(LEGACY_SCHEMA)
+        conn.execute(
+            "INSERT INTO properties (id, address, price, created_at, updated_at) "
+            "VALUES ('L1', '1 Legacy Way', ' $1,250.50 ', '2024-01-01', '2024-01-01')"
+        )
+    return db_path
+
+
+def test_init_db_adds_and_backfills_price_cents(legacy_db):
+    store = load_store(legacy_db)
+    with store.engine.connect() as conn:
+        cents = conn.execute(
+            store.select(store.properties_table.c.price_cents).where(
+                store.properties_table.c.id == "L1"
+            )
+        ).scalar_one()
+        indexes = {ix["name"] for ix in store.inspect(conn).get_indexes("properties")}
+    assert cents == 125050
+    assert "ix_properties_price_cents" in indexes
+
+
+def test_create_property_stores_price_cents(legacy_db):
+    store = load_store(legacy_db)
+    store.create_property({"address": "2 New St", "price": "$2,000"})
+    page, _ = store.list_properties_page(
+        store.PropertyFilters(min_price=1999.99, max_price=2000)
+    )
+    assert [p["address"] for p in page] == ["2 New St"]
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [(" $895.00 ", 89500), ("$1,234.567", 123457), ("", None), (None, None), ("call", None)],
+)
+def test_parse_price_cents(raw, expected):
+    import properties_store
+
+    assert properties_store._parse_price_cents(raw) == expected
+
+
+def test_migrations_create_secondary_indexes_and_record_version(legacy_db):
+    store = load_store(legacy_db)
+    with store.engine.connect() as conn:
+        indexes = {ix["name"] for ix in store.inspect(conn).get_indexes("properties")}
+        version = conn.execute(store.select(store.schema_version_table.c.version)).scalar_one()
+    assert {
+        "ix_properties_listing_number",
+        "ix_properties_state_city",
+        "ix_properties_zip_code",
+        "ix_properties_property_type",
+        "ix_properties_status",
+        "ix_properties_in_system_address",
+    } <= indexes
+    assert version == store.SCHEMA_VERSION
+
+
+def test_full_table_scans_are_reported(legacy_db, caplog, monkeypatch):
+    monkeypatch.setenv("PROPERTIES_REPORT_SCANS", "1")
+    store = load_store(legacy_db)
+    table = store.properties_table
+    caplog.clear()
+    with caplog.at_level("WARNING", logger="properties_store"):
+        with store.engine.connect() as conn:
+            conn.execute(store.select(table).where(table.c.zip_code == "33321")).all()
+            assert "Full table scan" not in caplog.text
+            conn.execute(store.select(table).where(table.c.year_built > 1990)).all()
+    assert "Full table scan on properties" in caplog.text
+
+    # IN lists of any length are explained once.
+    store._explained_statements.clear()
+    for ids in (["L1"], ["L1", "L2"], ["L1", "L2", "L3"]):
+        store.get_properties(ids)
+    assert len(store._explained_statements) == 1
+
+
+def test_full_table_scans_are_not_checked_by_default(legacy_db):
+    store = load_store(legacy_db)
+    assert not store.REPORT_FULL_SCANS
+    store._explained_statements.clear()
+    store.get_properties(["L1"])
+    assert store._explained_statements == set()
+
+
+def test_seeding_skips_duplicate_ids_and_rebuilds_indexes(tmp_path, monkeypatch):
+    seed_csv = tmp_path / "seed.csv"
+    seed_csv.write_text(
+        "Listing Number,Address,City,State, List Price \n"
+        "DUP1,1 First St,Doral,FL, $100.00 \n"
+        "DUP1,1 First St (again),Doral,FL, $200.00 \n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("PROPERTIES_SEED_CSV", str(seed_csv))
+    store = load_store(tmp_path / "seeded.db")
+    with store.engine.connect() as conn:
+        rows = conn.execute(
+            store.select(store.properties_table.c.address, store.properties_table.c.price_cents).where(
+                store.properties_table.c.id == "DUP1"
+            )
+        ).all()
+        indexes = {ix["name"] for ix in store.inspect(conn).get_indexes("properties")}
+    assert [tuple(r) for r in rows] == [("1 First St", 10000)]
+    assert {ix.name for ix in store.properties_table.indexes} <= indexes
+
+
+def test_first_sync_hashes_seeded_listings_without_rewriting_them(tmp_path, monkeypatch):
+    seed_csv = tmp_path / "seed.csv"
+    seed = (
+        "Listing Number,Address,City,State, List Price ,Beds\n"
+        "S1,1 Seed St,Doral,FL, $100.00 ,2\n"
+        "S2,2 Seed St,Doral,FL, $200.00 ,3\n"
+    )
+    seed_csv.write_text(seed, encoding="utf-8")
+    monkeypatch.setenv("PROPERTIES_SEED_CSV", str(seed_csv))
+    store = load_store(tmp_path / "seeded.db")
+    hashes = store.select(store.properties_table.c.content_hash).where(
+        store.properties_table.c.id.in_(["S1", "S2"])
+    )
+    with store.engine.connect() as conn:
+        assert conn.execute(hashes).scalars().all() == [None, None]
+
+    result = store.sync_csv(seed.replace("$200.00", "$250.00").splitlines(True), remove_missing=False)
+
+    assert (result.updated, result.unchanged) == (1, 1)
+    with store.engine.connect() as conn:
+        assert None not in conn.execute(hashes).scalars().all()
+        price = conn.execute(
+            store.select(store.properties_table.c.price_cents).where(store.properties_table.c.id == "S2")
+        ).scalar()
+    assert price == 25000
+
+
+def test_reads_use_read_only_replica_engine(legacy_db, monkeypatch):
+    monkeypatch.setenv("PROPERTIES_DB_READ_URL", f"sqlite:///{legacy_db}")
+    store = load_store(legacy_db)
+    assert store.read_engine is not store.engine
+    with store.read_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        with pytest.raises(store.OperationalError):
+            conn.exec_driver_sql("DELETE FROM properties")
+    assert store.get_property("L1")["address"] == "1 Legacy Way"
+
+
+def test_row_to_api_matches_record_mapping(legacy_db):
+    store = load_store(legacy_db)
+    store.set_in_system("L1", False)
+    store.create_property(
+        {"address": "3 Map St", "beds": 2, "lat": 1.5, "metadata": {"county": "Broward"}}
+    )
+    with store.engine.connect() as conn:
+        rows = conn.execute(store.select(store.properties_table)).all()
+    for row in rows:
+        expected = store.PropertyRecord(**store._row_to_record(row)).to_api()
+        assert store._row_to_api(row) == expected
+
+
+def test_metadata_filters_use_expression_indexes(legacy_db):
+    store = load_store(legacy_db)
+    created = store.create_property(
+        {"address": "4 Json Rd", "metadata": {"listingAgentName": "Ada Agent", "county": "Broward"}}
+    )
+    page, _ = store.list_properties_page(
+        store.PropertyFilters(listing_agent="Ada Agent", county="Broward")
+    )
+    assert [p["id"] for p in page] == [created["id"]]
+    assert page[0]["metadata"]["county"] == "Broward"
+
+    stmt = store.select(store.properties_table.c.id).where(
+        store._metadata_field("listingOfficeName") == "Office"
+    )
+    with store.engine.connect() as conn:
+        sql = str(stmt.compile(conn, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "ix_properties_meta_listing_office" in plan
+
+
+def test_migration_adds_listing_detail_columns(legacy_db, tmp_path, monkeypatch):
+    seed_csv = tmp_path / "seed.csv"
+    seed_csv.write_text(
+        "Listing Number,Address, List Price ,Building/Living Area (sf),PPSF,Pool (Y/N),Waterfront (Y/N),Style\n"
+        "L1,1 Legacy Way, $1250.50 ,\"1,000\",,Y,N,Ranch\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("PROPERTIES_SEED_CSV", str(seed_csv))
+    store = load_store(legacy_db)
+    record = store.get_property("L1")
+    assert record["livingAreaSqft"] == 1000
+    assert record["pricePerSqft"] == 1.25
+    assert (record["pool"], record["waterfront"], record["garage"]) == (True, False, None)
+    assert record["style"] == "Ranch"
+    with store.engine.connect() as conn:
+        indexes = {ix["name"] for ix in store.inspect(conn).get_indexes("properties")}
+    assert {"ix_properties_living_area_sqft", "ix_properties_amenities"} <= indexes
+
+
+def test_listing_detail_filters(legacy_db):
+    store = load_store(legacy_db)
+    store.create_property(
+        {"address": "6 Canal Rd", "price": "$500,000", "livingAreaSqft": 2500, "pool": True, "waterfront": "Y"}
+    )
+    store.create_property({"address": "7 Dry Rd", "livingAreaSqft": 2500, "pool": True, "waterfront": False})
+    page, _ = store.list_properties_page(
+        store.PropertyFilters(waterfront=True, pool=True, min_living_area=2000, max_price_per_sqft=300)
+    )
+    assert [(p["address"], p["pricePerSqft"]) for p in page] == [("6 Canal Rd", 200.0)]
+
+
+@pytest.mark.parametrize(
+    "raw, expected", [("Y", True), ("n", False), ("", None), (None, None), (True, True), ("?", None)]
+)
+def test_parse_flag(raw, expected):
+    import properties_store
+
+    assert properties_store._parse_flag(raw) is expected
+
+
+SYNC_HEADER = "Listing Number,Address,City, List Price \n"
+
+
+def test_sync_listings_writes_only_changed_rows_and_removes_missing(legacy_db):
+    store = load_store(legacy_db)
+    first = store.sync_csv(
+        [SYNC_HEADER, "S1,1 Sync St,Doral, $100 \n", "S2,2 Sync St,Doral, $200 \n", ",No Id,Doral,\n"]
+    )
+    assert (first.inserted, first.updated, first.removed) == (2, 0, 0)
+    assert first.errors == [{"row": 3, "error": "Listing Number is required"}]
+
+    second = store.sync_csv(
+        [SYNC_HEADER, "S1,1 Sync St,Doral, $150 \n", "S3,3 Sync St,Doral, $300 \n"]
+    )
+    assert (second.inserted, second.updated, second.unchanged, second.removed) == (1, 1, 0, 1)
+    assert store.get_property("S1")["price"] == "$150"
+    assert store.get_property("S2")["inSystem"] is False
+    assert store.get_property("L1")["inSystem"] is True
+
+    version = store.data_version()
+    third = store.sync_csv([SYNC_HEADER, "S1,1 Sync St,Doral, $150 \n", "S3,3 Sync St,Doral, $300 \n"])
+    assert (third.inserted, third.updated, third.unchanged, third.removed) == (0, 0, 2, 0)
+    assert store.data_version() == version
+
+
+def test_sync_restores_listings_it_removed_but_not_manual_removals(legacy_db):
+    store = load_store(legacy_db)
+    feed = [SYNC_HEADER, "S1,1 Sync St,Doral, $100 \n", "S2,2 Sync St,Doral, $200 \n"]
+    store.sync_csv(feed)
+    store.sync_csv(feed[:2])
+    assert store.get_property("S2")["inSystem"] is False
+    store.set_in_system("S1", False)
+
+    again = store.sync_csv(feed, remove_missing=False)
+    assert (again.inserted, again.updated, again.unchanged) == (0, 1, 1)
+    restored = store.get_property("S2")
+    assert (restored["inSystem"], restored["removedAt"]) == (True, None)
+    assert store.get_property("S1")["inSystem"] is False
+
+    # A restored listing is sticky again once removed by hand.
+    store.set_in_system("S2", False)
+    assert store.sync_csv(feed, remove_missing=False).unchanged == 2
+    assert store.get_property("S2")["inSystem"] is False
+
+
+def test_sync_removal_reads_the_primary_and_counts_rows_removed(legacy_db, tmp_path, monkeypatch):
+    load_store(legacy_db)
+    # The replica is a copy taken before the feed was first synced.
+    replica = tmp_path / "replica.db"
+    with sqlite3.connect(legacy_db) as source, sqlite3.connect(replica) as target:
+        source.backup(target)
+    monkeypatch.setenv("PROPERTIES_DB_READ_URL", f"sqlite:///{replica}")
+    store = load_store(legacy_db)
+    feed = [
+        SYNC_HEADER,
+        "S1,1 Sync St,Doral, $100 \n",
+        "S2,2 Sync St,Doral, $200 \n",
+        "S3,3 Sync St,Doral, $300 \n",
+    ]
+    store.sync_csv(feed)
+
+    # S2 is removed by hand while the sync is removing the missing listings.
+    c = store.properties_table.c
+    snapshot = store._stats_snapshot
+
+    def remove_by_hand(conn, property_ids):
+        conn.execute(store.update(store.properties_table).where(c.id == "S2").values(in_system=False))
+        return snapshot(conn, property_ids)
+
+    monkeypatch.setattr(store, "_stats_snapshot", remove_by_hand)
+    result = store.sync_csv(feed[:2])
+
+    assert result.removed == 1
+    with store.engine.connect() as conn:
+        in_system = dict(conn.execute(store.select(c.id, c.in_system).where(c.id.in_(["S2", "S3"]))).all())
+    assert in_system == {"S2": False, "S3": False}
+
+
+def test_sync_reports_unreadable_records_and_keeps_listings(legacy_db):
+    store = load_store(legacy_db)
+    store.sync_csv([SYNC_HEADER, "S1,1 Sync St,Doral, $100 \n", "S2,2 Sync St,Doral, $200 \n"])
+
+    result = store.sync_csv(
+        [SYNC_HEADER, "S1,1 Sync St,Doral, $150 \n", 'S2,"' + "x" * 200_000 + '",Doral, $200 \n']
+    )
+
+    assert result.errors == [{"row": 2, "error": "Unreadable CSV record"}]
+    assert (result.updated, result.removed) == (1, 0)
+    assert store.get_property("S2")["inSystem"] is True
+
+
+def test_read_csv_streams_without_caching_the_file(legacy_db, tmp_path):
+    import listings_dataset
+
+    store = load_store(legacy_db)
+    path = tmp_path / "feed.csv"
+    path.write_text(SYNC_HEADER + "S1,1 Sync St,Doral, $100 \n", encoding="utf-8")
+    assert [row["id"] for row in store._read_csv(path)] == ["S1"]
+    assert path.resolve() not in listings_dataset._datasets
+    assert not list(listings_dataset.snapshot_dir().glob("feed-*"))
+
+
+def test_geo_queries_use_exact_coordinates_and_bounded_candidates(legacy_db):
+    store = load_store(legacy_db)
+    assert store._use_geo_rtree
+    # Rounds to 26.0 in the R*Tree's float32 bounds.
+    outside = store.create_property({"address": "1 Edge St", "lat": 26.000000001, "lng": -80.25})
+    inside = store.create_property({"address": "2 Edge St", "lat": 25.99, "lng": -80.25})
+    found = store.find_in_bbox(25.9, -80.3, 26.0, -80.2, limit=10)
+    assert [p["id"] for p in found] == [inside["id"]]
+
+    stmt = store._geo_candidates_statement((25.9, -80.3, 26.1, -80.2), (26.0, -80.25), 5, None)
+    assert stmt._limit == 5 * store.GEO_CANDIDATES_PER_RESULT
+    nearest = store.find_nearby(26.0, -80.25, 500, limit=1)
+    assert [p["id"] for p in nearest] == [outside["id"]]
+
+
+def test_listing_stats_ignore_a_lagging_replica(legacy_db, tmp_path, monkeypatch):
+    load_store(legacy_db).engine.dispose()
+    replica = tmp_path / "replica.db"
+    with sqlite3.connect(legacy_db) as source, sqlite3.connect(replica) as target:
+        source.backup(target)
+    monkeypatch.setenv("PROPERTIES_DB_READ_URL", f"sqlite:///{replica}")
+    store = load_store(legacy_db)
+    assert store.read_engine is not store.engine
+
+    assert store.get_listing_stats()["total"]["count"] == 1
+    rebuilds = []
+    original = store.ListingStats._rebuild
+    monkeypatch.setattr(store.ListingStats, "_rebuild", lambda self: rebuilds.append(original(self)))
+    store.create_property({"address": "1 Primary St", "price": "$100"})
+    assert store.data_version() < store.data_version(primary=True)
+    assert store.get_listing_stats()["total"]["count"] == 2
+    assert rebuilds == []
+
+
+def test_get_properties_returns_input_order(legacy_db, monkeypatch):
+    store = load_store(legacy_db)
+    created = [store.create_property({"address": f"{n} Batch St"})["id"] for n in range(5)]
+    monkeypatch.setattr(store, "MAX_PAGE_SIZE", 2)
+    ids = created[::-1] + ["missing", "L1"]
+    assert [p["id"] for p in store.get_properties(ids)] == created[::-1] + ["L1"]
+    assert store.get_properties([]) == []
+
+
+def test_async_store_matches_sync_store(legacy_db):
+    store = load_store(legacy_db)
+    import async_properties_store
+
+    async_store = importlib.reload(async_properties_store)
+    assert async_store.engine is not None
+
+    async def run():
+        try:
+            created = await async_store.create_property({"address": "5 Async Ave", "price": "$10"})
+            removed = await async_store.set_in_system("L1", False)
+            results = await asyncio.gather(
+                async_store.get_properties(["L1", created["id"]]),
+                async_store.list_properties_page(store.PropertyFilters(in_system=True)),
+                async_store.data_version(),
+            )
+            return created, removed, results
+        finally:
+            await async_store.dispose()
+
+    created, removed, (fetched, (page, _), version) = asyncio.run(run())
+    assert fetched == [removed, created] == store.get_properties(["L1", created["id"]])
+    assert removed["inSystem"] is False
+    assert [p["id"] for p in page] == [created["id"]]
+    assert version == store.data_version()
+
+
+def test_init_db_waits_for_the_initialisation_lock(legacy_db):
+    store = load_store(legacy_db)
+    with open(f"{legacy_db}.init-lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        worker = threading.Thread(target=store.init_db)
+        worker.start()
+        time.sleep(0.2)
+        assert store.init_progress.state == "waiting"
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    worker.join(timeout=10)
+    assert store.init_progress.ready
+
+
+def test_listing_stats_are_updated_incrementally(legacy_db, monkeypatch):
+    store = load_store(legacy_db)
+    store.create_property({"address": "1 Stat St", "city": "Doral", "price": "$300", "livingAreaSqft": 3})
+    stats = store.get_listing_stats()
+    assert stats["total"]["count"] == 2
+    assert stats["byCity"][0] == {
+        "value": "Doral",
+        "count": 1,
+        "avgPrice": 300.0,
+        "medianPrice": 300.0,
+        "avgPricePerSqft": 100.0,
+        "medianPricePerSqft": 100.0,
+    }
+
+    rebuilds = []
+    original = store.ListingStats._rebuild
+    monkeypatch.setattr(store.ListingStats, "_rebuild", lambda self: rebuilds.append(original(self)))
+    store.create_property({"address": "2 Stat St", "city": "Doral", "price": "$100"})
+    store.set_in_system("L1", False)
+    store.bulk_upsert(store.parse_csv_rows([SYNC_HEADER, "S1,3 Stat St,Miami, $50 \n"]))
+    store.sync_csv([SYNC_HEADER, "S1,3 Stat St,Miami, $70 \n"], remove_missing=False)
+    incremental = store.get_listing_stats()
+    assert rebuilds == []
+
+    doral = {group["value"]: group for group in incremental["byCity"]}["Doral"]
+    assert (doral["count"], doral["avgPrice"], doral["medianPrice"]) == (2, 200.0, 200.0)
+    assert incremental["total"]["count"] == 3
+
+    store.listing_stats._invalidate()
+    store.listing_stats._version = 0
+    assert store.get_listing_stats() == incremental
+    assert len(rebuilds) == 1
+
+
+def test_listing_stats_catch_up_on_writes_from_other_workers(legacy_db, monkeypatch):
+    store = load_store(legacy_db)
+    assert store.get_listing_stats()["total"]["count"] == 1
+    rebuilds = []
+    original = store.ListingStats._rebuild
+    monkeypatch.setattr(store.ListingStats, "_rebuild", lambda self: rebuilds.append(original(self)))
+
+    def write_elsewhere(stmt):
+        # Committed without reporting to this process's statistics.
+        with store.engine.begin() as conn:
+            conn.execute(stmt)
+            store._bump_data_version(conn)
+
+    data = store._normalise_payload({"address": "1 Other St", "city": "Doral", "price": "$100"})
+    write_elsewhere(store._create_statement(data))
+    write_elsewhere(store._set_in_system_statement("L1", False))
+    stats = store.get_listing_stats()
+    assert stats["total"]["count"] == 1
+    assert [group["value"] for group in stats["byCity"]] == ["Doral"]
+    assert rebuilds == []
+
+    monkeypatch.setattr(store, "STATS_CATCH_UP_ROWS", 0)
+    write_elsewhere(store._set_in_system_statement("L1", True))
+    assert store.get_listing_stats()["total"]["count"] == 2
+    assert len(rebuilds) == 1
+
+
+def test_listing_stats_scan_without_holding_the_lock(legacy_db, monkeypatch):
+    store = load_store(legacy_db)
+    scanning, release = threading.Event(), threading.Event()
+    original = store._stats_entry
+
+    def slow_entry(row):
+        scanning.set()
+        release.wait(5)
+        return original(row)
+
+    monkeypatch.setattr(store, "_stats_entry", slow_entry)
+    reader = threading.Thread(target=store.get_listing_stats)
+    reader.start()
+    try:
+        assert scanning.wait(5)
+        # What the event loop does while another thread scans.
+        assert store.listing_stats._lock.acquire(timeout=1)
+        store.listing_stats._lock.release()
+    finally:
+        release.set()
+        reader.join(timeout=10)
+    assert store.get_listing_stats()["total"]["count"] == 1
+
+
+def test_store_retriever_follows_writes(legacy_db, monkeypatch):
+    from backend.property_chatbot import StorePropertyRetriever
+
+    store = load_store(legacy_db)
+    retriever = StorePropertyRetriever(poll_interval=0)
+    retriever.load(store)
+    try:
+        assert [p["id"] for p in retriever.search("legacy way")] == ["L1"]
+
+        created = store.create_property(
+            {"address": "9 Harbor Rd", "city": "Doral", "state": "FL", "price": "$300,000", "type": "Condo"}
+        )
+        assert retriever.search("doral condos") == [
+            {
+                "id": created["id"],
+                "address": "9 Harbor Rd",
+                "location": "Doral, Florida",
+                "price": 300000,
+                "type": "Condo",
+                "description": None,
+            }
+        ]
+        store.set_in_system(created["id"], False)
+        assert retriever.search("doral") == []
+
+        store.bulk_upsert(store.parse_csv_rows([SYNC_HEADER, "S1,3 Bay St,Miami, $50 \n"]))
+        assert [p["address"] for p in retriever.search("bay")] == ["3 Bay St"]
+        store.sync_csv([SYNC_HEADER, "S2,4 Bay St,Miami, $60 \n"])
+        assert [p["address"] for p in retriever.search("bay")] == ["4 Bay St"]
+
+        # Writes made elsewhere reach the index through the change feed.
+        c = store.properties_table.c
+        with store.engine.begin() as conn:
+            conn.execute(
+                store.update(store.properties_table)
+                .where(c.id == "L1")
+                .values(in_system=False, updated_at=store.datetime.utcnow())
+            )
+        assert [p["id"] for p in retriever.search("legacy")] == ["L1"]
+        monkeypatch.setattr(store, "CHANGE_FEED_SETTLE_SECONDS", 0)
+        retriever.catch_up()
+        assert retriever.search("legacy") == []
+    finally:
+        retriever.close()
+    assert store._write_listeners == []
+
+
+def test_store_retriever_searches_the_fallback_until_a_store_is_attached(legacy_db, capsys):
+    from backend.property_chatbot import StorePropertyRetriever
+
+    class Fallback:
+        def search(self, query, limit=3):
+            return [{"id": "CSV1"}]
+
+    store = load_store(legacy_db)
+    retriever = StorePropertyRetriever(Fallback(), poll_interval=0)
+    assert retriever.search("legacy") == [{"id": "CSV1"}]
+    assert retriever.search("legacy") == [{"id": "CSV1"}]
+    assert capsys.readouterr().out == "Searching the fallback listings: no property store is attached.\n"
+
+    retriever.attach(store)
+    try:
+        retriever.search("legacy")
+        deadline = time.monotonic() + 10
+        while not retriever.loaded:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert [p["id"] for p in retriever.search("legacy")] == ["L1"]
+    finally:
+        retriever.close()
+
+
+def test_bulk_upsert_reports_values_the_driver_rejects(legacy_db):
+    store = load_store(legacy_db)
+    rows = list(
+        store.parse_ndjson_rows(
+            [
+                json.dumps({"id": "OK1", "address": "1 Ok St"}),
+                json.dumps({"id": "BAD1", "address": "2 Bad St"}),
+            ]
+        )
+    )
+    rows[1][1]["year_built"] = 10**20
+    result = store.bulk_upsert(rows)
+    assert (result.upserted, result.failed) == (1, 1)
+    assert result.errors[0]["row"] == 2
+    assert store.get_property("OK1") is not None
+
+
+def test_bulk_upsert_stamps_retried_rows_when_written(legacy_db):
+    store = load_store(legacy_db)
+    rows = list(
+        store.parse_ndjson_rows(
+            [json.dumps({"id": f"R{n}", "address": f"{n} Retry St"}) for n in range(3)]
+        )
+    )
+    rows[0][1]["year_built"] = 10**20
+    started = datetime.utcnow()
+    store.bulk_upsert(rows)
+    with store.engine.connect() as conn:
+        stamps = dict(
+            conn.execute(
+                store.select(store.properties_table.c.id, store.properties_table.c.updated_at).where(
+                    store.properties_table.c.id.in_(["R1", "R2"])
+                )
+            ).all()
+        )
+    assert started < stamps["R1"] < stamps["R2"]
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from backend.property_chatbot import PropertyRetriever
+
+
+def make_retriever(tmp_path, listings):
+    data_file = tmp_path / "listings.json"
+    data_file.write_text(json.dumps(listings), encoding="utf-8")
+    return PropertyRetriever(data_file)
+
+
+def test_search_ranks_by_bm25_and_keeps_dataset_order(tmp_path):
+    retriever = make_retriever(
+        tmp_path,
+        [
+            {"id": "a", "location": "Miami, Florida", "type": "Office"},
+            {"id": "b", "address": "1 Main St Doral", "description": "Condo"},
+            {"id": "c", "location": "Doral, Florida", "type": "Condo"},
+            {"id": "d", "location": "Tampa, Florida", "type": "Condos"},
+            {"id": "e", "location": "Tampa, Florida", "type": "Condo"},
+        ],
+    )
+    # "doral" is rarer than "condo", and the shorter listing "c" wins the tie
+    # on both terms; plurals stem to the same term.
+    assert [p["id"] for p in retriever.search("doral condos", limit=4)] == ["c", "b", "d", "e"]
+    assert [p["id"] for p in retriever.search("offices in miami", limit=10)] == ["a"]
+    # Terms match whole words only.
+    assert retriever.search("fl") == []
+    assert retriever.search("seattle") == []
+
+
+def test_tokenize_stems_and_drops_stop_words():
+    from backend.listing_search import tokenize
+
+    assert tokenize("Show me the Buildings with 3 pools near Miami's waterfront") == [
+        "build",
+        "3",
+        "pool",
+        "miami",
+        "waterfront",
+    ]
+    assert tokenize("building") == tokenize("buildings") == ["build"]
+
+
+def test_search_handles_missing_data_file(tmp_path):
+    retriever = PropertyRetriever(tmp_path / "missing.csv")
+    assert retriever.properties == []
+    assert retriever.search("condo") == []
+
+
+def test_incremental_index_matches_a_rebuilt_index():
+    from backend.listing_search import BM25Index, IncrementalBM25Index
+
+    documents = {
+        "a": "Doral condo with pool",
+        "b": "Miami office",
+        "c": "Doral office building",
+        "d": "Tampa condos near the bay",
+    }
+    index = IncrementalBM25Index()
+    for key, text in documents.items():
+        index.put(key, text)
+    index.put("b", "Miami office tower")
+    index.discard("d")
+    documents["b"] = "Miami office tower"
+    del documents["d"]
+
+    keys = list(documents)
+    rebuilt = BM25Index(documents.values())
+    for query in ("doral", "office tower", "condo pool", "tampa"):
+        expected = rebuilt.top(query, 10)
+        actual = index.top(query, 10)
+        assert [key for key, _ in actual] == [keys[position] for position, _ in expected]
+        assert [score for _, score in actual] == pytest.approx([score for _, score in expected])
+    assert len(index) == 3 and "d" not in index